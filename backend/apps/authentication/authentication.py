@@ -0,0 +1,127 @@
+"""
+Token authentication with expiry and a cache in front of the token lookup.
+
+DRF's TokenAuthentication joins Token and User on every request. Here a
+resolved token (with its user) is kept in the sessions cache for at most
+AUTH_TOKEN_CACHE_TTL seconds, so authenticated traffic normally costs no
+query at all. Cache entries are keyed by a digest of the token, never the
+token itself, and are dropped whenever the token or its user changes
+(logout, password reset, deactivation, any other user save).
+
+Tokens carry an expiry time (TokenExpiry) set when they are issued:
+AUTH_TOKEN_TTL for ordinary logins, AUTH_TOKEN_REMEMBER_TTL when the user
+asked to be remembered. A token without an expiry row is treated as
+expired. Expired tokens are rejected and replaced with a new key at the
+next login; a valid token can be exchanged for a new one with
+rotate_token (``POST /api/auth/token/refresh/``).
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from apps.core.cache import SESSIONS, get_cache
+
+from .models import TokenExpiry
+
+TOKEN_KEY = 'auth_token:{}'
+USER_TOKEN_KEY = 'auth_token:user:{}'
+
+
+def token_digest(key):
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def invalidate_token(key):
+    """Drop the cached resolution of token `key`"""
+    get_cache(SESSIONS).delete(TOKEN_KEY.format(token_digest(key)))
+
+
+def invalidate_user_tokens(user_id):
+    """Drop the cached resolution of every token belonging to `user_id`"""
+    cache = get_cache(SESSIONS)
+    user_key = USER_TOKEN_KEY.format(user_id)
+    digest = cache.get(user_key)
+    if digest:
+        cache.delete_many([TOKEN_KEY.format(digest), user_key])
+
+
+def token_ttl(remember=False):
+    if remember:
+        return getattr(settings, 'AUTH_TOKEN_REMEMBER_TTL', 30 * 86400)
+    return getattr(settings, 'AUTH_TOKEN_TTL', 86400)
+
+
+def issue_token(user, remember=False):
+    """
+    Return a valid token for `user` expiring after the login TTL, rotating
+    the key if the existing token has expired
+    """
+    expires_at = timezone.now() + timezone.timedelta(seconds=token_ttl(remember))
+    with transaction.atomic():
+        token = Token.objects.select_related('expiry').filter(user=user).first()
+        expiry = getattr(token, 'expiry', None) if token else None
+        if token is not None and expiry is not None and expiry.is_expired:
+            token.delete()
+            token = None
+        if token is None:
+            token = Token.objects.create(user=user)
+        TokenExpiry.objects.update_or_create(token=token, defaults={'expires_at': expires_at})
+    return token
+
+
+def rotate_token(token, remember=False):
+    """Replace `token` with a new key for the same user"""
+    user = token.user
+    with transaction.atomic():
+        token.delete()
+        return issue_token(user, remember)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that honours token expiry and caches resolved tokens
+    """
+
+    @property
+    def cache_ttl(self):
+        return getattr(settings, 'AUTH_TOKEN_CACHE_TTL', 300)
+
+    def load_token(self, key):
+        """Return `(token, expires_at timestamp)` from the database"""
+        try:
+            token = Token.objects.select_related('user', 'expiry').get(key=key)
+        except Token.DoesNotExist:
+            return None
+        expiry = getattr(token, 'expiry', None)
+        # Tokens created outside issue_token have no expiry and are not trusted
+        return token, expiry.expires_at.timestamp() if expiry is not None else 0
+
+    def authenticate_credentials(self, key):
+        cache = get_cache(SESSIONS)
+        digest = token_digest(key)
+        entry = cache.get(TOKEN_KEY.format(digest))
+        if entry is None:
+            entry = self.load_token(key)
+            if entry is None:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            token, expires_at = entry
+            ttl = min(self.cache_ttl, int(expires_at - time.time()))
+            if ttl > 0 and token.user.is_active:
+                cache.set_many({
+                    TOKEN_KEY.format(digest): entry,
+                    USER_TOKEN_KEY.format(token.user_id): digest,
+                }, ttl)
+
+        token, expires_at = entry
+        if expires_at <= time.time():
+            raise exceptions.AuthenticationFailed(_('Token has expired.'))
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return (token.user, token)
@@ -0,0 +1,57 @@
+"""
+Write path for successful logins.
+
+A login used to rewrite the whole user row with save(), insert a
+UserActivity row, and let the user_logged_in receivers write their own
+records on top. record_login does the minimum instead:
+
+* one UPDATE of the login metadata on the user row,
+* one UPDATE of the security profile (failed attempts reset, login time),
+
+both in the caller's transaction, plus one audit record handed to the
+audit buffer and written in the background after the transaction commits.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.schema import schema
+from audit.buffer import audit_buffer
+
+from .adapters import get_client_ip
+from .models import UserActivity
+
+
+def record_login(request, user, when=None):
+    """
+    Persist a successful login of `user` made through `request`
+    """
+    from security.bruteforce import detector
+    from security.models import UserSecurityProfile
+
+    when = when or timezone.now()
+    ip_address = get_client_ip(request)
+    user_agent = request.META.get('HTTP_USER_AGENT', '')
+
+    with transaction.atomic():
+        get_user_model().objects.filter(pk=user.pk).update(
+            last_login=when,
+            last_login_ip=ip_address,
+            last_login_user_agent=user_agent,
+        )
+        if schema.has_model(UserSecurityProfile):
+            UserSecurityProfile.record_login(user.pk, when)
+
+        activity = UserActivity(
+            user=user,
+            action="User login",
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+        transaction.on_commit(lambda: audit_buffer.add(activity))
+
+    # Keep the in-memory instance in step with the row
+    user.last_login = when
+    user.last_login_ip = ip_address
+    user.last_login_user_agent = user_agent
+    detector.record_success(user.email)
@@ -0,0 +1,31 @@
+import datetime
+
+from django.conf import settings
+from django.db import migrations
+
+
+def backfill_token_expiry(apps, schema_editor):
+    """
+    Give every token issued before TokenExpiry existed an expiry of its
+    creation time plus AUTH_TOKEN_TTL; tokens older than that expire now
+    """
+    Token = apps.get_model('authtoken', 'Token')
+    TokenExpiry = apps.get_model('authentication', 'TokenExpiry')
+    ttl = datetime.timedelta(seconds=getattr(settings, 'AUTH_TOKEN_TTL', 86400))
+
+    tokens = Token.objects.filter(expiry__isnull=True).values_list('key', 'created')
+    TokenExpiry.objects.bulk_create(
+        [TokenExpiry(token_id=key, expires_at=created + ttl) for key, created in tokens.iterator()],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0007_tokenexpiry'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_token_expiry, migrations.RunPython.noop),
+    ]
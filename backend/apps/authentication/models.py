@@ -3,6 +3,7 @@ from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseU
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
 from django.core.validators import RegexValidator
+from rest_framework.authtoken.models import Token
 
 
 class UserManager(BaseUserManager):
@@ -87,7 +88,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     
     def get_full_name(self):
         """Return the full name of the user."""
-        full_name = f"{self.first_name} {self.last_name}".strip()
+        full_name = f"{getattr(self, 'first_name', '')} {getattr(self, 'last_name', '')}".strip()
         return full_name if full_name else self.email
     
     def get_short_name(self):
@@ -120,4 +121,22 @@ class UserActivity(models.Model):
         ordering = ['-timestamp']
     
     def __str__(self):
-        return f"{self.user.email} - {self.action} - {self.timestamp}"
\ No newline at end of file
+        return f"{self.user.email} - {self.action} - {self.timestamp}"
+
+
+class TokenExpiry(models.Model):
+    """Expiry time of an API token"""
+    
+    token = models.OneToOneField(Token, on_delete=models.CASCADE, primary_key=True, related_name='expiry')
+    expires_at = models.DateTimeField(_('expires at'), db_index=True)
+    
+    class Meta:
+        verbose_name = _('token expiry')
+        verbose_name_plural = _('token expiries')
+    
+    def __str__(self):
+        return f"{self.token.user_id} - {self.expires_at}"
+    
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
@@ -100,10 +100,18 @@ class TokenSerializer(serializers.ModelSerializer):
     Serializer for authentication tokens
     """
     user = UserSerializer(read_only=True)
+    expires_at = serializers.DateTimeField(source='expiry.expires_at', read_only=True, allow_null=True)
     
     class Meta:
         model = Token
-        fields = ('key', 'user')
+        fields = ('key', 'user', 'expires_at')
+
+
+class TokenRefreshSerializer(serializers.Serializer):
+    """
+    Serializer for token refresh
+    """
+    remember = serializers.BooleanField(required=False, default=False)
 
 
 class PasswordResetRequestSerializer(serializers.Serializer):
@@ -1,18 +1,45 @@
 """
 Signal handlers for the authentication app
 """
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from rest_framework.authtoken.models import Token
 
+from .authentication import invalidate_token, invalidate_user_tokens, issue_token
+from .models import TokenExpiry
+
 User = get_user_model()
 
 
 @receiver(post_save, sender=User)
 def create_auth_token(sender, instance=None, created=False, **kwargs):
     """
-    Create a token for each new user
+    Create an expiring token for each new user
     """
     if created:
-        Token.objects.create(user=instance)
\ No newline at end of file
+        issue_token(instance)
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_tokens(sender, instance, **kwargs):
+    """
+    Drop cached token resolutions for a user whenever the user changes, so
+    password resets and deactivation take effect on the next request
+    """
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_user_tokens(user_id))
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+@receiver(post_save, sender=TokenExpiry)
+@receiver(post_delete, sender=TokenExpiry)
+def invalidate_cached_token(sender, instance, **kwargs):
+    """
+    Drop the cached resolution of a token when it is deleted (logout) or
+    its expiry changes
+    """
+    key = instance.pk
+    transaction.on_commit(lambda: invalidate_token(key))
@@ -0,0 +1,91 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.authentication.authentication import issue_token
+from apps.authentication.models import TokenExpiry
+from apps.core.cache import SESSIONS, get_cache
+
+User = get_user_model()
+
+
+class CachedTokenAuthenticationTest(TestCase):
+    """
+    Test case for cached, expiring token authentication
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username='tokenuser',
+            email='tokenuser@example.com',
+            password='testpass123',
+            user_type='admin'
+        )
+        self.token = issue_token(self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.url = '/api/audit/buffer-stats/'
+
+    def tearDown(self):
+        get_cache(SESSIONS).clear()
+
+    def test_cached_token_skips_auth_query(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_expired_token_is_rejected_and_rotated_on_login(self):
+        TokenExpiry.objects.filter(token=self.token).update(expires_at=timezone.now() - timezone.timedelta(seconds=1))
+
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        self.assertNotEqual(issue_token(self.user).key, self.token.key)
+
+    def test_logout_invalidates_cached_token(self):
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.post('/api/auth/logout/').status_code, 200)
+
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_deactivation_invalidates_cached_token(self):
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    @override_settings(AUTH_TOKEN_REMEMBER_TTL=7200, AUTH_TOKEN_TTL=60)
+    def test_remember_me_extends_expiry(self):
+        token = issue_token(self.user, remember=True)
+
+        remaining = (token.expiry.expires_at - timezone.now()).total_seconds()
+        self.assertGreater(remaining, 3600)
+
+    def test_token_without_expiry_is_rejected(self):
+        TokenExpiry.objects.filter(token=self.token).delete()
+
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_new_user_token_expires(self):
+        user = User.objects.create_user(
+            username='newuser', email='newuser@example.com', password='testpass123', user_type='admin'
+        )
+
+        self.assertTrue(TokenExpiry.objects.filter(token__user=user).exists())
+
+    def test_refresh_rotates_token(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/auth/token/refresh/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.data['key'], self.token.key)
+        self.assertIsNotNone(response.data['expires_at'])
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {response.data['key']}")
+        self.assertEqual(self.client.get(self.url).status_code, 200)
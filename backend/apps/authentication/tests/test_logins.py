@@ -0,0 +1,39 @@
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase
+from apps.authentication.logins import record_login
+from apps.authentication.models import UserActivity
+from apps.core.schema import schema
+from security.models import UserSecurityProfile
+
+User = get_user_model()
+
+
+class RecordLoginTest(TestCase):
+    """
+    Test case for the login write path
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='loginuser',
+            email='loginuser@example.com',
+            password='testpass123',
+            user_type='admin'
+        )
+        UserSecurityProfile.objects.filter(user=self.user).update(failed_login_attempts=3)
+        self.request = RequestFactory().post(
+            '/api/auth/login/', REMOTE_ADDR='10.1.2.3', HTTP_USER_AGENT='pytest'
+        )
+        schema.table_names()
+
+    def test_login_is_two_updates_and_one_audit_record(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(4):
+                # Savepoint, user UPDATE, profile UPDATE, release
+                record_login(self.request, self.user)
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.last_login_ip, '10.1.2.3')
+        self.assertEqual(self.user.last_login_user_agent, 'pytest')
+        self.assertEqual(UserSecurityProfile.objects.get(user=self.user).failed_login_attempts, 0)
+        self.assertEqual(UserActivity.objects.filter(user=self.user, action='User login').count(), 1)
@@ -4,22 +4,28 @@ from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.core.mail import send_mail
 from django.conf import settings
+from django.db import transaction
 from rest_framework import viewsets, status, generics, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.authtoken.models import Token
 from rest_framework.views import APIView
 
+from apps.core.fieldsets import SparseFieldsetMixin
 from .models import User, UserActivity
 from .serializers import (
     UserSerializer, 
     LoginSerializer, 
+    TokenRefreshSerializer,
     TokenSerializer, 
     PasswordResetRequestSerializer, 
     PasswordResetConfirmSerializer,
     UserActivitySerializer
 )
 from .adapters import get_client_ip
+from .authentication import issue_token, rotate_token
+from .logins import record_login
+from audit.buffer import audit_buffer
 
 User = get_user_model()
 
@@ -32,7 +38,7 @@ class IsAdminUser(permissions.BasePermission):
         return request.user and request.user.is_staff
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing user instances.
     """
@@ -71,12 +77,12 @@ class UserViewSet(viewsets.ModelViewSet):
         
         # Log the activity
         ip_address = get_client_ip(self.request)
-        UserActivity.objects.create(
+        audit_buffer.add(UserActivity(
             user=self.request.user,
             action=f"Created user {user.email}",
             ip_address=ip_address,
             user_agent=self.request.META.get('HTTP_USER_AGENT', '')
-        )
+        ))
         
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     
@@ -86,12 +92,12 @@ class UserViewSet(viewsets.ModelViewSet):
         
         # Log the activity
         ip_address = get_client_ip(self.request)
-        UserActivity.objects.create(
+        audit_buffer.add(UserActivity(
             user=self.request.user,
             action=f"Updated user {user.email}",
             ip_address=ip_address,
             user_agent=self.request.META.get('HTTP_USER_AGENT', '')
-        )
+        ))
         
         return Response(serializer.data)
     
@@ -102,12 +108,12 @@ class UserViewSet(viewsets.ModelViewSet):
         
         # Log the activity
         ip_address = get_client_ip(self.request)
-        UserActivity.objects.create(
+        audit_buffer.add(UserActivity(
             user=self.request.user,
             action=f"Deleted user {email}",
             ip_address=ip_address,
             user_agent=self.request.META.get('HTTP_USER_AGENT', '')
-        )
+        ))
         
         return Response(status=status.HTTP_204_NO_CONTENT)
     
@@ -131,34 +137,10 @@ class LoginView(APIView):
         user = serializer.validated_data['user']
         remember = serializer.validated_data.get('remember', False)
         
-        # Get or create token
-        token, created = Token.objects.get_or_create(user=user)
-        
-        # If remember me is not checked, set token to expire in 24 hours
-        if not remember and hasattr(token, 'expires'):
-            token.expires = timezone.now() + timezone.timedelta(hours=24)
-            token.save()
-        
-        # Update user's last login information
-        user.last_login = timezone.now()
-        
-        # Check if fields exist before updating
-        if hasattr(user, 'last_login_ip'):
-            user.last_login_ip = get_client_ip(request)
-        
-        if hasattr(user, 'last_login_user_agent'):
-            user.last_login_user_agent = request.META.get('HTTP_USER_AGENT', '')
-        
-        # Save without specifying update_fields to avoid the error
-        user.save()
-        
-        # Log the activity
-        UserActivity.objects.create(
-            user=user,
-            action=f"User login",
-            ip_address=get_client_ip(request),
-            user_agent=request.META.get('HTTP_USER_AGENT', '')
-        )
+        # Issue the token and record the login in one transaction
+        with transaction.atomic():
+            token = issue_token(user, remember)
+            record_login(request, user)
         
         # Return the token and user info
         token_serializer = TokenSerializer(token)
@@ -173,22 +155,40 @@ class LogoutView(APIView):
     
     def post(self, request):
         # Log the activity before deleting the token
-        UserActivity.objects.create(
+        audit_buffer.add(UserActivity(
             user=request.user,
             action=f"User logout",
             ip_address=get_client_ip(request),
             user_agent=request.META.get('HTTP_USER_AGENT', '')
-        )
+        ))
         
-        # Delete the user's token
+        # Delete the user's token; this also drops it from the token cache
         try:
-            request.user.auth_token.delete()
-        except:
+            token = request.auth if isinstance(request.auth, Token) else request.user.auth_token
+            token.delete()
+        except Token.DoesNotExist:
             pass
         
         return Response({"detail": "Successfully logged out."}, status=status.HTTP_200_OK)
 
 
+class TokenRefreshView(APIView):
+    """
+    API View exchanging the request's token for a new key with a fresh expiry
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def post(self, request):
+        serializer = TokenRefreshSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if not isinstance(request.auth, Token):
+            return Response({"detail": "Only token-authenticated requests can refresh a token."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        
+        token = rotate_token(request.auth, serializer.validated_data['remember'])
+        return Response({'key': token.key, 'expires_at': token.expiry.expires_at})
+
+
 class PasswordResetRequestView(APIView):
     """
     API View for requesting a password reset
@@ -224,12 +224,12 @@ class PasswordResetRequestView(APIView):
             )
             
             # Log the activity
-            UserActivity.objects.create(
+            audit_buffer.add(UserActivity(
                 user=user,
                 action=f"Password reset requested",
                 ip_address=get_client_ip(request),
                 user_agent=request.META.get('HTTP_USER_AGENT', '')
-            )
+            ))
             
         except User.DoesNotExist:
             # We don't want to reveal whether an email exists or not
@@ -263,12 +263,12 @@ class PasswordResetConfirmView(APIView):
             user.save()
             
             # Log the activity
-            UserActivity.objects.create(
+            audit_buffer.add(UserActivity(
                 user=user,
                 action=f"Password reset completed",
                 ip_address=get_client_ip(request),
                 user_agent=request.META.get('HTTP_USER_AGENT', '')
-            )
+            ))
             
             return Response({"detail": "Password has been reset successfully."}, status=status.HTTP_200_OK)
             
@@ -276,7 +276,7 @@ class PasswordResetConfirmView(APIView):
             return Response({"detail": "Invalid or expired token."}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class UserActivityViewSet(viewsets.ReadOnlyModelViewSet):
+class UserActivityViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for viewing user activity logs
     """
@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class CoreConfig(AppConfig):
@@ -7,6 +8,17 @@ class CoreConfig(AppConfig):
     verbose_name = 'Core'
 
     def ready(self):
+        from .reference import connect_reference_signals
+        from .schema import invalidate_schema
+        from .settings_registry import system_settings
+
+        # Table presence is cached per process until the schema changes
+        post_migrate.connect(invalidate_schema, dispatch_uid='core_invalidate_schema')
+
+        # Writes to reference models invalidate the reference cache
+        connect_reference_signals()
+        system_settings.connect()
+
         # Import signals only if the module exists
         try:
             import apps.core.signals  # noqa
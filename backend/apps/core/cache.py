@@ -0,0 +1,71 @@
+"""
+Namespaced access to the shared cache.
+
+Every namespace (rate limiting, security, reference data, sessions,
+profiles, reports) is a cache alias in settings.CACHES with its own key
+prefix, default TTL and, for the local backend, size limit. Code should go through
+get_cache() rather than `django.core.cache.cache` so keys land in the right
+namespace.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+
+RATELIMIT = 'ratelimit'
+SECURITY = 'security'
+REFERENCE = 'reference'
+SESSIONS = 'sessions'
+PROFILES = 'profiles'
+REPORTS = 'reports'
+
+
+def get_cache(namespace):
+    """Return the cache for `namespace`, falling back to the default cache"""
+    if namespace in settings.CACHES:
+        return caches[namespace]
+    return caches['default']
+
+
+def incr(namespace, key, delta=1, timeout=DEFAULT_TIMEOUT):
+    """
+    Increment a counter, creating it with `timeout` if it does not exist,
+    and return the new value
+    """
+    cache = get_cache(namespace)
+    if hasattr(cache, 'incr_with_expiry'):
+        return cache.incr_with_expiry(key, delta, timeout)
+
+    # Backends without an atomic primitive get the closest equivalent
+    cache.add(key, 0, timeout)
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        cache.set(key, delta, timeout)
+        return delta
+
+
+def get_many(namespace, keys):
+    """Fetch several keys in one round trip"""
+    return get_cache(namespace).get_many(keys)
+
+
+def set_many(namespace, mapping, timeout=DEFAULT_TIMEOUT):
+    """Store several keys in one round trip"""
+    if mapping:
+        get_cache(namespace).set_many(mapping, timeout)
+
+
+def get_or_set_many(namespace, keys, loader, timeout=DEFAULT_TIMEOUT):
+    """
+    Fetch `keys` in one round trip, load the missing ones with
+    `loader(missing_keys) -> dict` and store those in one more
+    """
+    cache = get_cache(namespace)
+    found = cache.get_many(keys)
+    missing = [key for key in keys if key not in found]
+    if missing:
+        loaded = loader(missing)
+        if loaded:
+            cache.set_many(loaded, timeout)
+            found.update(loaded)
+    return found
@@ -0,0 +1,57 @@
+"""
+Cache backends for the cache namespaces configured in settings.CACHES.
+
+RedisCache is the shared backend used when Redis is configured. LocalCache
+is an in-process stand-in with the same extra operations, used by tests and
+single-box deployments that run without Redis.
+"""
+import pickle
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.cache.backends.redis import RedisCache as DjangoRedisCache
+
+
+class RedisCache(DjangoRedisCache):
+    """
+    Django's Redis backend with an atomic increment-with-expiry
+    """
+
+    def incr_with_expiry(self, key, delta=1, timeout=DEFAULT_TIMEOUT, version=None):
+        """
+        Increment `key` by `delta`, creating it with `timeout` if it does not
+        exist, and return the new value. Runs INCRBY and EXPIRE NX in a
+        single MULTI/EXEC round trip (EXPIRE NX needs Redis 7)
+        """
+        key = self.make_and_validate_key(key, version=version)
+        timeout = self.get_backend_timeout(timeout)
+        client = self._cache.get_client(key, write=True)
+        pipeline = client.pipeline()
+        pipeline.incrby(key, delta)
+        if timeout is not None:
+            pipeline.expire(key, max(timeout, 1), nx=True)
+        return pipeline.execute()[0]
+
+
+class LocalCache(LocMemCache):
+    """
+    In-process cache with the same operations as RedisCache
+    """
+
+    def incr_with_expiry(self, key, delta=1, timeout=DEFAULT_TIMEOUT, version=None):
+        """
+        Increment `key` by `delta`, creating it with `timeout` if it does not
+        exist, and return the new value
+        """
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            if self._has_expired(key):
+                self._delete(key)
+            if key in self._cache:
+                value = pickle.loads(self._cache[key]) + delta
+                self._cache[key] = pickle.dumps(value, self.pickle_protocol)
+                self._cache.move_to_end(key, last=False)
+            else:
+                value = delta
+                self._set(key, pickle.dumps(value, self.pickle_protocol), timeout)
+        return value
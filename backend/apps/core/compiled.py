@@ -0,0 +1,344 @@
+"""
+Compiled serializers for read-only list endpoints.
+
+Serializing a list page with DRF builds a model instance per row and then
+walks every serializer field through `get_attribute`/`to_representation`.
+For wide, flat serializers most of that work is bookkeeping. A compiled
+serializer instead:
+
+* works out once which columns the serializer reads, including columns of
+  forward foreign keys for nested serializers such as UserMinimalSerializer,
+* fetches just those columns with `values()`, and
+* turns the row dicts into output dicts with a Python function generated
+  for that serializer (and fieldset). ISO dates and datetimes are
+  formatted inline with the active timezone looked up once per page, and a
+  field's own `to_representation` is only called where it does more than
+  `str`/`int`/`bool`.
+
+`get_<choice>_display` sources are answered from the model field's choices.
+A SerializerMethodField can take part when the serializer also defines a
+`row_<field name>(self, row)` twin decorated with `@reads(...)` that builds
+the same value from `values()` columns.
+
+Serializers the compiler does not understand (file fields, many-to-many or
+reverse relations, custom `to_representation`, method fields without a
+twin...) are not compiled and keep going through DRF, so compilation is
+always safe to ask for. `check_parity` compares both paths on real rows.
+"""
+import logging
+import threading
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.utils import timezone
+from django.utils.encoding import force_str
+from django.utils.hashable import make_hashable
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, PrimaryKeyRelatedField, RelatedField
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.settings import ISO_8601, api_settings
+
+logger = logging.getLogger(__name__)
+
+# Field classes whose to_representation is exactly this builtin
+BUILTIN_CONVERTERS = {
+    serializers.CharField: str,
+    serializers.EmailField: str,
+    serializers.SlugField: str,
+    serializers.URLField: str,
+    serializers.IntegerField: int,
+    serializers.BooleanField: bool,
+}
+
+
+def is_iso(field, default):
+    """Whether a date/datetime field renders ISO 8601 strings"""
+    output_format = getattr(field, 'format', default)
+    return isinstance(output_format, str) and output_format.lower() == ISO_8601
+
+
+def iso_date(value):
+    """DateField.to_representation for ISO 8601 output"""
+    return value.isoformat() if value else None
+
+
+def iso_datetime(value, tz):
+    """DateTimeField.to_representation for ISO 8601 output in timezone `tz`"""
+    if not value:
+        return None
+    value = value.astimezone(tz) if timezone.is_aware(value) else timezone.make_aware(value, tz)
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+class CompileError(Exception):
+    """The serializer uses something the compiler cannot reproduce"""
+
+
+def reads(*paths):
+    """
+    Declare the `values()` lookups a ``row_<field>`` twin of a
+    SerializerMethodField reads from its row
+    """
+    def decorator(func):
+        func.reads = paths
+        return func
+    return decorator
+
+
+class CompiledSerializer:
+    """
+    A row-to-dict function generated for one serializer and fieldset
+    """
+
+    def __init__(self, serializer_class, paths, function, source):
+        self.serializer_class = serializer_class
+        self.paths = paths
+        self.render_rows = function
+        # Kept for debugging: the generated Python code
+        self.source = source
+
+    def values(self, queryset, extra=()):
+        """Restrict `queryset` to the columns the serializer reads"""
+        paths = list(dict.fromkeys([*self.paths, *extra]))
+        return queryset.prefetch_related(None).values(*paths)
+
+    def render(self, rows):
+        """Return the representation of every row dict in `rows`"""
+        return self.render_rows(rows)
+
+    def to_representation(self, row):
+        return self.render_rows([row])[0]
+
+
+class Compiler:
+    """
+    Translates a serializer instance into Python source for a row function
+    """
+
+    def __init__(self, serializer):
+        self.serializer = serializer
+        self.paths = {}
+        self.namespace = {}
+
+    def bind(self, value):
+        """Make `value` available to the generated code and return its name"""
+        name = f"_v{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def column(self, path):
+        self.paths[path] = None
+        return f"row[{path!r}]"
+
+    def compile(self):
+        model = self.serializer.Meta.model
+        # Always select the primary key, so a distinct() queryset keeps its rows
+        self.column(model._meta.pk.name)
+        body = self.serializer_expression(self.serializer, model, '')
+        source = (
+            f"def render(rows):\n"
+            f"    tz = {self.bind(timezone.get_current_timezone)}()\n"
+            f"    return [{body} for row in rows]\n"
+        )
+        exec(compile(source, f"<compiled {type(self.serializer).__name__}>", 'exec'), self.namespace)
+        return CompiledSerializer(type(self.serializer), list(self.paths), self.namespace['render'], source)
+
+    def serializer_expression(self, serializer, model, prefix):
+        if not isinstance(serializer, serializers.ModelSerializer):
+            raise CompileError(f"{type(serializer).__name__} is not a ModelSerializer")
+        if type(serializer).to_representation is not serializers.Serializer.to_representation:
+            raise CompileError(f"{type(serializer).__name__} overrides to_representation")
+        items = [
+            f"{field.field_name!r}: {self.field_expression(field, model, prefix)}"
+            for field in serializer._readable_fields
+        ]
+        return '{' + ', '.join(items) + '}'
+
+    def resolve(self, model, attrs):
+        """
+        Follow `attrs` through forward relations of `model` and return the
+        final model field. Intermediate relations must not be nullable: DRF
+        skips a field whose path crosses a None, which values() cannot tell.
+        """
+        field = None
+        for index, attr in enumerate(attrs):
+            try:
+                field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                raise CompileError(f"{model.__name__}.{attr} is not a model field")
+            last = index == len(attrs) - 1
+            if field.many_to_many or field.one_to_many or (field.is_relation and not field.concrete):
+                raise CompileError(f"{model.__name__}.{attr} is not a forward relation")
+            if not last:
+                if not field.is_relation or field.null:
+                    raise CompileError(f"{model.__name__}.{attr} cannot be traversed safely")
+                model = field.related_model
+        return field
+
+    def field_expression(self, field, model, prefix):
+        if isinstance(field, serializers.SerializerMethodField):
+            return self.method_expression(field, prefix)
+        if isinstance(field, (ManyRelatedField, serializers.ListSerializer, serializers.FileField)):
+            raise CompileError(f"{field.field_name} cannot be read from values()")
+        if field.source == '*':
+            raise CompileError(f"{field.field_name} uses source='*'")
+
+        attrs = field.source_attrs
+        if isinstance(field, serializers.BaseSerializer):
+            relation = self.resolve(model, attrs)
+            if not relation.is_relation:
+                raise CompileError(f"{field.field_name} does not follow a relation")
+            nested_prefix = f"{prefix}{'__'.join(attrs)}__"
+            nested = self.serializer_expression(field, relation.related_model, nested_prefix)
+            if relation.null:
+                pk_path = f"{nested_prefix}{relation.related_model._meta.pk.name}"
+                return f"(None if {self.column(pk_path)} is None else {nested})"
+            return nested
+
+        if isinstance(field, PrimaryKeyRelatedField):
+            if len(attrs) != 1 or field.pk_field is not None:
+                raise CompileError(f"{field.field_name} is not a plain foreign key")
+            relation = self.resolve(model, attrs)
+            if not relation.is_relation:
+                raise CompileError(f"{field.field_name} is not a foreign key")
+            # values() returns the key itself, which is what DRF renders
+            return self.column(f"{prefix}{attrs[0]}")
+        if isinstance(field, RelatedField):
+            raise CompileError(f"{field.field_name} renders related instances")
+
+        if len(attrs) == 1 and attrs[0].startswith('get_') and attrs[0].endswith('_display'):
+            return self.display_expression(field, model, prefix, attrs[0][4:-8])
+
+        model_field = self.resolve(model, attrs)
+        if model_field.is_relation:
+            raise CompileError(f"{field.field_name} renders a related instance")
+        column = self.column(f"{prefix}{'__'.join(attrs)}")
+        if isinstance(field, serializers.ReadOnlyField):
+            return column
+        expression = self.converter_expression(field, column)
+        if model_field.null:
+            return f"(None if {column} is None else {expression})"
+        return expression
+
+    def converter_expression(self, field, column):
+        if type(field) is serializers.DateField and is_iso(field, api_settings.DATE_FORMAT):
+            return f"{self.bind(iso_date)}({column})"
+        if (type(field) is serializers.DateTimeField and is_iso(field, api_settings.DATETIME_FORMAT)
+                and settings.USE_TZ and not hasattr(field, 'timezone')):
+            return f"{self.bind(iso_datetime)}({column}, tz)"
+        converter = BUILTIN_CONVERTERS.get(type(field)) or field.to_representation
+        return f"{self.bind(converter)}({column})"
+
+    def display_expression(self, field, model, prefix, name):
+        model_field = self.resolve(model, [name])
+        if not model_field.choices:
+            raise CompileError(f"{model.__name__}.{name} has no choices")
+        # The same lookup Model._get_FIELD_display does
+        choices = dict(make_hashable(model_field.flatchoices))
+        represent = field.to_representation
+
+        def display(value):
+            label = force_str(choices.get(make_hashable(value), value), strings_only=True)
+            return None if label is None else represent(label)
+
+        return f"{self.bind(display)}({self.column(prefix + name)})"
+
+    def method_expression(self, field, prefix):
+        twin = getattr(field.parent, f"row_{field.field_name}", None)
+        if twin is None or not hasattr(twin, 'reads'):
+            raise CompileError(f"{field.field_name} has no row_{field.field_name} twin")
+        if prefix:
+            raise CompileError(f"{field.field_name} twin is on a nested serializer")
+        for path in twin.reads:
+            self.column(path)
+        return f"{self.bind(twin)}(row)"
+
+
+_compiled = {}
+_compiled_lock = threading.Lock()
+
+# Fieldsets come from query strings; see optimizer.MAX_PLANS
+MAX_COMPILED = 1000
+
+
+def compile_serializer(serializer_class, fieldset=None):
+    """
+    Return the CompiledSerializer for `serializer_class` pruned by
+    `fieldset`, or None if it cannot be compiled
+    """
+    key = (serializer_class, fieldset.key if fieldset else None)
+    try:
+        return _compiled[key]
+    except KeyError:
+        pass
+
+    serializer = serializer_class()
+    if fieldset:
+        fieldset.apply(serializer)
+    try:
+        compiled = Compiler(serializer).compile()
+    except CompileError as exc:
+        logger.debug("Not compiling %s: %s", serializer_class.__name__, exc)
+        compiled = None
+    with _compiled_lock:
+        if len(_compiled) >= MAX_COMPILED:
+            _compiled.clear()
+        _compiled[key] = compiled
+    return compiled
+
+
+def check_parity(serializer_class, queryset, fieldset=None):
+    """
+    Serialize `queryset` with DRF and with the compiled serializer and
+    return the rows whose JSON differs, as (expected, actual) pairs
+    """
+    compiled = compile_serializer(serializer_class, fieldset)
+    if compiled is None:
+        raise CompileError(f"{serializer_class.__name__} cannot be compiled")
+    serializer = serializer_class(list(queryset), many=True)
+    if fieldset:
+        fieldset.apply(serializer)
+    renderer = JSONRenderer()
+    expected = [renderer.render(row) for row in serializer.data]
+    actual = [renderer.render(row) for row in compiled.render(compiled.values(queryset))]
+    return [(e, a) for e, a in zip(expected, actual) if e != a] + [
+        (e, None) for e in expected[len(actual):]
+    ] + [(None, a) for a in actual[len(expected):]]
+
+
+class CompiledListMixin:
+    """
+    ViewSet mixin that serves `list` through a compiled serializer when the
+    active serializer (after ?fields/?omit/?expand) can be compiled
+    """
+
+    def get_compiled_serializer(self):
+        if not getattr(settings, 'COMPILED_SERIALIZERS_ENABLE', True):
+            return None
+        get_fieldset = getattr(self, 'get_fieldset', None)
+        fieldset = get_fieldset() if get_fieldset is not None else None
+        return compile_serializer(self.get_serializer_class(), fieldset)
+
+    def get_keyset_columns(self, queryset):
+        """Columns keyset pagination reads from each row to build its cursors"""
+        from .pagination import KeysetPagination
+
+        ordering = KeysetPagination().get_ordering(queryset) or []
+        pk_name = queryset.model._meta.pk.name
+        return [pk_name if lookup == 'pk' else lookup for lookup, _ in ordering]
+
+    def list(self, request, *args, **kwargs):
+        compiled = self.get_compiled_serializer()
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = compiled.values(queryset, extra=self.get_keyset_columns(queryset))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(compiled.render(page))
+        return Response(compiled.render(rows))
@@ -0,0 +1,133 @@
+"""
+HTTP conditional GET for ViewSets.
+
+Dashboards poll lists such as notifications, invoices and schedules far
+more often than the rows change. ConditionalGetMixin computes a cheap
+validator before anything is serialized and answers `304 Not Modified`
+when the client already holds the current representation:
+
+* list: one aggregate over the filtered queryset, the latest `updated_at`
+  and the row count (so deletions change the validator too), sent as a
+  weak ETag;
+* retrieve: the object's own `updated_at`, sent as ETag and Last-Modified.
+
+Representations that embed related rows name those relations in
+`conditional_relations`; their latest `updated_at` and row count are
+folded into the same aggregate, e.g. ``('items', 'payments')``. Such
+responses only carry the ETag, since a deleted related row does not move
+any timestamp.
+
+Keyset-paginated lists (``?pagination=cursor``) are left alone because the
+aggregate would scan the rows those pages are designed to skip.
+
+The validator also covers the request path (filters, page), the user and
+the negotiated media type, because all of them change the body.
+"""
+import hashlib
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+TIMESTAMP_FIELD = 'updated_at'
+
+
+class ConditionalGetMixin:
+    """
+    ViewSet mixin that answers conditional list and retrieve requests with
+    304 Not Modified when the data has not changed
+    """
+    conditional_relations = ()
+
+    @property
+    def conditional_enabled(self):
+        return getattr(settings, 'CONDITIONAL_GET_ENABLE', True)
+
+    def get_validator_aggregates(self):
+        aggregates = {
+            'last_modified': Max(TIMESTAMP_FIELD),
+            'count': Count('pk', distinct=True),
+        }
+        for relation in self.conditional_relations:
+            aggregates[f"{relation}_modified"] = Max(f"{relation}__{TIMESTAMP_FIELD}")
+            aggregates[f"{relation}_count"] = Count(relation, distinct=True)
+        return aggregates
+
+    def should_validate_list(self, request):
+        """
+        Keyset pages exist so deep listings never COUNT the table; they are
+        served without a validator
+        """
+        wants_keyset = getattr(self.paginator, 'wants_keyset', None)
+        return not (wants_keyset and wants_keyset(request))
+
+    def make_etag(self, request, state):
+        """Return a weak ETag over `state` and everything else the body depends on"""
+        parts = [
+            type(self).__name__,
+            self.action,
+            request.get_full_path(),
+            request.user.pk,
+            getattr(request, 'accepted_media_type', ''),
+        ]
+        parts.extend(f"{name}={state[name]}" for name in sorted(state))
+        digest = hashlib.md5('|'.join(map(str, parts)).encode()).hexdigest()
+        return f'W/"{digest}"'
+
+    def conditional_response(self, request, etag, last_modified, build):
+        """
+        Return 304 if the request's validators match, otherwise the response
+        made by `build` with the validators attached
+        """
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = build()
+            if response.status_code != 200:
+                return response
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+        # Clients may keep the body but must revalidate before reusing it
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        parent = super()
+        if not self.conditional_enabled or not self.should_validate_list(request):
+            return parent.list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        state = queryset.order_by().aggregate(**self.get_validator_aggregates())
+        # No Last-Modified for lists: a deleted row does not move the
+        # latest timestamp, only the count in the ETag catches it
+        return self.conditional_response(
+            request,
+            self.make_etag(request, state),
+            None,
+            lambda: parent.list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        parent = super()
+        if not self.conditional_enabled:
+            return parent.retrieve(request, *args, **kwargs)
+
+        instance = self.get_object()
+        if self.conditional_relations:
+            state = type(instance)._default_manager.filter(pk=instance.pk).aggregate(
+                **self.get_validator_aggregates()
+            )
+            last_modified = None
+        else:
+            last_modified = getattr(instance, TIMESTAMP_FIELD)
+            state = {'last_modified': last_modified}
+        # The instance is already loaded, serialize it rather than fetch it again
+        return self.conditional_response(
+            request,
+            self.make_etag(request, state),
+            last_modified,
+            lambda: Response(self.get_serializer(instance).data)
+        )
@@ -0,0 +1,128 @@
+"""
+Sparse fieldsets for API responses.
+
+Every read endpoint accepts three query parameters, each a comma-separated
+list of field names where a dot reaches into a nested serializer:
+
+* ``?fields=id,total,student_details.full_name`` keeps only those fields;
+* ``?omit=created_by,updated_by`` drops fields;
+* ``?expand=term`` replaces a primary key field with its nested
+  representation, for names a serializer lists in
+  ``Meta.expandable_fields`` (a mapping of field name to serializer class
+  or dotted import path).
+
+The serializer is pruned after it is built, so no serializer needs to know
+about it. QuerySetOptimizerMixin plans the queryset from the pruned
+serializer, so joins, prefetches and columns that only fed dropped fields
+are not loaded either.
+"""
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+EXPAND_PARAM = 'expand'
+
+
+def parse_field_list(value):
+    """
+    Turn ``'a,b.c,b.d'`` into the tree ``{'a': {}, 'b': {'c': {}, 'd': {}}}``
+    """
+    tree = {}
+    for path in (value or '').split(','):
+        node = tree
+        for name in filter(None, (part.strip() for part in path.split('.'))):
+            node = node.setdefault(name, {})
+    return tree
+
+
+def _freeze(tree):
+    return tuple(sorted((name, _freeze(children)) for name, children in tree.items()))
+
+
+def _target(serializer):
+    """The serializer whose fields describe one row"""
+    if isinstance(serializer, serializers.ListSerializer):
+        return serializer.child
+    return serializer
+
+
+def _expanded_field(spec):
+    if isinstance(spec, (tuple, list)):
+        spec, kwargs = spec
+    else:
+        kwargs = {}
+    if isinstance(spec, str):
+        spec = import_string(spec)
+    return spec(read_only=True, **kwargs)
+
+
+class Fieldset:
+    """
+    A parsed fields/omit/expand selection that can prune serializers
+    """
+
+    def __init__(self, fields=None, omit=None, expand=None):
+        self.fields = fields or {}
+        self.omit = omit or {}
+        self.expand = expand or {}
+        # Hashable, order-independent identity, used to cache query plans
+        self.key = (_freeze(self.fields), _freeze(self.omit), _freeze(self.expand))
+
+    @classmethod
+    def from_query_params(cls, params):
+        """Return the Fieldset requested by `params`, or None if there is none"""
+        values = [params.get(name) for name in (FIELDS_PARAM, OMIT_PARAM, EXPAND_PARAM)]
+        if not any(values):
+            return None
+        return cls(*(parse_field_list(value) for value in values))
+
+    def __bool__(self):
+        return bool(self.fields or self.omit or self.expand)
+
+    def apply(self, serializer):
+        """Prune `serializer` (or the child of a list serializer) in place"""
+        _prune(_target(serializer), self.fields, self.omit, self.expand)
+        return serializer
+
+
+def _prune(serializer, fields, omit, expand):
+    expandable = getattr(getattr(serializer, 'Meta', None), 'expandable_fields', {})
+    for name in expand:
+        if name in expandable:
+            serializer.fields[name] = _expanded_field(expandable[name])
+
+    for name in list(serializer.fields):
+        if fields and name not in fields:
+            del serializer.fields[name]
+        elif name in omit and not omit[name]:
+            del serializer.fields[name]
+
+    for name, field in serializer.fields.items():
+        nested = fields.get(name), omit.get(name), expand.get(name)
+        if any(nested) and isinstance(field, serializers.BaseSerializer):
+            _prune(_target(field), *(tree or {} for tree in nested))
+
+
+class SparseFieldsetMixin:
+    """
+    ViewSet mixin that applies ``?fields``, ``?omit`` and ``?expand`` to the
+    serializers of read requests
+    """
+
+    def get_fieldset(self):
+        """Return the request's Fieldset, or None when the response is not pruned"""
+        request = getattr(self, 'request', None)
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        if not hasattr(self, '_fieldset'):
+            self._fieldset = Fieldset.from_query_params(request.query_params)
+        return self._fieldset
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        fieldset = self.get_fieldset()
+        if fieldset:
+            fieldset.apply(serializer)
+        return serializer
@@ -0,0 +1,244 @@
+"""
+SQL query instrumentation for API requests.
+
+QueryInstrumentationMiddleware counts the queries and database time spent
+on every request, tags the sample with the resolved view/action
+(e.g. ``InvoiceViewSet.list``) and flags query shapes that repeat within a
+single request, which is the signature of an N+1 pattern.
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (inclusive) of the query-count histogram buckets
+HISTOGRAM_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+_IN_LIST_RE = re.compile(r'\bIN\s*\((?:\s*%s\s*,?)+\)', re.IGNORECASE)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_sql(sql):
+    """
+    Reduce a SQL statement to its shape so that queries which only differ
+    by their parameters compare equal
+    """
+    shape = _STRING_RE.sub('?', sql)
+    shape = _NUMBER_RE.sub('?', shape)
+    shape = _IN_LIST_RE.sub('IN (...)', shape)
+    return _WHITESPACE_RE.sub(' ', shape).strip()
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper that records the number, duration and shape
+    of the queries run through it
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.shapes[normalize_sql(sql)] += 1
+
+    @property
+    def duration_ms(self):
+        return self.duration * 1000
+
+    def repeated_shapes(self, threshold=None):
+        """Return the query shapes executed at least `threshold` times"""
+        if threshold is None:
+            threshold = getattr(settings, 'QUERY_N_PLUS_ONE_THRESHOLD', 5)
+        return {shape: count for shape, count in self.shapes.items() if count >= threshold}
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class QueryStatsRegistry:
+    """
+    Process-local rolling window of query samples per endpoint
+    """
+
+    def __init__(self, window=None):
+        self.window = window
+        self._samples = defaultdict(self._new_window)
+        self._lock = threading.Lock()
+
+    def _new_window(self):
+        window = self.window or getattr(settings, 'QUERY_STATS_WINDOW', 500)
+        return deque(maxlen=window)
+
+    def record(self, endpoint, queries, duration_ms, n_plus_one=0, budget=None):
+        with self._lock:
+            self._samples[endpoint].append((queries, duration_ms, n_plus_one, budget))
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+    def snapshot(self, endpoint=None):
+        """Summarise the recorded samples, optionally for a single endpoint"""
+        with self._lock:
+            samples = {
+                name: list(window) for name, window in self._samples.items()
+                if endpoint is None or name == endpoint
+            }
+
+        summary = {}
+        for name, rows in samples.items():
+            if not rows:
+                continue
+            queries = [row[0] for row in rows]
+            durations = [row[1] for row in rows]
+
+            histogram = {}
+            lower = 0
+            for upper in HISTOGRAM_BUCKETS:
+                histogram[f"{lower}-{upper}"] = sum(1 for q in queries if lower <= q <= upper)
+                lower = upper + 1
+            histogram[f"{lower}+"] = sum(1 for q in queries if q >= lower)
+
+            summary[name] = {
+                'samples': len(rows),
+                'queries': {
+                    'min': min(queries),
+                    'p50': _percentile(queries, 0.5),
+                    'p95': _percentile(queries, 0.95),
+                    'max': max(queries),
+                    'mean': round(sum(queries) / len(queries), 2),
+                },
+                'db_ms': {
+                    'p50': round(_percentile(durations, 0.5), 2),
+                    'p95': round(_percentile(durations, 0.95), 2),
+                    'max': round(max(durations), 2),
+                },
+                'histogram': histogram,
+                'n_plus_one_requests': sum(1 for row in rows if row[2]),
+                'over_budget_requests': sum(
+                    1 for row in rows if row[3] is not None and row[0] > row[3]
+                ),
+                'budget': rows[-1][3],
+            }
+        return summary
+
+
+query_stats = QueryStatsRegistry()
+
+
+def resolve_endpoint_name(view_func, method):
+    """
+    Build a `ViewClass.action` name for a resolved view function
+    """
+    view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    if view_class is None:
+        return getattr(view_func, '__name__', 'unknown')
+
+    # ViewSets (including @action routes) carry the method -> action mapping
+    actions = getattr(view_func, 'actions', None) or {}
+    action = actions.get(method.lower(), method.lower())
+    return f"{view_class.__name__}.{action}"
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Middleware that records query counts and DB time per request
+    """
+
+    header_name = 'X-Query-Stats'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'QUERY_INSTRUMENTATION_ENABLE', True):
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(recorder))
+            response = self.get_response(request)
+
+        endpoint = getattr(request, 'query_endpoint', None)
+        if endpoint is None:
+            return response
+
+        budget = getattr(request, 'query_budget', None)
+        repeated = recorder.repeated_shapes()
+        query_stats.record(endpoint, recorder.count, recorder.duration_ms, len(repeated), budget)
+
+        if repeated:
+            logger.warning(
+                "Possible N+1 queries in %s: %s",
+                endpoint,
+                "; ".join(f"{count}x {shape[:200]}" for shape, count in repeated.items())
+            )
+        if budget is not None and recorder.count > budget:
+            logger.warning(
+                "%s ran %d queries, over its budget of %d", endpoint, recorder.count, budget
+            )
+
+        if self.wants_header(request):
+            response[self.header_name] = (
+                f"endpoint={endpoint}; queries={recorder.count}; "
+                f"db_ms={recorder.duration_ms:.2f}; n_plus_one={len(repeated)}"
+                + (f"; budget={budget}" if budget is not None else "")
+            )
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_endpoint = resolve_endpoint_name(view_func, request.method)
+        return None
+
+    def wants_header(self, request):
+        """The stats header is opt-in and only shown to staff or in DEBUG"""
+        if 'HTTP_X_QUERY_STATS' not in request.META:
+            return False
+        if settings.DEBUG:
+            return True
+        user = getattr(request, 'user', None)
+        return bool(user is not None and user.is_authenticated and user.is_staff)
+
+
+class QueryBudgetMixin:
+    """
+    ViewSet mixin that declares the maximum number of queries per action.
+
+    `query_budget` is either an int applied to every action or a dict
+    mapping action names to budgets, e.g. ``{'list': 6, 'retrieve': 6}``.
+    """
+    query_budget = None
+
+    def get_query_budget(self, action=None):
+        action = action or self.action
+        if isinstance(self.query_budget, dict):
+            return self.query_budget.get(action)
+        return self.query_budget
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        action = self.action or request.method.lower()
+        request._request.query_endpoint = f"{type(self).__name__}.{action}"
+        request._request.query_budget = self.get_query_budget(action)
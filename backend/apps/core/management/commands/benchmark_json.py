@@ -0,0 +1,106 @@
+import datetime
+import decimal
+import io
+import random
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.core.renderers import FastJSONParser, FastJSONRenderer, use_orjson
+
+
+def user_row(rng, pk):
+    return {'id': pk, 'username': f'user{pk}', 'email': f'user{pk}@example.com', 'user_type': 'staff'}
+
+
+def money(rng, high=5000):
+    return decimal.Decimal(rng.randint(100, high * 100)) / 100
+
+
+def invoice_row(rng, pk, now):
+    """One invoice as InvoiceSerializer renders it: nested student, items and payments"""
+    student = {
+        'id': pk % 500, 'student_id': f'S{pk % 500:05d}', 'full_name': f'Student {pk % 500}',
+        'email': f'student{pk % 500}@example.com', 'user_details': user_row(rng, pk % 500),
+        'admission_date': '2023-09-01', 'status': 'active', 'created_at': now.isoformat(),
+    }
+    items = [{
+        'id': pk * 10 + n, 'description': f'Fee item {n}', 'quantity': 1,
+        'unit_price': str(money(rng)), 'subtotal': str(money(rng)), 'created_at': now.isoformat(),
+    } for n in range(4)]
+    payments = [{
+        'id': pk * 10 + n, 'amount': str(money(rng)), 'payment_method': 'bank_transfer',
+        'payment_method_display': 'Bank Transfer', 'status': 'completed', 'status_display': 'Completed',
+        'transaction_id': str(uuid.UUID(int=rng.getrandbits(128))), 'payment_date': now.isoformat(),
+        'received_by_details': user_row(rng, 1),
+    } for n in range(2)]
+    return {
+        'id': pk, 'invoice_number': f'INV-{pk:06d}', 'student': student['id'], 'student_details': student,
+        'subtotal': str(money(rng)), 'discount': '0.00', 'tax': '0.00', 'total': str(money(rng)),
+        'status': 'partial', 'status_display': 'Partially Paid', 'issue_date': '2024-09-01',
+        'due_date': '2024-09-30', 'items': items, 'payments': payments,
+        'created_by': user_row(rng, 1), 'updated_by': user_row(rng, 1),
+        'created_at': now.isoformat(), 'updated_at': now.isoformat(),
+    }
+
+
+def analytics_row(rng, pk, now):
+    """One hand-built summary row, as the budget and analytics actions return them"""
+    return {
+        'campaign': pk, 'date': now.date() - datetime.timedelta(days=pk % 365), 'generated_at': now,
+        'budget': money(rng, 50000), 'spent': money(rng, 50000), 'revenue': money(rng, 90000),
+        'cost_per_lead': money(rng, 100), 'conversion_rate': money(rng, 100),
+        'leads': rng.randint(0, 500), 'reference': uuid.UUID(int=rng.getrandbits(128)),
+    }
+
+
+class Command(BaseCommand):
+    help = 'Compares DRF and fast JSON rendering/parsing on invoice and analytics payloads'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100, help='Rows per payload (one list page)')
+        parser.add_argument('--repeat', type=int, default=200, help='Renders per measurement')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed for the payloads')
+
+    def time(self, func, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - start) / repeat * 1000
+
+    def handle(self, *args, **options):
+        if not use_orjson():
+            self.stdout.write(self.style.WARNING(
+                'orjson is not in use (not installed or JSON_BACKEND=json); both sides run DRF code'
+            ))
+
+        rng = random.Random(options['seed'])
+        now = timezone.now()
+        rows, repeat = options['rows'], options['repeat']
+        payloads = {
+            'invoice list': {'count': rows, 'next': None, 'previous': None,
+                             'results': [invoice_row(rng, pk, now) for pk in range(rows)]},
+            'analytics': [analytics_row(rng, pk, now) for pk in range(rows * 5)],
+        }
+
+        drf_renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+        drf_parser, fast_parser = JSONParser(), FastJSONParser()
+        for name, payload in payloads.items():
+            expected = drf_renderer.render(payload)
+            # The fast path must be a drop-in replacement, byte for byte
+            if fast_renderer.render(payload) != expected:
+                self.stdout.write(self.style.ERROR(f'{name}: renderers disagree'))
+                return
+
+            self.stdout.write(f'{name} ({len(expected) / 1024:.0f} KiB):')
+            drf = self.time(lambda: drf_renderer.render(payload), repeat)
+            fast = self.time(lambda: fast_renderer.render(payload), repeat)
+            self.stdout.write(f'  render  drf: {drf:7.2f} ms  fast: {fast:7.2f} ms  ({drf / fast:.1f}x)')
+
+            drf = self.time(lambda: drf_parser.parse(io.BytesIO(expected)), repeat)
+            fast = self.time(lambda: fast_parser.parse(io.BytesIO(expected)), repeat)
+            self.stdout.write(f'  parse   drf: {drf:7.2f} ms  fast: {fast:7.2f} ms  ({drf / fast:.1f}x)')
@@ -0,0 +1,124 @@
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.compiled import check_parity, compile_serializer
+from apps.core.models import Department, School, SchoolYear, Term
+from apps.core.optimizer import optimize_queryset
+from apps.curriculum.models import Course
+from apps.finance.models import Invoice, Payment
+from apps.finance.serializers import PaymentSerializer
+from apps.students.models import Attendance, Enrollment
+from apps.students.serializers import AttendanceSerializer
+
+User = get_user_model()
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Compares DRF and compiled serializers on attendance and payment list pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500, help='Rows per list')
+        parser.add_argument('--repeat', type=int, default=20, help='Serializations per measurement')
+
+    def create_rows(self, rows):
+        """Create `rows` attendance records and payments; rolled back afterwards"""
+        today = timezone.now().date()
+        admin = User.objects.create_user(
+            username='benchmark-admin', email='benchmark-admin@example.com',
+            password=None, user_type='admin'
+        )
+        school = School.objects.create(
+            name='Benchmark School', code='BENCH', address='1 Test Street', city='Test City',
+            state='Test State', country='Test Country', postal_code='00000',
+            phone='000-000-0000', email='bench@example.com'
+        )
+        school_year = SchoolYear.objects.create(
+            school=school, name='Benchmark', start_date=today, end_date=today + timezone.timedelta(days=365)
+        )
+        term = Term.objects.create(
+            school_year=school_year, name='Benchmark', term_type='semester',
+            start_date=today, end_date=today + timezone.timedelta(days=120)
+        )
+        department = Department.objects.create(school=school, name='Benchmark', code='BENCH')
+        course = Course.objects.create(code='BENCH101', name='Benchmark', department=department)
+        student_user = User.objects.create_user(
+            username='benchmark-student', email='benchmark-student@example.com', password=None
+        )
+        student = student_user.student_profile
+        enrollment = Enrollment.objects.create(student=student, course=course, term=term)
+        invoice = Invoice.objects.create(
+            student=student, term=term, invoice_number='BENCH-00001', issue_date=today,
+            due_date=today, subtotal=Decimal('100.00'), total=Decimal('100.00')
+        )
+
+        Attendance.objects.bulk_create([
+            Attendance(
+                enrollment=enrollment, date=today - timezone.timedelta(days=index),
+                status=('present', 'late', 'absent')[index % 3], minutes_late=index % 15,
+                notes='Benchmark row', created_by=admin, updated_by=admin
+            ) for index in range(rows)
+        ])
+        Payment.objects.bulk_create([
+            Payment(
+                invoice=invoice, amount=Decimal('12.50') + index, payment_date=today,
+                payment_method=('cash', 'bank_transfer')[index % 2], status='completed',
+                transaction_id=f'TX-{index:08d}', received_by=admin if index % 2 else None,
+                created_by=admin, updated_by=admin
+            ) for index in range(rows)
+        ])
+        return enrollment, invoice
+
+    def measure(self, func, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - start) / repeat * 1000
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        try:
+            with transaction.atomic():
+                enrollment, invoice = self.create_rows(rows)
+                self.run(
+                    'attendance', AttendanceSerializer,
+                    Attendance.objects.filter(enrollment=enrollment), repeat
+                )
+                self.run('payments', PaymentSerializer, Payment.objects.filter(invoice=invoice), repeat)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, name, serializer_class, queryset, repeat):
+        mismatches = check_parity(serializer_class, queryset)
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f'{name}: {len(mismatches)} rows differ from DRF'))
+            return
+
+        compiled = compile_serializer(serializer_class)
+        optimized = optimize_queryset(queryset, serializer_class)
+        instances = list(optimized)
+        values = list(compiled.values(queryset))
+
+        drf_total = self.measure(lambda: serializer_class(list(optimized.all()), many=True).data, repeat)
+        compiled_total = self.measure(lambda: compiled.render(compiled.values(queryset.all())), repeat)
+        drf_serialize = self.measure(lambda: serializer_class(instances, many=True).data, repeat)
+        compiled_serialize = self.measure(lambda: compiled.render(values), repeat)
+
+        self.stdout.write(f'{name} ({len(instances)} rows):')
+        self.stdout.write(
+            f'  fetch + serialize  drf: {drf_total:8.2f} ms  compiled: {compiled_total:8.2f} ms'
+            f'  ({drf_total / compiled_total:.1f}x)'
+        )
+        self.stdout.write(
+            f'  serialize only     drf: {drf_serialize:8.2f} ms  compiled: {compiled_serialize:8.2f} ms'
+            f'  ({drf_serialize / compiled_serialize:.1f}x)'
+        )
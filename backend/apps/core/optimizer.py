@@ -0,0 +1,243 @@
+"""
+Queryset optimisation driven by serializer introspection.
+
+The planner walks a serializer's field tree and works out which relations
+have to be joined (`select_related`), which have to be batch loaded
+(`prefetch_related`) and, where every field maps onto a concrete column,
+which columns are needed (`only()`), so that list responses run a
+constant number of queries regardless of page size.
+"""
+import threading
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def depends_on(*paths):
+    """
+    Declare the relations a SerializerMethodField getter walks, using
+    queryset lookup syntax, e.g. ``@depends_on('enrollment__student__user')``
+    """
+    def decorator(func):
+        func.depends_on = paths
+        return func
+    return decorator
+
+
+class PlanNode:
+    """
+    Data requirements for one model in a serializer tree
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.columns = set()
+        self.select = {}
+        self.prefetch = {}
+        # An open node reads attributes we could not map onto columns, so
+        # the queryset it belongs to cannot be restricted with only()
+        self.open = False
+
+    def relation(self, name):
+        """Return the child node for relation `name`, creating it if needed"""
+        if name in self.select:
+            return self.select[name]
+        if name in self.prefetch:
+            return self.prefetch[name]
+
+        field = self.model._meta.get_field(name)
+        child = PlanNode(field.related_model)
+        if field.many_to_many or field.one_to_many:
+            self.prefetch[name] = child
+        else:
+            self.select[name] = child
+            if field.concrete:
+                self.columns.add(name)
+        return child
+
+    def add_path(self, attrs):
+        """
+        Resolve a chain of attribute names and return the node that owns
+        the final attribute, or None if the chain leaves the model graph
+        """
+        node = self
+        for index, attr in enumerate(attrs):
+            last = index == len(attrs) - 1
+            try:
+                field = node.model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                if attr == 'pk':
+                    node.columns.add(node.model._meta.pk.name)
+                    return node
+                if last and attr.startswith('get_') and attr.endswith('_display'):
+                    return node._add_column(attr[4:-8])
+                node.open = True
+                return None
+
+            if not field.is_relation:
+                if last:
+                    return node._add_column(attr)
+                node.open = True
+                return None
+
+            child = node.relation(attr)
+            if last:
+                return child
+            node = child
+        return node
+
+    def _add_column(self, name):
+        try:
+            self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            self.open = True
+            return None
+        self.columns.add(name)
+        return self
+
+    def is_closed(self):
+        """A node can be column-restricted only if it and its joins are closed"""
+        return not self.open and all(child.is_closed() for child in self.select.values())
+
+    def only_fields(self, prefix=''):
+        columns = self.columns | {self.model._meta.pk.name}
+        fields = [f"{prefix}{column}" for column in sorted(columns)]
+        for name, child in sorted(self.select.items()):
+            fields.extend(child.only_fields(f"{prefix}{name}__"))
+        return fields
+
+    def select_paths(self, prefix=''):
+        paths = []
+        for name, child in sorted(self.select.items()):
+            path = f"{prefix}{name}"
+            paths.append(path)
+            paths.extend(child.select_paths(f"{path}__"))
+        return paths
+
+    def prefetches(self, prefix=''):
+        lookups = []
+        for name, child in sorted(self.prefetch.items()):
+            field = self.model._meta.get_field(name)
+            if field.one_to_many:
+                # The reverse foreign key is needed to attach rows to parents
+                child.columns.add(field.field.name)
+            queryset = child.apply(child.model._default_manager.all())
+            lookups.append(Prefetch(f"{prefix}{name}", queryset=queryset))
+        for name, child in sorted(self.select.items()):
+            lookups.extend(child.prefetches(f"{prefix}{name}__"))
+        return lookups
+
+    def apply(self, queryset):
+        """Apply the plan to a queryset of this node's model"""
+        select = self.select_paths()
+        if select:
+            queryset = queryset.select_related(*select)
+        prefetches = self.prefetches()
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        if self.is_closed():
+            queryset = queryset.only(*self.only_fields())
+        return queryset
+
+
+def _plan_serializer(serializer, node):
+    """Record the data needs of `serializer` against `node`"""
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+
+        if isinstance(field, serializers.SerializerMethodField):
+            method = getattr(serializer, field.method_name, None)
+            paths = getattr(method, 'depends_on', None)
+            if paths is None:
+                node.open = True
+                continue
+            for path in paths:
+                target = node.add_path(path.split('__'))
+                if target is not None and target is not node:
+                    target.open = True
+            continue
+
+        if field.source == '*':
+            if isinstance(field, serializers.BaseSerializer):
+                _plan_serializer(field, node)
+            else:
+                node.open = True
+            continue
+
+        if isinstance(field, serializers.ListSerializer):
+            target = node.add_path(field.source_attrs)
+            if target is not None and target is not node:
+                _plan_serializer(field.child, target)
+            continue
+
+        if isinstance(field, serializers.BaseSerializer):
+            target = node.add_path(field.source_attrs)
+            if target is not None and target is not node:
+                _plan_serializer(field, target)
+            continue
+
+        if isinstance(field, serializers.PrimaryKeyRelatedField) and len(field.source_attrs) == 1:
+            # The foreign key column already holds the value, no join needed
+            node._add_column(field.source_attrs[0])
+            continue
+
+        target = node.add_path(field.source_attrs)
+        if isinstance(field, serializers.ManyRelatedField) and target is not None:
+            target.columns.add(target.model._meta.pk.name)
+
+
+_plans = {}
+_plans_lock = threading.Lock()
+
+# Fieldsets come from query strings, so the number of distinct plans is
+# bounded by clearing the cache once it grows past this size
+MAX_PLANS = 1000
+
+
+def build_plan(serializer_class, model, fieldset=None):
+    """
+    Return the (cached) plan for a serializer class over `model`, pruned
+    by `fieldset` if one is given
+    """
+    key = (serializer_class, model, fieldset.key if fieldset else None)
+    plan = _plans.get(key)
+    if plan is None:
+        plan = PlanNode(model)
+        serializer = serializer_class()
+        if fieldset:
+            fieldset.apply(serializer)
+        _plan_serializer(serializer, plan)
+        with _plans_lock:
+            if len(_plans) >= MAX_PLANS:
+                _plans.clear()
+            _plans[key] = plan
+    return plan
+
+
+def optimize_queryset(queryset, serializer_class, fieldset=None):
+    """Apply the joins, prefetches and column restrictions `serializer_class` needs"""
+    if not issubclass(serializer_class, serializers.ModelSerializer):
+        return queryset
+    return build_plan(serializer_class, queryset.model, fieldset).apply(queryset)
+
+
+class QuerySetOptimizerMixin:
+    """
+    ViewSet mixin that optimises the queryset for the active serializer
+    on read requests
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request is not None and self.request.method in SAFE_METHODS:
+            queryset = self.optimize_queryset(queryset)
+        return queryset
+
+    def optimize_queryset(self, queryset, serializer_class=None):
+        # Plan for the fields the response will contain (see SparseFieldsetMixin)
+        get_fieldset = getattr(self, 'get_fieldset', None)
+        fieldset = get_fieldset() if get_fieldset is not None else None
+        return optimize_queryset(queryset, serializer_class or self.get_serializer_class(), fieldset)
@@ -0,0 +1,298 @@
+"""
+Pagination classes shared by the API.
+
+StandardPagination keeps the page-number behaviour clients already rely
+on, and switches to keyset (cursor) pagination when a request opts in with
+``?pagination=cursor``. Keyset pages are selected with a WHERE clause on
+the queryset's ordering (plus ``id`` as a tiebreaker) instead of an
+OFFSET, so deep pages cost the same as the first one and no COUNT(*) is
+run. An approximate total can be requested with ``?estimate_total=true``.
+"""
+import base64
+import datetime
+import json
+from collections.abc import Mapping
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimate_count(queryset):
+    """
+    Return the planner's row estimate for `queryset`, or None when the
+    database cannot provide one cheaply
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """
+    JSON encoder for cursor positions; keeps full microsecond precision,
+    which DjangoJSONEncoder truncates and keyset comparisons need
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _truthy(value):
+    return str(value).lower() in ('1', 'true', 'yes')
+
+
+class ViewPageSizeMixin:
+    """
+    Let a ViewSet override the default page size with a `page_size` attribute
+    """
+    page_size_query_param = 'page_size'
+
+    @property
+    def max_page_size(self):
+        return getattr(settings, 'MAX_PAGE_SIZE', 100)
+
+    def get_page_size(self, request):
+        default = getattr(self.view, 'page_size', None) or api_settings.PAGE_SIZE
+        if self.page_size_query_param:
+            try:
+                requested = int(request.query_params[self.page_size_query_param])
+                if requested > 0:
+                    return min(requested, self.max_page_size)
+            except (KeyError, ValueError):
+                pass
+        return default
+
+
+class KeysetPagination(ViewPageSizeMixin, BasePagination):
+    """
+    Cursor pagination on the queryset ordering with an `id` tiebreaker
+    """
+    cursor_query_param = 'cursor'
+    estimate_query_param = 'estimate_total'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self):
+        self.view = None
+
+    def get_ordering(self, queryset):
+        """
+        Return the ordering as (lookup, descending) pairs ending with the
+        primary key, or None if the ordering cannot be used as a keyset
+        """
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering or [])
+        opts = queryset.model._meta
+        keys = []
+        for term in ordering:
+            if not isinstance(term, str) or term == '?':
+                return None
+            descending = term.startswith('-')
+            lookup = term.lstrip('-')
+            field = self._resolve_field(opts, lookup)
+            if field is None or field.null:
+                # NULLs sort differently per database and break comparisons
+                return None
+            if field.is_relation:
+                if not field.concrete:
+                    return None
+                # Ordering by a foreign key follows the related model's
+                # ordering; the column alone is enough for a stable keyset
+                lookup = '__'.join(lookup.split('__')[:-1] + [field.attname])
+            if field.primary_key:
+                lookup = 'pk'
+            keys.append((lookup, descending))
+            if lookup == 'pk':
+                return keys
+
+        descending = keys[0][1] if keys else False
+        keys.append(('pk', descending))
+        return keys
+
+    def _resolve_field(self, opts, lookup):
+        parts = lookup.split('__')
+        if parts[0] == 'pk':
+            return opts.pk
+        field = None
+        for index, part in enumerate(parts):
+            try:
+                field = opts.get_field(part)
+            except Exception:
+                return None
+            if index < len(parts) - 1:
+                if not field.is_relation or field.many_to_many or field.one_to_many:
+                    return None
+                opts = field.related_model._meta
+        return field
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.view = view
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+        if self.ordering is None:
+            return None
+
+        self.estimated_total = None
+        if _truthy(request.query_params.get(self.estimate_query_param, 'false')):
+            self.estimated_total = estimate_count(queryset)
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor.get('r'))
+        order_by = [
+            f"{'-' if descending != reverse else ''}{lookup}"
+            for lookup, descending in self.ordering
+        ]
+        queryset = queryset.order_by(*order_by)
+        try:
+            if cursor is not None:
+                queryset = queryset.filter(self.build_filter(cursor['v'], reverse))
+            rows = list(queryset[:self.page_size + 1])
+        except (TypeError, ValueError, ValidationError):
+            # A tampered cursor whose values do not fit the ordering fields
+            raise NotFound(self.invalid_cursor_message)
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = rows
+        return rows
+
+    def build_filter(self, values, reverse):
+        """
+        Build the lexicographic `(a, b, id) > (x, y, z)` condition for the
+        ordering, honouring the direction of each key
+        """
+        if len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        condition = Q()
+        equal = {}
+        for (lookup, descending), value in zip(self.ordering, values):
+            operator = 'lt' if descending != reverse else 'gt'
+            condition |= Q(**equal, **{f"{lookup}__{operator}": value})
+            equal[lookup] = value
+        return condition
+
+    def get_position(self, row):
+        values = []
+        for lookup, _ in self.ordering:
+            if isinstance(row, Mapping):
+                values.append(row['id'] if lookup == 'pk' else row[lookup])
+                continue
+            value = row
+            for attr in lookup.split('__'):
+                value = getattr(value, attr)
+            values.append(value)
+        return values
+
+    def encode_cursor(self, row, reverse=False):
+        payload = {'v': self.get_position(row)}
+        if reverse:
+            payload['r'] = 1
+        data = json.dumps(payload, cls=CursorEncoder, separators=(',', ':'))
+        token = base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii')
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode('ascii')).decode('utf-8'))
+            if not isinstance(payload.get('v'), list):
+                raise ValueError
+        except (TypeError, ValueError, UnicodeError, AttributeError):
+            raise NotFound(self.invalid_cursor_message)
+        return payload
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.estimated_total is not None:
+            payload['estimated_total'] = self.estimated_total
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'estimated_total': {'type': 'integer'},
+                'results': schema,
+            },
+        }
+
+
+class StandardPagination(ViewPageSizeMixin, PageNumberPagination):
+    """
+    Page-number pagination with opt-in keyset mode (``?pagination=cursor``)
+    """
+    mode_query_param = 'pagination'
+    keyset_class = KeysetPagination
+
+    def __init__(self):
+        self.view = None
+        self.keyset = None
+
+    def wants_keyset(self, request):
+        params = request.query_params
+        return (
+            params.get(self.mode_query_param) == 'cursor'
+            or self.keyset_class.cursor_query_param in params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.view = view
+        if self.wants_keyset(request):
+            keyset = self.keyset_class()
+            page = keyset.paginate_queryset(queryset, request, view)
+            if page is not None:
+                self.keyset = keyset
+                return page
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
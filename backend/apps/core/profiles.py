@@ -0,0 +1,146 @@
+"""
+Request-scoped access to the current user's role profiles.
+
+Views in the students, staff and finance apps repeatedly looked up the
+Student or StaffMember row of `request.user`, sometimes twice in one
+request (`get_queryset` and then the action). ProfileMiddleware attaches a
+ProfileResolver as `request.profiles`, which loads each profile on first
+use, at most once per request, and keeps it in the profiles cache for
+PROFILE_CACHE_TTL seconds so the user's next requests skip the query too.
+
+Saving or deleting a Student, StaffMember, TeacherProfile or Enrollment
+drops the owner's cached profiles (see the students and staff signals),
+immediately and again when the transaction commits.
+"""
+from django.conf import settings
+from django.db import transaction
+
+from .cache import PROFILES, get_cache
+
+PROFILE_KEY = '{}:{}'
+
+# Every cached attribute, so a user's entries can be dropped together
+PROFILE_FIELDS = ('student', 'staff_member', 'teacher_profile', 'enrollment_ids')
+
+
+def drop_profiles(user_id):
+    get_cache(PROFILES).delete_many([PROFILE_KEY.format(user_id, name) for name in PROFILE_FIELDS])
+
+
+def invalidate_profiles(user_id):
+    """
+    Drop every cached profile of `user_id` now and again on commit, so a
+    request that read the rows before the commit cannot keep them cached
+    """
+    if user_id is not None:
+        drop_profiles(user_id)
+        transaction.on_commit(lambda: drop_profiles(user_id))
+
+
+class ProfileResolver:
+    """
+    Lazily resolved Student, StaffMember, TeacherProfile and enrollment ids
+    of the request's user
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self._resolved = {}
+
+    @property
+    def cache_ttl(self):
+        return getattr(settings, 'PROFILE_CACHE_TTL', 60)
+
+    @property
+    def user(self):
+        # Read on each access: DRF authenticates after the middleware has run
+        user = getattr(self.request, 'user', None)
+        if user is None or not user.is_authenticated:
+            return None
+        return user
+
+    def _resolve(self, name, loader):
+        user = self.user
+        if user is None:
+            return None
+        if name in self._resolved:
+            return self._resolved[name]
+
+        key = PROFILE_KEY.format(user.pk, name)
+        cache = get_cache(PROFILES)
+        # Wrapped in a tuple so a cached "no profile" is told apart from a miss
+        entry = cache.get(key)
+        if entry is None:
+            entry = (loader(user),)
+            cache.set(key, entry, self.cache_ttl)
+        self._resolved[name] = entry[0]
+        return entry[0]
+
+    @property
+    def student(self):
+        """The user's Student profile, or None"""
+        from apps.students.models import Student
+
+        return self._resolve('student', lambda user: Student.objects.filter(user=user).first())
+
+    @property
+    def staff_member(self):
+        """The user's StaffMember profile, or None"""
+        from apps.staff.models import StaffMember
+
+        return self._resolve('staff_member', lambda user: StaffMember.objects.filter(user=user).first())
+
+    @property
+    def teacher_profile(self):
+        """The TeacherProfile of the user's staff profile, or None"""
+        from apps.staff.models import TeacherProfile
+
+        return self._resolve(
+            'teacher_profile',
+            lambda user: TeacherProfile.objects.filter(staff_member__user=user).first()
+        )
+
+    @property
+    def enrollment_ids(self):
+        """Ids of the user's enrollments as a student (empty if not a student)"""
+        from apps.students.models import Enrollment
+
+        return self._resolve(
+            'enrollment_ids',
+            lambda user: frozenset(Enrollment.objects.filter(student__user=user).values_list('id', flat=True))
+        ) or frozenset()
+
+    @property
+    def is_manager(self):
+        """Whether the user's staff designation makes them a manager"""
+        staff_member = self.staff_member
+        return staff_member is not None and 'Manager' in (staff_member.designation or '')
+
+    def get_student(self):
+        """Return the Student profile, raising Student.DoesNotExist if there is none"""
+        from apps.students.models import Student
+
+        if self.student is None:
+            raise Student.DoesNotExist("User has no student profile.")
+        return self.student
+
+    def get_staff_member(self):
+        """Return the StaffMember profile, raising StaffMember.DoesNotExist if there is none"""
+        from apps.staff.models import StaffMember
+
+        if self.staff_member is None:
+            raise StaffMember.DoesNotExist("User has no staff profile.")
+        return self.staff_member
+
+
+class ProfileMiddleware:
+    """
+    Attach a ProfileResolver to each request as `request.profiles`
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.profiles = ProfileResolver(request)
+        return self.get_response(request)
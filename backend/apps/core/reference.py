@@ -0,0 +1,201 @@
+"""
+Read-through cache for reference data.
+
+Schools, school years, terms, departments and courses change a few times a
+term but are read on nearly every request. Everything derived from them
+(the rows themselves, pk lookups, serialized list/retrieve/current
+responses) is cached under a single reference version number kept in the
+reference cache namespace. Saving or deleting any model listed in
+REFERENCE_CACHE_MODELS bumps the version, which orphans every entry at
+once; orphaned entries expire with the namespace TTL.
+
+Each worker also keeps the entries it has used in process memory and only
+asks the shared cache for the current version every
+REFERENCE_VERSION_CHECK_INTERVAL seconds, so a warm worker serves
+reference reads without any I/O. `warm()` preloads the rows when a worker
+starts (see backend/wsgi.py).
+"""
+import logging
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils import timezone
+from rest_framework.response import Response
+
+from .cache import REFERENCE, get_cache, incr
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'reference:version'
+
+
+def reference_models():
+    return [apps.get_model(label) for label in getattr(settings, 'REFERENCE_CACHE_MODELS', ())]
+
+
+class ReferenceCache:
+    """
+    Version-stamped, two-level (process memory and shared cache) store of
+    reference data
+    """
+
+    def __init__(self):
+        self._version = None
+        self._checked_at = 0
+        self._local = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'REFERENCE_CACHE_ENABLE', True)
+
+    @property
+    def refresh_interval(self):
+        return getattr(settings, 'REFERENCE_VERSION_CHECK_INTERVAL', 5)
+
+    @property
+    def max_local_entries(self):
+        return getattr(settings, 'REFERENCE_LOCAL_MAX_ENTRIES', 1000)
+
+    def version(self):
+        """Return the current reference version, checked at most once per interval"""
+        if self._version is not None and time.monotonic() - self._checked_at < self.refresh_interval:
+            return self._version
+
+        cache = get_cache(REFERENCE)
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            cache.add(VERSION_KEY, 1, None)
+            version = cache.get(VERSION_KEY, 1)
+        with self._lock:
+            if version != self._version:
+                self._local = {}
+                self._version = version
+            self._checked_at = time.monotonic()
+        return version
+
+    def bump(self):
+        """Invalidate every reference entry in every worker"""
+        version = incr(REFERENCE, VERSION_KEY, timeout=None)
+        with self._lock:
+            self._local = {}
+            self._version = version
+            self._checked_at = time.monotonic()
+
+    def get_or_set(self, key, loader):
+        """Return the entry for `key` at the current version, loading it on a miss"""
+        if not self.enabled:
+            return loader()
+
+        version = self.version()
+        local = self._local
+        if key in local:
+            return local[key]
+
+        cache = get_cache(REFERENCE)
+        shared_key = f"v{version}:{key}"
+        value = cache.get(shared_key)
+        if value is None:
+            value = loader()
+            cache.set(shared_key, value)
+
+        with self._lock:
+            if self._version == version:
+                if len(self._local) >= self.max_local_entries:
+                    self._local = {}
+                self._local[key] = value
+        return value
+
+    def objects(self, model):
+        """Return every row of `model`, in its default ordering"""
+        return self.get_or_set(f"objects:{model._meta.label_lower}", lambda: list(model._default_manager.all()))
+
+    def lookup(self, model, pk):
+        """Return the `model` row with primary key `pk`, or None"""
+        by_pk = self.get_or_set(
+            f"by_pk:{model._meta.label_lower}",
+            lambda: {obj.pk: obj for obj in self.objects(model)}
+        )
+        try:
+            return by_pk.get(model._meta.pk.to_python(pk))
+        except ValidationError:
+            return None
+
+    def current(self, model, on=None):
+        """
+        Return the active row of `model` whose start_date/end_date range
+        covers `on` (today by default), latest start first
+        """
+        on = on or timezone.now().date()
+        matches = [
+            obj for obj in self.objects(model)
+            if obj.is_active and obj.start_date <= on <= obj.end_date
+        ]
+        return max(matches, key=lambda obj: obj.start_date, default=None)
+
+    def warm(self):
+        """Preload every reference model; called when a worker starts"""
+        if not self.enabled:
+            return
+        try:
+            for model in reference_models():
+                self.objects(model)
+        except Exception:
+            # Best effort: a worker that cannot warm up loads on first use
+            logger.warning("Could not warm the reference cache", exc_info=True)
+
+
+reference_cache = ReferenceCache()
+
+
+def invalidate_reference_cache(sender, **kwargs):
+    """
+    post_save/post_delete/m2m_changed receiver for reference models. The
+    version is bumped now and again on commit, so no reader can cache rows
+    from before the commit under the new version
+    """
+    if kwargs.get('action', 'post_').startswith('pre_'):
+        return
+    reference_cache.bump()
+    transaction.on_commit(reference_cache.bump)
+
+
+def connect_reference_signals():
+    for model in reference_models():
+        uid = f"reference_cache_{model._meta.label_lower}"
+        post_save.connect(invalidate_reference_cache, sender=model, dispatch_uid=f"{uid}_save")
+        post_delete.connect(invalidate_reference_cache, sender=model, dispatch_uid=f"{uid}_delete")
+        for field in model._meta.local_many_to_many:
+            m2m_changed.connect(
+                invalidate_reference_cache,
+                sender=field.remote_field.through,
+                dispatch_uid=f"{uid}_{field.name}"
+            )
+
+
+class ReferenceCacheMixin:
+    """
+    Serve list and retrieve responses of a reference ViewSet from the
+    reference cache. The data does not depend on who is asking, so one
+    entry per URL is shared by every user.
+    """
+
+    def get_reference_cache_key(self, request, kind):
+        return f"response:{self.basename}:{kind}:{request.build_absolute_uri()}"
+
+    def cached_response(self, request, kind, build):
+        data = reference_cache.get_or_set(self.get_reference_cache_key(request, kind), lambda: build().data)
+        return Response(data)
+
+    def list(self, request, *args, **kwargs):
+        parent = super()
+        return self.cached_response(request, 'list', lambda: parent.list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        parent = super()
+        return self.cached_response(request, 'retrieve', lambda: parent.retrieve(request, *args, **kwargs))
@@ -0,0 +1,126 @@
+"""
+JSON rendering and parsing for the REST API.
+
+DRF's JSONRenderer encodes with the pure-Python `json` module and calls
+its encoder's `default()` for every Decimal, datetime and UUID, which
+dominates the cost of large finance and analytics responses.
+FastJSONRenderer and FastJSONParser use orjson when it is installed. The
+output matches DRF's compact format (UTF-8, Decimals as numbers, UTC
+datetimes ending in ``Z``). Data orjson cannot encode the way DRF does is
+handed to DRF's renderer instead: integers wider than 64 bits, and NaN or
+infinite floats and Decimals, which DRF's strict renderer rejects with
+ValueError where orjson would write ``null``. Without orjson, or when a
+response asks for indentation, DRF's implementation is used as well.
+
+JSON_BACKEND selects the encoder: ``'auto'`` (orjson if importable),
+``'orjson'`` (required) or ``'json'`` (always the standard library).
+"""
+import math
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional accelerator
+    orjson = None
+
+# DRF escapes these so the output is also valid JavaScript
+LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+
+def use_orjson():
+    """Whether the configured JSON backend is orjson"""
+    backend = getattr(settings, 'JSON_BACKEND', 'auto')
+    if backend == 'json':
+        return False
+    if orjson is None:
+        if backend == 'orjson':
+            raise ImproperlyConfigured("JSON_BACKEND is 'orjson' but orjson is not installed.")
+        return False
+    return True
+
+
+# Types orjson does not encode itself (Decimal, lazy strings, querysets,
+# timedeltas...) are converted by DRF's own encoder, so values come out as
+# they would from JSONRenderer
+_drf_default = JSONEncoder().default
+
+
+def _default(obj):
+    if isinstance(obj, Decimal) and not obj.is_finite():
+        # Becomes a JSONEncodeError, so DRF renders (and rejects) the data
+        raise TypeError('Non-finite Decimal')
+    return _drf_default(obj)
+
+
+def has_non_finite_float(data):
+    """Whether `data` holds a NaN or infinite float, which orjson writes as null"""
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        return any(has_non_finite_float(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(has_non_finite_float(value) for value in data)
+    return False
+
+
+def dumps(data):
+    """Encode `data` to compact UTF-8 JSON bytes, matching DRF's output"""
+    if not use_orjson():
+        return JSONRenderer().render(data)
+
+    try:
+        content = orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+    except orjson.JSONEncodeError:
+        # Integers wider than 64 bits, non-finite Decimals
+        return JSONRenderer().render(data)
+    # Non-finite floats only need looking for when the output has a null
+    if b'null' in content and has_non_finite_float(data):
+        return JSONRenderer().render(data)
+    if b'\xe2\x80' in content:
+        for raw, escaped in LINE_SEPARATORS:
+            content = content.replace(raw, escaped)
+    return content
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when available
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        # orjson only indents by two spaces, so pretty output stays with DRF
+        if indent or not self.compact or self.ensure_ascii or not self.strict or not use_orjson():
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser that decodes with orjson when available
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if not use_orjson():
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            content = stream.read() if stream is not None else b''
+            if encoding.lower().replace('-', '') != 'utf8':
+                content = content.decode(encoding)
+            return orjson.loads(content)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
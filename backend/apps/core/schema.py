@@ -0,0 +1,66 @@
+"""
+Process-wide registry of the tables present in each database.
+
+Signal handlers that must tolerate a partially migrated database (audit and
+security logging on login, logout and failed logins) used to list every
+table in the catalog on each event. The registry reads the table list once
+per database alias and keeps it until the next ``post_migrate``, which is
+the only time the schema changes under a running process.
+"""
+import threading
+
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+
+class SchemaRegistry:
+    """
+    Cached answer to "does this table exist?" per database alias
+    """
+
+    def __init__(self):
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    def _load(self, using):
+        try:
+            with connections[using].cursor() as cursor:
+                return frozenset(connections[using].introspection.table_names(cursor))
+        except DatabaseError:
+            # Database unreachable: report no tables and try again next time
+            return None
+
+    def table_names(self, using=DEFAULT_DB_ALIAS):
+        """Return the set of table names in the database"""
+        tables = self._tables.get(using)
+        if tables is None:
+            with self._lock:
+                tables = self._tables.get(using)
+                if tables is None:
+                    tables = self._load(using)
+                    if tables is None:
+                        return frozenset()
+                    self._tables[using] = tables
+        return tables
+
+    def has_table(self, table_name, using=DEFAULT_DB_ALIAS):
+        return table_name in self.table_names(using)
+
+    def has_model(self, model, using=DEFAULT_DB_ALIAS):
+        """Check that the table behind `model` has been created"""
+        return self.has_table(model._meta.db_table, using)
+
+    def invalidate(self, using=None):
+        """Forget the cached table list for `using`, or for every database"""
+        with self._lock:
+            if using is None:
+                self._tables.clear()
+            else:
+                self._tables.pop(using, None)
+
+
+schema = SchemaRegistry()
+
+
+def invalidate_schema(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """post_migrate receiver: the schema may have changed"""
+    schema.invalidate(using)
@@ -15,7 +15,7 @@ User = get_user_model()
 class UserMinimalSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
-        fields = ('id', 'email', 'username', 'first_name', 'last_name')
+        fields = ('id', 'email', 'username')
 
 
 class SchoolSerializer(serializers.ModelSerializer):
@@ -37,6 +37,7 @@ class SchoolYearSerializer(serializers.ModelSerializer):
         model = SchoolYear
         fields = '__all__'
         read_only_fields = ('created_at', 'updated_at', 'created_by', 'updated_by')
+        expandable_fields = {'school': SchoolSerializer}
 
 
 class TermSerializer(serializers.ModelSerializer):
@@ -48,6 +49,7 @@ class TermSerializer(serializers.ModelSerializer):
         model = Term
         fields = '__all__'
         read_only_fields = ('created_at', 'updated_at', 'created_by', 'updated_by')
+        expandable_fields = {'school_year': SchoolYearSerializer}
 
 
 class DepartmentSerializer(serializers.ModelSerializer):
@@ -0,0 +1,145 @@
+"""
+In-process registries of database-backed settings.
+
+SystemSetting and SecuritySetting rows are read far more often than they
+are written. A SettingsRegistry loads every row of its model in one query
+into a dict owned by the worker, and afterwards only checks a version key
+in the reference cache, at most every SETTINGS_REGISTRY_REFRESH_INTERVAL
+seconds, to learn whether another worker changed a row. Reads in between
+cost a dict lookup.
+
+App code reads values with `get(key, default, cast)`::
+
+    system_settings.get('max_upload_mb', 10, int)
+    security_settings.get('require_2fa', False, bool)
+"""
+import json
+import logging
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .cache import REFERENCE, get_cache, incr
+
+logger = logging.getLogger(__name__)
+
+TRUE_VALUES = {'1', 'true', 'yes', 'on'}
+FALSE_VALUES = {'0', 'false', 'no', 'off', ''}
+
+
+def parse_bool(value):
+    """Interpret a stored setting as a boolean"""
+    if isinstance(value, bool):
+        return value
+    normalized = str(value).strip().lower()
+    if normalized in TRUE_VALUES:
+        return True
+    if normalized in FALSE_VALUES:
+        return False
+    raise ValueError(f"Not a boolean: {value!r}")
+
+
+# Casts that need more than calling the type on the stored string
+CASTS = {
+    bool: parse_bool,
+    dict: json.loads,
+    list: json.loads,
+}
+
+
+class SettingsRegistry:
+    """
+    Process-local copy of a key/value settings model, refreshed by version
+    """
+
+    def __init__(self, model_label, related=()):
+        self.model_label = model_label
+        self.related = related
+        self.version_key = f"settings:{model_label.lower()}:version"
+        self._rows = None
+        self._version = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    @property
+    def refresh_interval(self):
+        return getattr(settings, 'SETTINGS_REGISTRY_REFRESH_INTERVAL', 5)
+
+    def _shared_version(self):
+        cache = get_cache(REFERENCE)
+        version = cache.get(self.version_key)
+        if version is None:
+            cache.add(self.version_key, 1, None)
+            version = cache.get(self.version_key, 1)
+        return version
+
+    def load(self):
+        """Read every row in one query"""
+        version = self._shared_version()
+        queryset = self.model._default_manager.all()
+        if self.related:
+            queryset = queryset.select_related(*self.related)
+        rows = {row.key: row for row in queryset}
+        with self._lock:
+            self._rows = rows
+            self._version = version
+            self._checked_at = time.monotonic()
+        return rows
+
+    def rows(self):
+        """Return the key -> row dict, reloading if another worker changed a row"""
+        # Read once: invalidate() may reset the attribute from another thread
+        rows = self._rows
+        if rows is None:
+            return self.load()
+        if time.monotonic() - self._checked_at >= self.refresh_interval:
+            if self._shared_version() != self._version:
+                return self.load()
+            self._checked_at = time.monotonic()
+        return rows
+
+    def get_instance(self, key):
+        """Return the row for `key`, or None"""
+        return self.rows().get(key)
+
+    def get(self, key, default=None, cast=None):
+        """
+        Return the value of `key` converted with `cast`, or `default` if the
+        key is missing or its value cannot be converted
+        """
+        row = self.rows().get(key)
+        if row is None:
+            return default
+        if cast is None:
+            return row.value
+        try:
+            return CASTS.get(cast, cast)(row.value)
+        except (TypeError, ValueError):
+            logger.warning("Setting %s=%r is not a valid %s", key, row.value, getattr(cast, '__name__', cast))
+            return default
+
+    def invalidate(self):
+        """Drop this worker's copy and tell the other workers to reload"""
+        with self._lock:
+            self._rows = None
+        incr(REFERENCE, self.version_key, timeout=None)
+
+    def connect(self):
+        """Invalidate the registry whenever a row is saved or deleted"""
+        def receiver(sender, **kwargs):
+            self.invalidate()
+            transaction.on_commit(self.invalidate)
+
+        post_save.connect(receiver, sender=self.model, weak=False, dispatch_uid=self.version_key)
+        post_delete.connect(receiver, sender=self.model, weak=False, dispatch_uid=f"{self.version_key}:delete")
+
+
+system_settings = SettingsRegistry('core.SystemSetting', related=('created_by', 'updated_by'))
@@ -0,0 +1,65 @@
+"""
+Test helpers shared across apps
+"""
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+from .instrumentation import normalize_sql, resolve_endpoint_name
+
+
+class QueryBudgetTestMixin:
+    """
+    TestCase mixin that fails when code or an endpoint runs more queries
+    than its declared budget
+    """
+
+    def _format_queries(self, captured):
+        shapes = {}
+        for query in captured:
+            shape = normalize_sql(query['sql'])
+            shapes[shape] = shapes.get(shape, 0) + 1
+        return "\n".join(
+            f"  {count}x {shape}"
+            for shape, count in sorted(shapes.items(), key=lambda item: -item[1])
+        )
+
+    @contextmanager
+    def assertMaxQueries(self, budget, label='block'):
+        """
+        Context manager asserting that at most `budget` queries are run
+        """
+        with CaptureQueriesContext(connection) as context:
+            yield context
+        executed = len(context.captured_queries)
+        if executed > budget:
+            self.fail(
+                f"{label} ran {executed} queries, over its budget of {budget}:\n"
+                f"{self._format_queries(context.captured_queries)}"
+            )
+
+    def get_declared_budget(self, method, url):
+        """Look up the query budget a ViewSet declares for the routed action"""
+        match = resolve(url.split('?')[0])
+        view_class = getattr(match.func, 'cls', None)
+        if view_class is None or not hasattr(view_class, 'get_query_budget'):
+            return None
+        action = resolve_endpoint_name(match.func, method).split('.', 1)[1]
+        view = view_class()
+        return view.get_query_budget(action)
+
+    def assertEndpointWithinBudget(self, method, url, budget=None, **kwargs):
+        """
+        Request `url` through `self.client` and fail if the endpoint goes
+        over `budget` (or the budget declared on its ViewSet)
+        """
+        if budget is None:
+            budget = self.get_declared_budget(method, url)
+        if budget is None:
+            self.fail(f"No query budget declared for {method.upper()} {url}")
+
+        with self.assertMaxQueries(budget, label=f"{method.upper()} {url}"):
+            response = getattr(self.client, method.lower())(url, **kwargs)
+        return response
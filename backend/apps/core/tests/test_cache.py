@@ -0,0 +1,43 @@
+from unittest import mock
+from django.test import TestCase
+from django.core.cache import caches
+from apps.core.cache import RATELIMIT, SECURITY, get_cache, get_or_set_many, incr
+
+
+class NamespacedCacheTest(TestCase):
+    """
+    Test case for the namespaced cache helpers and the local backend
+    """
+
+    def tearDown(self):
+        for alias in ('default', RATELIMIT, SECURITY):
+            caches[alias].clear()
+
+    def test_namespaces_do_not_share_keys(self):
+        get_cache(RATELIMIT).set('key', 'ratelimit')
+        get_cache(SECURITY).set('key', 'security')
+
+        self.assertEqual(get_cache(RATELIMIT).get('key'), 'ratelimit')
+        self.assertEqual(get_cache(SECURITY).get('key'), 'security')
+
+    def test_unknown_namespace_uses_default_cache(self):
+        self.assertIs(get_cache('unknown'), caches['default'])
+
+    def test_incr_creates_counter_with_expiry(self):
+        with mock.patch('time.time', return_value=1000):
+            self.assertEqual(incr(RATELIMIT, 'counter', timeout=60), 1)
+            self.assertEqual(incr(RATELIMIT, 'counter', timeout=60), 2)
+
+        # The window is not extended by later increments
+        with mock.patch('time.time', return_value=1061):
+            self.assertEqual(incr(RATELIMIT, 'counter', timeout=60), 1)
+
+    def test_get_or_set_many_only_loads_missing_keys(self):
+        get_cache(SECURITY).set('a', 1)
+        loader = mock.Mock(return_value={'b': 2})
+
+        values = get_or_set_many(SECURITY, ['a', 'b'], loader)
+
+        self.assertEqual(values, {'a': 1, 'b': 2})
+        loader.assert_called_once_with(['b'])
+        self.assertEqual(get_cache(SECURITY).get('b'), 2)
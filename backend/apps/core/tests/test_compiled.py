@@ -0,0 +1,130 @@
+import json
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.core.compiled import check_parity, compile_serializer
+from apps.core.fieldsets import Fieldset, parse_field_list
+from apps.core.models import Department, School, SchoolYear, Term
+from apps.curriculum.models import Course
+from apps.finance.models import Invoice, Payment
+from apps.finance.serializers import InvoiceSerializer, PaymentSerializer
+from apps.students.models import Attendance, Enrollment
+from apps.students.serializers import AttendanceSerializer
+
+User = get_user_model()
+
+
+class CompiledSerializerTest(TestCase):
+    """
+    Test case for compiled list serializers and their parity with DRF
+    """
+
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='admin123',
+            user_type='admin'
+        )
+        school = School.objects.create(
+            name='Test School',
+            code='TS001',
+            address='123 Test Street',
+            city='Test City',
+            state='Test State',
+            country='Test Country',
+            postal_code='12345',
+            phone='123-456-7890',
+            email='school@example.com'
+        )
+        today = timezone.now().date()
+        school_year = SchoolYear.objects.create(
+            school=school,
+            name='2024-2025',
+            start_date=today,
+            end_date=today + timezone.timedelta(days=365)
+        )
+        term = Term.objects.create(
+            school_year=school_year,
+            name='Fall Semester',
+            term_type='semester',
+            start_date=today,
+            end_date=today + timezone.timedelta(days=120)
+        )
+        department = Department.objects.create(school=school, name='Mathematics', code='MATH')
+        course = Course.objects.create(code='MATH101', name='Algebra', department=department)
+
+        for index in range(3):
+            user = User.objects.create_user(
+                username=f'student{index}',
+                email=f'student{index}@example.com',
+                password='student123'
+            )
+            invoice = Invoice.objects.create(
+                student=user.student_profile,
+                term=term,
+                invoice_number=f'INV-{index:05d}',
+                issue_date=today,
+                due_date=today + timezone.timedelta(days=30),
+                subtotal=Decimal('100.00'),
+                total=Decimal('100.00')
+            )
+            Payment.objects.create(
+                invoice=invoice,
+                amount=Decimal('33.30') * (index + 1),
+                payment_date=today - timezone.timedelta(days=index),
+                payment_method=('cash', 'bank_transfer', 'cash')[index],
+                status='completed',
+                # One payment without a receiver, so the nullable nested user is covered
+                received_by=self.admin_user if index else None,
+                created_by=self.admin_user
+            )
+            enrollment = Enrollment.objects.create(student=user.student_profile, course=course, term=term)
+            Attendance.objects.create(
+                enrollment=enrollment,
+                date=today - timezone.timedelta(days=index),
+                status=('present', 'late', 'absent')[index],
+                minutes_late=5 * index,
+                updated_by=self.admin_user
+            )
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin_user)
+
+    def test_payment_parity(self):
+        self.assertEqual(check_parity(PaymentSerializer, Payment.objects.all()), [])
+
+    def test_attendance_parity(self):
+        self.assertEqual(check_parity(AttendanceSerializer, Attendance.objects.all()), [])
+
+    def test_fieldset_parity(self):
+        fieldset = Fieldset(
+            parse_field_list('id,amount,status_display,received_by_details.email'),
+        )
+        self.assertEqual(check_parity(PaymentSerializer, Payment.objects.all(), fieldset), [])
+
+    def test_unsupported_serializer_is_not_compiled(self):
+        # Nested many=True items and payments cannot come from values()
+        self.assertIsNone(compile_serializer(InvoiceSerializer))
+
+    def test_list_endpoint_matches_drf(self):
+        url = reverse('payment-list')
+
+        compiled = self.client.get(url)
+        with override_settings(COMPILED_SERIALIZERS_ENABLE=False):
+            expected = self.client.get(url)
+
+        self.assertEqual(compiled.status_code, 200)
+        self.assertEqual(json.loads(compiled.content), json.loads(expected.content))
+
+    def test_keyset_pagination(self):
+        url = reverse('attendance-list')
+
+        first = self.client.get(url, {'pagination': 'cursor', 'page_size': 2})
+        second = self.client.get(first.data['next'])
+
+        ids = [row['id'] for row in first.data['results'] + second.data['results']]
+        self.assertEqual(ids, list(Attendance.objects.values_list('id', flat=True)))
@@ -0,0 +1,77 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.core.models import Notification
+
+User = get_user_model()
+
+
+class ConditionalGetTest(TestCase):
+    """
+    Test case for ETag/Last-Modified handling of ConditionalGetMixin
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='password123',
+            user_type='admin'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.notification = Notification.objects.create(
+            user=self.user,
+            title='Fees due',
+            message='Term fees are due on Friday.'
+        )
+        self.list_url = reverse('notification-list')
+        self.detail_url = reverse('notification-detail', args=[self.notification.pk])
+
+    def test_list_returns_304_when_unchanged(self):
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/"'))
+
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertFalse(response.content)
+
+    def test_list_etag_changes_on_update_and_delete(self):
+        etag = self.client.get(self.list_url)['ETag']
+
+        self.notification.title = 'Fees overdue'
+        self.notification.save()
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        Notification.objects.create(user=self.user, title='Older', message='x')
+        Notification.objects.filter(title='Older').delete()
+        self.assertEqual(self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.notification.delete()
+        self.assertEqual(self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_list_etag_depends_on_query(self):
+        etag = self.client.get(self.list_url)['ETag']
+        response = self.client.get(self.list_url, {'page': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_detail_honours_if_modified_since(self):
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_detail_304_skips_serialization(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        # get_object is the only query left once the user is authenticated
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
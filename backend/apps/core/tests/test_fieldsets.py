@@ -0,0 +1,124 @@
+import datetime
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.core.fieldsets import Fieldset, parse_field_list
+from apps.core.models import Notification, School, SchoolYear, Term
+from apps.core.optimizer import build_plan
+from apps.core.serializers import NotificationSerializer, TermSerializer
+
+User = get_user_model()
+
+
+class FieldsetParsingTest(TestCase):
+    """
+    Test case for parsing and applying fieldsets to serializers
+    """
+
+    def test_parse_field_list(self):
+        self.assertEqual(
+            parse_field_list('id, school_year.name,school_year.school ,,'),
+            {'id': {}, 'school_year': {'name': {}, 'school': {}}}
+        )
+        self.assertEqual(parse_field_list(None), {})
+
+    def test_key_ignores_order(self):
+        first = Fieldset(parse_field_list('id,name'), parse_field_list('created_by'))
+        second = Fieldset(parse_field_list('name,id'), parse_field_list('created_by'))
+        self.assertEqual(first.key, second.key)
+
+    def test_apply_fields_omit_and_expand(self):
+        serializer = Fieldset(
+            parse_field_list('id,name,school_year.name,created_by'),
+            parse_field_list('created_by.email'),
+            parse_field_list('school_year')
+        ).apply(TermSerializer())
+
+        self.assertEqual(set(serializer.fields), {'id', 'name', 'school_year', 'created_by'})
+        self.assertEqual(set(serializer.fields['school_year'].fields), {'name'})
+        self.assertNotIn('email', serializer.fields['created_by'].fields)
+        # Other instances keep every field
+        self.assertIn('created_by', TermSerializer().fields)
+
+    def test_plan_drops_joins_of_pruned_fields(self):
+        full = build_plan(NotificationSerializer, Notification)
+        sparse = build_plan(
+            NotificationSerializer, Notification, Fieldset(parse_field_list('id,title,is_read'))
+        )
+
+        self.assertEqual(set(full.select_paths()), {'created_by', 'updated_by'})
+        self.assertEqual(sparse.select_paths(), [])
+        self.assertEqual(sparse.only_fields(), ['id', 'is_read', 'title'])
+
+
+class SparseFieldsetViewTest(TestCase):
+    """
+    Test case for ?fields, ?omit and ?expand on ViewSets
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='password123',
+            user_type='admin'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        Notification.objects.create(user=self.user, title='Fees due', message='Pay by Friday.')
+        school = School.objects.create(
+            name='Test School',
+            code='TS001',
+            address='123 Test Street',
+            city='Test City',
+            state='Test State',
+            country='Test Country',
+            postal_code='12345',
+            phone='123-456-7890',
+            email='school@example.com'
+        )
+        today = datetime.date.today()
+        self.school_year = SchoolYear.objects.create(
+            school=school,
+            name='Current',
+            start_date=today,
+            end_date=today + datetime.timedelta(days=300)
+        )
+        Term.objects.create(
+            school_year=self.school_year,
+            name='Term 1',
+            term_type='semester',
+            start_date=today,
+            end_date=today + datetime.timedelta(days=100)
+        )
+
+    def test_fields_and_omit(self):
+        url = reverse('notification-list')
+
+        row = self.client.get(url, {'fields': 'id,title'}).data['results'][0]
+        self.assertEqual(set(row), {'id', 'title'})
+
+        row = self.client.get(url, {'omit': 'created_by,updated_by,message'}).data['results'][0]
+        self.assertNotIn('created_by', row)
+        self.assertNotIn('message', row)
+        self.assertIn('title', row)
+
+    def test_expand(self):
+        url = reverse('term-list')
+
+        row = self.client.get(url).data['results'][0]
+        self.assertEqual(row['school_year'], self.school_year.pk)
+
+        row = self.client.get(url, {'fields': 'id,school_year', 'expand': 'school_year'}).data['results'][0]
+        self.assertEqual(row['school_year']['name'], 'Current')
+
+    def test_writes_are_not_pruned(self):
+        url = reverse('notification-list')
+        response = self.client.post(f'{url}?fields=id', {
+            'user': self.user.pk,
+            'title': 'New',
+            'message': 'Created with a fields parameter.'
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('message', response.data)
@@ -0,0 +1,86 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from apps.core.instrumentation import normalize_sql, query_stats, QueryRecorder
+from apps.core.models import School
+from apps.core.testing import QueryBudgetTestMixin
+
+User = get_user_model()
+
+
+class NormalizeSqlTest(TestCase):
+    """
+    Test case for query shape normalisation
+    """
+
+    def test_parameters_and_in_lists_are_collapsed(self):
+        first = normalize_sql('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s) AND "x" = 1')
+        second = normalize_sql('SELECT *  FROM "t" WHERE "id" IN (%s) AND "x" = 42')
+
+        self.assertEqual(first, second)
+
+    def test_recorder_flags_repeated_shapes(self):
+        recorder = QueryRecorder()
+        for pk in range(6):
+            recorder(lambda *args: None, f'SELECT * FROM "t" WHERE "id" = {pk}', None, False, {})
+        recorder(lambda *args: None, 'SELECT COUNT(*) FROM "t"', None, False, {})
+
+        self.assertEqual(recorder.count, 7)
+        self.assertEqual(len(recorder.repeated_shapes(threshold=5)), 1)
+
+
+class QueryInstrumentationMiddlewareTest(QueryBudgetTestMixin, TestCase):
+    """
+    Test case for the query instrumentation middleware and stats endpoint
+    """
+
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='admin123',
+            user_type='admin'
+        )
+        School.objects.create(
+            name='Test School',
+            code='TS001',
+            address='123 Test Street',
+            city='Test City',
+            state='Test State',
+            country='Test Country',
+            postal_code='12345',
+            phone='123-456-7890',
+            email='school@example.com'
+        )
+        query_stats.reset()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin_user)
+
+    def test_stats_header_is_opt_in(self):
+        url = reverse('school-list')
+
+        response = self.client.get(url)
+        self.assertNotIn('X-Query-Stats', response)
+
+        response = self.client.get(url, HTTP_X_QUERY_STATS='1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('endpoint=SchoolViewSet.list', response['X-Query-Stats'])
+
+    def test_stats_endpoint_reports_samples(self):
+        self.client.get(reverse('school-list'))
+
+        response = self.client.get(reverse('query-stats'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['SchoolViewSet.list']['samples'], 1)
+
+    # School lists are otherwise served from the reference cache
+    @override_settings(REFERENCE_CACHE_ENABLE=False)
+    def test_budget_helper_fails_when_over_budget(self):
+        url = reverse('school-list')
+
+        self.assertEndpointWithinBudget('get', url, budget=10)
+        with self.assertRaises(AssertionError):
+            self.assertEndpointWithinBudget('get', url, budget=0)
@@ -0,0 +1,98 @@
+import base64
+import json
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework import status
+from apps.core.models import Notification
+
+User = get_user_model()
+
+
+class KeysetPaginationTest(TestCase):
+    """
+    Test case for the opt-in cursor pagination mode
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='admin123',
+            user_type='admin'
+        )
+        created_at = timezone.now()
+        notifications = Notification.objects.bulk_create([
+            Notification(
+                user=self.user,
+                title=f'Notification {index}',
+                message='Message',
+            )
+            for index in range(45)
+        ])
+        # Give most rows the same timestamp so the id tiebreaker matters
+        Notification.objects.filter(id__in=[n.id for n in notifications[:30]]).update(
+            created_at=created_at
+        )
+        self.expected_ids = list(
+            Notification.objects.order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('notification-list')
+
+    def collect(self, url):
+        ids, pages = [], 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+            pages += 1
+        return ids, pages
+
+    def test_page_number_mode_is_default(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data['count'], 45)
+        self.assertEqual(len(response.data['results']), 20)
+
+    def test_cursor_mode_walks_every_row_once_in_order(self):
+        ids, pages = self.collect(f'{self.url}?pagination=cursor')
+
+        self.assertEqual(ids, self.expected_ids)
+        self.assertEqual(pages, 3)
+
+    def test_cursor_mode_does_not_count(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f'{self.url}?pagination=cursor')
+
+        self.assertNotIn('count', response.data)
+        self.assertFalse(any('COUNT(' in q['sql'].upper() for q in context.captured_queries))
+
+    def test_previous_link_returns_to_earlier_page(self):
+        first = self.client.get(f'{self.url}?pagination=cursor&page_size=10')
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+
+        self.assertEqual(
+            [row['id'] for row in back.data['results']],
+            [row['id'] for row in first.data['results']]
+        )
+        self.assertIsNone(back.data['previous'])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(f'{self.url}?cursor=not-a-cursor')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_with_wrong_typed_values_is_rejected(self):
+        payload = json.dumps({'v': ['not-a-date', 'x']}).encode('utf-8')
+        token = base64.urlsafe_b64encode(payload).decode('ascii')
+        response = self.client.get(f'{self.url}?pagination=cursor&cursor={token}')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,107 @@
+import datetime
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, TestCase
+from apps.core.cache import PROFILES, get_cache
+from apps.core.models import Department, School, SchoolYear, Term
+from apps.core.profiles import PROFILE_KEY, ProfileResolver
+from apps.curriculum.models import Course
+from apps.students.models import Enrollment, Student
+
+User = get_user_model()
+
+
+class ProfileResolverTest(TestCase):
+    """
+    Test case for the request-scoped profile resolver
+    """
+
+    def setUp(self):
+        self.school = School.objects.create(
+            name='Test School',
+            code='TS001',
+            address='123 Test Street',
+            city='Test City',
+            state='Test State',
+            country='Test Country',
+            postal_code='12345',
+            phone='123-456-7890',
+            email='school@example.com'
+        )
+        # The students signal creates the Student profile
+        self.user = User.objects.create_user(
+            username='student',
+            email='student@example.com',
+            password='testpass123'
+        )
+
+    def tearDown(self):
+        get_cache(PROFILES).clear()
+
+    def resolver(self, user=None):
+        request = RequestFactory().get('/')
+        request.user = user or self.user
+        return ProfileResolver(request)
+
+    def test_profile_loaded_once_and_shared_across_requests(self):
+        profiles = self.resolver()
+        with self.assertNumQueries(2):
+            self.assertEqual(profiles.get_student().user_id, self.user.id)
+            self.assertEqual(profiles.student.user_id, self.user.id)
+            self.assertIsNone(profiles.staff_member)
+            self.assertFalse(profiles.is_manager)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.resolver().student.user_id, self.user.id)
+
+    def test_missing_profile_raises_does_not_exist(self):
+        Student.objects.filter(user=self.user).delete()
+
+        with self.assertRaises(Student.DoesNotExist):
+            self.resolver().get_student()
+
+    def test_profile_change_invalidates_cache(self):
+        self.resolver().student
+        student = Student.objects.get(user=self.user)
+        student.city = 'Elsewhere'
+        student.save()
+
+        self.assertEqual(self.resolver().student.city, 'Elsewhere')
+
+    def test_profile_cached_before_commit_is_dropped_on_commit(self):
+        student = Student.objects.get(user=self.user)
+        key = PROFILE_KEY.format(self.user.id, 'student')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            student.save()
+            # A concurrent request reading before the commit caches the old row
+            self.resolver().student
+            self.assertIsNotNone(get_cache(PROFILES).get(key))
+
+        self.assertIsNone(get_cache(PROFILES).get(key))
+
+    def test_enrollment_save_uses_loaded_student(self):
+        today = datetime.date.today()
+        school_year = SchoolYear.objects.create(
+            school=self.school, name='2024-2025', start_date=today, end_date=today + datetime.timedelta(days=365)
+        )
+        term = Term.objects.create(
+            school_year=school_year, name='Fall Semester', term_type='semester',
+            start_date=today, end_date=today + datetime.timedelta(days=120)
+        )
+        department = Department.objects.create(school=self.school, name='Mathematics', code='MATH')
+        course = Course.objects.create(code='MATH101', name='Algebra', department=department)
+        student = Student.objects.get(user=self.user)
+        self.resolver().enrollment_ids
+
+        with self.assertNumQueries(1):
+            # Only the INSERT; the student's user id is already known
+            Enrollment.objects.create(student=student, course=course, term=term)
+
+        self.assertEqual(len(self.resolver().enrollment_ids), 1)
+
+    def test_anonymous_user_has_no_profiles(self):
+        profiles = self.resolver(AnonymousUser())
+
+        self.assertIsNone(profiles.student)
+        self.assertEqual(profiles.enrollment_ids, frozenset())
@@ -0,0 +1,81 @@
+import datetime
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.core.cache import REFERENCE, get_cache
+from apps.core.models import School, SchoolYear, Term
+from apps.core.reference import reference_cache
+
+User = get_user_model()
+
+
+class ReferenceCacheTest(TestCase):
+    """
+    Test case for the reference data cache
+    """
+
+    def setUp(self):
+        self.school = School.objects.create(
+            name='Test School',
+            code='TS001',
+            address='123 Test Street',
+            city='Test City',
+            state='Test State',
+            country='Test Country',
+            postal_code='12345',
+            phone='123-456-7890',
+            email='school@example.com'
+        )
+        today = datetime.date.today()
+        self.school_year = SchoolYear.objects.create(
+            school=self.school,
+            name='Current',
+            start_date=today - datetime.timedelta(days=30),
+            end_date=today + datetime.timedelta(days=300)
+        )
+        self.term = Term.objects.create(
+            school_year=self.school_year,
+            name='Term 1',
+            term_type='semester',
+            start_date=today - datetime.timedelta(days=10),
+            end_date=today + datetime.timedelta(days=80)
+        )
+        self.user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='admin123',
+            user_type='admin'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def tearDown(self):
+        get_cache(REFERENCE).clear()
+        reference_cache._version = None
+
+    def test_lookup_and_current_from_memory(self):
+        reference_cache.objects(Term)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(reference_cache.lookup(Term, str(self.term.pk)), self.term)
+            self.assertEqual(reference_cache.current(Term), self.term)
+            self.assertIsNone(reference_cache.lookup(Term, 'not-a-pk'))
+
+    def test_current_term_endpoint_is_cached(self):
+        url = reverse('term-current')
+        self.assertEqual(self.client.get(url).data['id'], self.term.id)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+
+        self.assertEqual(response.data['school_year_name'], 'Current')
+
+    def test_save_invalidates_cached_responses(self):
+        url = reverse('school-detail', args=[self.school.pk])
+        self.client.get(url)
+
+        self.school.name = 'Renamed School'
+        self.school.save()
+
+        self.assertEqual(self.client.get(url).data['name'], 'Renamed School')
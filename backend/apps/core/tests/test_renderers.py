@@ -0,0 +1,68 @@
+import datetime
+import decimal
+import io
+import uuid
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from apps.core.renderers import FastJSONParser, FastJSONRenderer
+
+
+class FastJSONTest(SimpleTestCase):
+    """
+    Test case for the fast JSON renderer and parser
+    """
+
+    def setUp(self):
+        self.payload = {
+            'amount': decimal.Decimal('1250.50'),
+            'paid_at': timezone.now(),
+            'due': datetime.date(2024, 9, 30),
+            'starts': datetime.time(8, 30),
+            'reference': uuid.uuid4(),
+            'label': _('Invoice'),
+            'note': 'Café\u2028line',
+            'items': [(1, 2.5, None, True)],
+            7: 'int key',
+        }
+
+    def test_matches_drf_output(self):
+        self.assertEqual(FastJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+
+    @override_settings(JSON_BACKEND='json')
+    def test_standard_library_fallback(self):
+        self.assertEqual(FastJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+
+    def test_indented_output_uses_drf(self):
+        context = {'indent': 4}
+        self.assertEqual(
+            FastJSONRenderer().render(self.payload, 'application/json', context),
+            JSONRenderer().render(self.payload, 'application/json', context)
+        )
+
+    def test_wide_integer_matches_drf(self):
+        data = {'id': 2 ** 70, 'items': [-(2 ** 65)]}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_non_finite_numbers_are_rejected_like_drf(self):
+        for value in (float('nan'), float('inf'), decimal.Decimal('NaN'), decimal.Decimal('-Infinity')):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    JSONRenderer().render({'nested': [None, value]})
+                with self.assertRaises(ValueError):
+                    FastJSONRenderer().render({'nested': [None, value]})
+
+    def test_parser_matches_drf(self):
+        body = JSONRenderer().render({'name': 'Café', 'values': [1, 2.5, None]})
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(body)),
+            JSONParser().parse(io.BytesIO(body))
+        )
+
+    def test_parser_rejects_invalid_json(self):
+        for body in (b'{"a": ', b'', b'{"a": NaN}'):
+            with self.assertRaises(ParseError):
+                FastJSONParser().parse(io.BytesIO(body))
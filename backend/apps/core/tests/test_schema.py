@@ -0,0 +1,35 @@
+from unittest import mock
+
+from django.db import connection
+from django.apps import apps
+from django.db.models.signals import post_migrate
+from django.test import TestCase
+
+from apps.core.schema import SchemaRegistry, schema
+from audit.models import ActivityLog
+
+
+class SchemaRegistryTest(TestCase):
+    """
+    Test case for the cached schema introspection registry
+    """
+
+    def test_introspects_once(self):
+        registry = SchemaRegistry()
+        with mock.patch.object(
+            connection.introspection, 'table_names', wraps=connection.introspection.table_names
+        ) as table_names:
+            self.assertTrue(registry.has_model(ActivityLog))
+            self.assertTrue(registry.has_table('audit_securityalert'))
+            self.assertFalse(registry.has_table('no_such_table'))
+
+        self.assertEqual(table_names.call_count, 1)
+
+    def test_post_migrate_invalidates(self):
+        schema.table_names()
+        self.assertIn('default', schema._tables)
+
+        app_config = apps.get_app_config('core')
+        post_migrate.send(sender=app_config, app_config=app_config, using='default', verbosity=0, interactive=False, plan=[], apps=apps)
+
+        self.assertNotIn('default', schema._tables)
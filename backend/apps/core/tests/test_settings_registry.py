@@ -0,0 +1,62 @@
+from django.test import TestCase
+from apps.core.cache import REFERENCE, get_cache
+from apps.core.models import SystemSetting
+from apps.core.settings_registry import SettingsRegistry
+from security.models import SecuritySetting
+from security.registry import security_settings
+
+
+class SettingsRegistryTest(TestCase):
+    """
+    Test case for the in-process settings registry
+    """
+
+    def setUp(self):
+        SystemSetting.objects.create(key='max_upload_mb', value='25')
+        SystemSetting.objects.create(key='maintenance_mode', value='yes')
+        SystemSetting.objects.create(key='grade_scale', value='{"A": 90, "B": 80}')
+        self.registry = SettingsRegistry('core.SystemSetting')
+
+    def tearDown(self):
+        get_cache(REFERENCE).clear()
+
+    def test_all_rows_loaded_in_one_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.registry.get('max_upload_mb', cast=int), 25)
+            self.assertTrue(self.registry.get('maintenance_mode', cast=bool))
+            self.assertEqual(self.registry.get('grade_scale', cast=dict), {'A': 90, 'B': 80})
+            self.assertEqual(self.registry.get('missing', 'fallback'), 'fallback')
+
+    def test_invalid_value_returns_default(self):
+        self.assertEqual(self.registry.get('maintenance_mode', 3, int), 3)
+
+    def test_other_worker_changes_are_picked_up(self):
+        self.registry.get('max_upload_mb')
+        other_worker = SettingsRegistry('core.SystemSetting')
+        other_worker.get('max_upload_mb')
+
+        SystemSetting.objects.filter(key='max_upload_mb').update(value='50')
+        self.registry.invalidate()
+        other_worker._checked_at = 0
+
+        self.assertEqual(other_worker.get('max_upload_mb', cast=int), 50)
+
+    def test_saving_a_row_invalidates(self):
+        security_settings.get('session_timeout')
+        SecuritySetting.objects.create(key='session_timeout', value='900')
+
+        self.assertEqual(security_settings.get('session_timeout', cast=int), 900)
+
+    def test_concurrent_invalidate_during_version_check(self):
+        self.registry.get('max_upload_mb')
+        self.registry._checked_at = 0
+        shared_version = self.registry._shared_version
+
+        def version_then_invalidate():
+            # Another thread's invalidate() lands between the check and the read
+            version = shared_version()
+            self.registry._rows = None
+            return version
+
+        self.registry._shared_version = version_then_invalidate
+        self.assertEqual(self.registry.get('max_upload_mb', cast=int), 25)
@@ -18,4 +18,5 @@ router.register(r'notifications', views.NotificationViewSet)
 # URLs patterns
 urlpatterns = [
     path('', include(router.urls)),
+    path('query-stats/', views.query_stats_summary, name='query-stats'),
 ]
\ No newline at end of file
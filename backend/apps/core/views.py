@@ -1,9 +1,16 @@
 from django.utils import timezone
 from django.db.models import Q
 from rest_framework import viewsets, status, permissions
-from rest_framework.decorators import action
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.response import Response
 
+from .conditional import ConditionalGetMixin
+from .fieldsets import SparseFieldsetMixin
+from .instrumentation import query_stats
+from .optimizer import QuerySetOptimizerMixin
+from .reference import ReferenceCacheMixin, reference_cache
+from .settings_registry import system_settings
+
 from .models import (
     School,
     SchoolYear,
@@ -22,7 +29,7 @@ from .serializers import (
 )
 
 
-class SchoolViewSet(viewsets.ModelViewSet):
+class SchoolViewSet(ReferenceCacheMixin, QuerySetOptimizerMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing School instances
     """
@@ -47,7 +54,7 @@ class SchoolViewSet(viewsets.ModelViewSet):
         serializer.save(updated_by=self.request.user)
 
 
-class SchoolYearViewSet(viewsets.ModelViewSet):
+class SchoolYearViewSet(ReferenceCacheMixin, QuerySetOptimizerMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing SchoolYear instances
     """
@@ -87,13 +94,8 @@ class SchoolYearViewSet(viewsets.ModelViewSet):
         """
         Get the current active school year
         """
-        current_date = timezone.now().date()
         try:
-            current_year = SchoolYear.objects.filter(
-                start_date__lte=current_date,
-                end_date__gte=current_date,
-                is_active=True
-            ).first()
+            current_year = reference_cache.current(SchoolYear)
             
             if not current_year:
                 return Response(
@@ -101,8 +103,9 @@ class SchoolYearViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_404_NOT_FOUND
                 )
                 
-            serializer = self.get_serializer(current_year)
-            return Response(serializer.data)
+            return self.cached_response(
+                request, f"current:{current_year.pk}", lambda: self.get_serializer(current_year)
+            )
             
         except Exception as e:
             return Response(
@@ -111,7 +114,7 @@ class SchoolYearViewSet(viewsets.ModelViewSet):
             )
 
 
-class TermViewSet(viewsets.ModelViewSet):
+class TermViewSet(ReferenceCacheMixin, QuerySetOptimizerMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Term instances
     """
@@ -151,13 +154,8 @@ class TermViewSet(viewsets.ModelViewSet):
         """
         Get the current active term
         """
-        current_date = timezone.now().date()
         try:
-            current_term = Term.objects.filter(
-                start_date__lte=current_date,
-                end_date__gte=current_date,
-                is_active=True
-            ).first()
+            current_term = reference_cache.current(Term)
             
             if not current_term:
                 return Response(
@@ -165,8 +163,9 @@ class TermViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_404_NOT_FOUND
                 )
                 
-            serializer = self.get_serializer(current_term)
-            return Response(serializer.data)
+            return self.cached_response(
+                request, f"current:{current_term.pk}", lambda: self.get_serializer(current_term)
+            )
             
         except Exception as e:
             return Response(
@@ -175,7 +174,7 @@ class TermViewSet(viewsets.ModelViewSet):
             )
 
 
-class DepartmentViewSet(viewsets.ModelViewSet):
+class DepartmentViewSet(ReferenceCacheMixin, QuerySetOptimizerMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Department instances
     """
@@ -211,7 +210,7 @@ class DepartmentViewSet(viewsets.ModelViewSet):
         serializer.save(updated_by=self.request.user)
 
 
-class SystemSettingViewSet(viewsets.ModelViewSet):
+class SystemSettingViewSet(QuerySetOptimizerMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing SystemSetting instances
     """
@@ -237,24 +236,25 @@ class SystemSettingViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        try:
-            setting = SystemSetting.objects.get(key=key)
-            serializer = self.get_serializer(setting)
-            return Response(serializer.data)
-        except SystemSetting.DoesNotExist:
+        setting = system_settings.get_instance(key)
+        if setting is None:
             return Response(
                 {"detail": f"Setting with key '{key}' not found."},
                 status=status.HTTP_404_NOT_FOUND
             )
+        
+        serializer = self.get_serializer(setting)
+        return Response(serializer.data)
 
 
-class NotificationViewSet(viewsets.ModelViewSet):
+class NotificationViewSet(ConditionalGetMixin, QuerySetOptimizerMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Notification instances
     """
     queryset = Notification.objects.all()
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    page_size = 20
     
     def get_queryset(self):
         """
@@ -317,4 +317,19 @@ class NotificationViewSet(viewsets.ModelViewSet):
         Get the count of unread notifications for the current user
         """
         count = self.get_queryset().filter(is_read=False).count()
-        return Response({"count": count})
\ No newline at end of file
+        return Response({"count": count})
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([permissions.IsAdminUser])
+def query_stats_summary(request):
+    """
+    Rolling per-endpoint query statistics collected by
+    QueryInstrumentationMiddleware for this worker process
+    """
+    if request.method == 'DELETE':
+        query_stats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    
+    endpoint = request.query_params.get('endpoint', None)
+    return Response(query_stats.snapshot(endpoint))
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from apps.core.optimizer import depends_on
 from apps.core.serializers import UserMinimalSerializer
 from .models import (
     Course,
@@ -27,6 +28,7 @@ class CourseSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('created_at', 'updated_at', 'created_by', 'updated_by')
     
+    @depends_on('prerequisites')
     def get_prerequisites_details(self, obj):
         return [
             {'id': course.id, 'code': course.code, 'name': course.name}
@@ -47,6 +49,7 @@ class CourseMaterialSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('created_at', 'updated_at', 'created_by', 'updated_by')
     
+    @depends_on('course')
     def get_course_details(self, obj):
         return {
             'id': obj.course.id,
@@ -68,6 +71,7 @@ class LessonSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('created_at', 'updated_at', 'created_by', 'updated_by')
     
+    @depends_on('course')
     def get_course_details(self, obj):
         return {
             'id': obj.course.id,
@@ -92,6 +96,7 @@ class ClassScheduleSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('created_at', 'updated_at', 'created_by', 'updated_by')
     
+    @depends_on('course')
     def get_course_details(self, obj):
         return {
             'id': obj.course.id,
@@ -99,6 +104,7 @@ class ClassScheduleSerializer(serializers.ModelSerializer):
             'name': obj.course.name
         }
     
+    @depends_on('term')
     def get_term_details(self, obj):
         return {
             'id': obj.term.id,
@@ -107,6 +113,7 @@ class ClassScheduleSerializer(serializers.ModelSerializer):
             'end_date': obj.term.end_date
         }
     
+    @depends_on()
     def get_day_of_week_display(self, obj):
         return obj.get_day_of_week_display()
 
@@ -125,6 +132,7 @@ class AssignmentSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('created_at', 'updated_at', 'created_by', 'updated_by')
     
+    @depends_on('course')
     def get_course_details(self, obj):
         return {
             'id': obj.course.id,
@@ -147,6 +155,7 @@ class SyllabusSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('created_at', 'updated_at', 'created_by', 'updated_by')
     
+    @depends_on('course')
     def get_course_details(self, obj):
         return {
             'id': obj.course.id,
@@ -154,6 +163,7 @@ class SyllabusSerializer(serializers.ModelSerializer):
             'name': obj.course.name
         }
     
+    @depends_on('term')
     def get_term_details(self, obj):
         return {
             'id': obj.term.id,
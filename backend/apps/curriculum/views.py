@@ -4,6 +4,10 @@ from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.fieldsets import SparseFieldsetMixin
+from apps.core.reference import ReferenceCacheMixin
+
 from .models import (
     Course,
     CourseMaterial,
@@ -22,7 +26,7 @@ from .serializers import (
 )
 
 
-class CourseViewSet(viewsets.ModelViewSet):
+class CourseViewSet(ReferenceCacheMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Course instances
     """
@@ -143,7 +147,7 @@ class CourseViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_404_NOT_FOUND)
 
 
-class CourseMaterialViewSet(viewsets.ModelViewSet):
+class CourseMaterialViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing CourseMaterial instances
     """
@@ -197,7 +201,7 @@ class CourseMaterialViewSet(viewsets.ModelViewSet):
         serializer.save(updated_by=self.request.user)
 
 
-class LessonViewSet(viewsets.ModelViewSet):
+class LessonViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Lesson instances
     """
@@ -246,13 +250,14 @@ class LessonViewSet(viewsets.ModelViewSet):
         serializer.save(updated_by=self.request.user)
 
 
-class ClassScheduleViewSet(viewsets.ModelViewSet):
+class ClassScheduleViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing ClassSchedule instances
     """
     queryset = ClassSchedule.objects.all()
     serializer_class = ClassScheduleSerializer
     permission_classes = [permissions.IsAuthenticated]
+    conditional_relations = ('course', 'term')
     
     def get_permissions(self):
         """
@@ -321,7 +326,7 @@ class ClassScheduleViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class AssignmentViewSet(viewsets.ModelViewSet):
+class AssignmentViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Assignment instances
     """
@@ -399,7 +404,7 @@ class AssignmentViewSet(viewsets.ModelViewSet):
         })
 
 
-class SyllabusViewSet(viewsets.ModelViewSet):
+class SyllabusViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Syllabus instances
     """
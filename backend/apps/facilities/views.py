@@ -5,6 +5,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model
 
+from apps.core.fieldsets import SparseFieldsetMixin
 from .models import (
     Building,
     Room,
@@ -25,7 +26,7 @@ from .serializers import (
 User = get_user_model()
 
 
-class BuildingViewSet(viewsets.ModelViewSet):
+class BuildingViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Building instances
     """
@@ -101,7 +102,7 @@ class BuildingViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class RoomViewSet(viewsets.ModelViewSet):
+class RoomViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Room instances
     """
@@ -244,7 +245,7 @@ class RoomViewSet(viewsets.ModelViewSet):
         })
 
 
-class EquipmentViewSet(viewsets.ModelViewSet):
+class EquipmentViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Equipment instances
     """
@@ -313,7 +314,7 @@ class EquipmentViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class MaintenanceViewSet(viewsets.ModelViewSet):
+class MaintenanceViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Maintenance instances
     """
@@ -471,7 +472,7 @@ class MaintenanceViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class ReservationViewSet(viewsets.ModelViewSet):
+class ReservationViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Reservation instances
     """
@@ -638,7 +639,7 @@ class ReservationViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class InventoryViewSet(viewsets.ModelViewSet):
+class InventoryViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Inventory instances
     """
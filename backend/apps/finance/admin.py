@@ -2,7 +2,9 @@ from django.contrib import admin
 from .models import (
     FeeStructure,
     FeeItem,
+    FeeItemOptIn,
     Invoice,  # Add Invoice to imports
+    InvoiceSweep,
     InvoiceItem,
     Payment,
     Expense,
@@ -71,6 +73,15 @@ class FeeItemAdmin(admin.ModelAdmin):
         super().save_model(request, obj, form, change)
 
 
+@admin.register(FeeItemOptIn)
+class FeeItemOptInAdmin(admin.ModelAdmin):
+    list_display = ('student', 'fee_item')
+    list_filter = ('fee_item__fee_structure__term', 'fee_item__fee_structure')
+    search_fields = ('student__student_id', 'fee_item__name')
+    raw_id_fields = ('student', 'fee_item')
+    readonly_fields = ('created_at', 'updated_at', 'created_by', 'updated_by')
+
+
 class InvoiceItemInline(admin.TabularInline):
     model = InvoiceItem
     extra = 1
@@ -88,14 +99,14 @@ class InvoiceAdmin(admin.ModelAdmin):
     list_filter = ('status', 'issue_date', 'due_date', 'term')
     search_fields = ('invoice_number', 'student__student_id', 'student__user__first_name', 'student__user__last_name')
     inlines = [InvoiceItemInline, PaymentInline]
-    readonly_fields = ('created_at', 'updated_at', 'created_by', 'updated_by')
+    readonly_fields = ('amount_paid', 'balance', 'created_at', 'updated_at', 'created_by', 'updated_by')
     
     fieldsets = (
         ('Basic Information', {
-            'fields': ('student', 'term', 'invoice_number', 'issue_date', 'due_date', 'status')
+            'fields': ('student', 'term', 'fee_structure', 'invoice_number', 'issue_date', 'due_date', 'status')
         }),
         ('Financial Information', {
-            'fields': ('subtotal', 'discount', 'tax', 'total')
+            'fields': ('subtotal', 'discount', 'tax', 'total', 'amount_paid', 'balance')
         }),
         ('Additional Information', {
             'fields': ('notes',)
@@ -113,6 +124,14 @@ class InvoiceAdmin(admin.ModelAdmin):
         super().save_model(request, obj, form, change)
 
 
+@admin.register(InvoiceSweep)
+class InvoiceSweepAdmin(admin.ModelAdmin):
+    list_display = ('as_of', 'started_at', 'finished_at', 'invoices_flagged', 'notifications_sent', 'dry_run')
+    list_filter = ('dry_run',)
+    readonly_fields = ('as_of', 'dry_run', 'started_at', 'finished_at', 'invoices_flagged',
+                       'notifications_sent', 'schools', 'triggered_by')
+
+
 @admin.register(InvoiceItem)
 class InvoiceItemAdmin(admin.ModelAdmin):
     list_display = ('invoice', 'description', 'quantity', 'unit_price', 'subtotal')
@@ -0,0 +1,224 @@
+"""
+Accounts-receivable aging.
+
+Outstanding invoice balances are bucketed by how many days past due they
+are on the as-of date: ``current`` (not yet due), ``days_0_30``,
+``days_31_60``, ``days_61_90`` and ``days_90_plus``. Invoices count when
+they were issued on or before the as-of date, are neither drafts nor
+cancelled and have ``balance > 0``, so the partial outstanding-balance
+index serves the scan. Balances are the stored running ones; payments
+posted after the as-of date are already deducted.
+
+Each report is a single query: the buckets are filtered ``Sum`` aggregates
+over the same rows (``SUM(...) FILTER (WHERE ...)`` on PostgreSQL), grouped
+by school, term or fee type, or one row per student or invoice for the
+drill-down. Invoice items carry no balance of their own, so the fee-type
+report splits each invoice's balance across its items in proportion to
+their subtotals.
+
+Reports are cached per school and as-of date under a version number that
+payment and invoice writes bump (see signals.py).
+"""
+import datetime
+import hashlib
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import DecimalField, ExpressionWrapper, F, FloatField, Q, Sum, Value
+from django.db.models.functions import Cast, Coalesce
+
+from apps.core.cache import REPORTS, get_cache, incr
+from apps.students.models import Student
+
+from .models import Invoice, InvoiceItem
+
+# (name, fewest days past due, most days past due); `current` is not yet due
+AGING_BUCKETS = (
+    ('current', None, -1),
+    ('days_0_30', 0, 30),
+    ('days_31_60', 31, 60),
+    ('days_61_90', 61, 90),
+    ('days_90_plus', 91, None),
+)
+BUCKETS = tuple(name for name, _, _ in AGING_BUCKETS)
+GROUPINGS = ('school', 'term', 'fee_type', 'student', 'invoice')
+# Groupings with a row per student or invoice, served with keyset pagination
+DRILL_DOWN = ('student', 'invoice')
+
+# Drafts were never issued and cancelled invoices are not owed
+RECEIVABLE_STATUSES = tuple(
+    status for status, _ in Invoice.INVOICE_STATUS_CHOICES if status not in ('draft', 'cancelled')
+)
+
+CENT = Decimal('0.01')
+MONEY = DecimalField(max_digits=14, decimal_places=2)
+
+
+def bucket_conditions(as_of, prefix=''):
+    """The due-date condition of each bucket, for lookups starting at `prefix`"""
+    conditions = {}
+    for name, fewest, most in AGING_BUCKETS:
+        condition = Q()
+        if fewest is not None:
+            condition &= Q(**{f'{prefix}due_date__lte': as_of - datetime.timedelta(days=fewest)})
+        if most is not None:
+            condition &= Q(**{f'{prefix}due_date__gte': as_of - datetime.timedelta(days=most)})
+        conditions[name] = condition
+    return conditions
+
+
+def bucket_for(due_date, as_of):
+    """The bucket of a single invoice"""
+    days = (as_of - due_date).days
+    for name, fewest, most in AGING_BUCKETS:
+        if (fewest is None or days >= fewest) and (most is None or days <= most):
+            return name
+
+
+def outstanding_condition(as_of, prefix=''):
+    """Invoices that count towards receivables on `as_of`"""
+    return Q(**{
+        f'{prefix}balance__gt': 0,
+        f'{prefix}issue_date__lte': as_of,
+        f'{prefix}status__in': RECEIVABLE_STATUSES,
+    })
+
+
+def outstanding_invoices(as_of, school=None, term=None, student=None):
+    invoices = Invoice.objects.filter(outstanding_condition(as_of))
+    if school:
+        invoices = invoices.filter(student__school_id=school)
+    if term:
+        invoices = invoices.filter(term_id=term)
+    if student:
+        invoices = invoices.filter(student_id=student)
+    return invoices
+
+
+def bucket_sums(amount, as_of, prefix=''):
+    """Conditional aggregates: one Sum of `amount` per bucket, plus the total"""
+    sums = {
+        name: Coalesce(Sum(amount, filter=condition), Value(0), output_field=MONEY)
+        for name, condition in bucket_conditions(as_of, prefix).items()
+    }
+    sums['total'] = Coalesce(Sum(amount), Value(0), output_field=MONEY)
+    return sums
+
+
+def item_share():
+    """An invoice item's share of its invoice's balance, by subtotal"""
+    subtotal = F('subtotal')
+    if connection.vendor == 'sqlite':
+        # SQLite stores whole amounts as integers and would divide them as such
+        subtotal = Cast(subtotal, FloatField())
+    return ExpressionWrapper(subtotal * F('invoice__balance') / F('invoice__total'), output_field=MONEY)
+
+
+def aging_queryset(group_by, as_of, school=None, term=None, student=None):
+    """
+    Return a values() queryset with one aged row per group
+    """
+    if group_by == 'student':
+        # Grouped from Student so each row keeps the pk keyset pagination needs;
+        # filtering before annotating restricts the sums to the joined invoices
+        condition = outstanding_condition(as_of, 'invoices__')
+        if term:
+            condition &= Q(invoices__term_id=term)
+        students = Student.objects.filter(condition)
+        if school:
+            students = students.filter(school_id=school)
+        if student:
+            students = students.filter(pk=student)
+        return students.values('id', 'student_id', 'school_id').annotate(
+            **bucket_sums('invoices__balance', as_of, 'invoices__')
+        ).order_by('pk')
+
+    invoices = outstanding_invoices(as_of, school, term, student)
+    if group_by == 'invoice':
+        return invoices.values(
+            'id', 'invoice_number', 'student_id', 'term_id', 'issue_date', 'due_date', 'total', 'balance'
+        ).order_by('pk')
+
+    if group_by == 'fee_type':
+        return InvoiceItem.objects.filter(invoice__in=invoices.values('pk')).values(
+            fee_type=Coalesce('fee_item__fee_type', Value('other'))
+        ).annotate(**bucket_sums(item_share(), as_of, 'invoice__')).order_by('fee_type')
+
+    columns = {
+        'school': ('student__school_id', 'student__school__name'),
+        'term': ('term_id', 'term__name'),
+    }[group_by]
+    return invoices.values(*columns).annotate(**bucket_sums('balance', as_of)).order_by(*columns)
+
+
+def present_row(row, as_of):
+    """Round the amounts to cents; invoice rows also get their bucket"""
+    row = dict(row)
+    if 'balance' in row:
+        row['bucket'] = bucket_for(row['due_date'], as_of)
+    for name in (*BUCKETS, 'total'):
+        if isinstance(row.get(name), Decimal):
+            row[name] = row[name].quantize(CENT)
+    return row
+
+
+def aging_totals(as_of, school=None, term=None, student=None):
+    """The report totals across every group"""
+    sums = outstanding_invoices(as_of, school, term, student).aggregate(**bucket_sums('balance', as_of))
+    return {name: value.quantize(CENT) for name, value in sums.items()}
+
+
+def row_totals(rows):
+    """Totals of a grouped report; each outstanding balance is in exactly one group"""
+    return {name: sum((row[name] for row in rows), Decimal('0.00')) for name in (*BUCKETS, 'total')}
+
+
+def version_key(school_id):
+    return f"ar-aging:version:{school_id or 'all'}"
+
+
+def report_version(school_id):
+    """The cache version of one school's reports, or of all-school reports"""
+    cache = get_cache(REPORTS)
+    key = version_key(school_id)
+    cache.add(key, 1, None)
+    return cache.get(key, 1)
+
+
+def invalidate_aging(school_id=None):
+    """Orphan the cached reports of `school_id` and every all-school report"""
+    incr(REPORTS, version_key(None), timeout=None)
+    if school_id:
+        incr(REPORTS, version_key(school_id), timeout=None)
+
+
+def invalidate_student_aging(student_id):
+    """
+    Invalidate the reports of the student's school once the transaction
+    commits, so a concurrent request cannot re-cache the old balances
+    """
+    school_id = Student.objects.filter(pk=student_id).values_list('school_id', flat=True).first()
+    transaction.on_commit(lambda: invalidate_aging(school_id))
+
+
+def report_cache_key(school_id, as_of, params):
+    digest = hashlib.md5(repr(sorted(params.items())).encode('utf-8')).hexdigest()
+    return f"ar-aging:{school_id or 'all'}:{as_of.isoformat()}:{report_version(school_id)}:{digest}"
+
+
+def cached_report(school_id, as_of, params, build):
+    """
+    Return the cached report for (school, as-of date, params), calling
+    `build()` and caching its result on a miss
+    """
+    timeout = getattr(settings, 'AR_AGING_CACHE_TTL', 900)
+    if not timeout:
+        return build()
+    cache = get_cache(REPORTS)
+    key = report_cache_key(school_id, as_of, params)
+    report = cache.get(key)
+    if report is None:
+        report = build()
+        cache.set(key, report, timeout)
+    return report
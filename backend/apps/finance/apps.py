@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class FinanceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.finance'
-    verbose_name = 'Finance Management'
\ No newline at end of file
+    verbose_name = 'Finance Management'
+    
+    def ready(self):
+        import apps.finance.signals
@@ -0,0 +1,163 @@
+"""
+Term-wide invoice generation from fee structures.
+
+InvoiceGenerator invoices a cohort of students for one FeeStructure:
+every mandatory FeeItem, plus the optional items each student opted into
+(FeeItemOptIn). Students are processed in chunks. Each chunk allocates its
+invoice numbers in one block and writes its invoices and items with two
+bulk_create calls inside one transaction. A failure therefore loses at
+most the chunk in flight, and re-running only invoices students the
+structure has not invoiced yet.
+"""
+import datetime
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.students.models import Student
+
+from .aging import invalidate_aging
+from .models import FeeItemOptIn, FeeStructure, Invoice, InvoiceItem
+from .numbering import allocate_invoice_numbers
+
+
+def cohort_queryset(fee_structure, status='active', student_ids=None, enrolled_only=False):
+    """
+    Students of the fee structure's school, optionally narrowed to a status,
+    explicit ids, or students enrolled in a course in its term
+    """
+    students = Student.objects.filter(school_id=fee_structure.school_id)
+    if status:
+        students = students.filter(status=status)
+    if student_ids:
+        students = students.filter(pk__in=student_ids)
+    if enrolled_only:
+        students = students.filter(enrollments__term_id=fee_structure.term_id).distinct()
+    return students
+
+
+class InvoiceGenerator:
+    """
+    Generates one invoice per student of `students` for `fee_structure`
+    """
+
+    def __init__(self, fee_structure, students=None, issue_date=None, due_date=None, status='draft',
+                 user=None, chunk_size=None, progress=None):
+        self.fee_structure = fee_structure
+        self.students = cohort_queryset(fee_structure) if students is None else students
+        self.issue_date = issue_date or timezone.localdate()
+        self.due_date = due_date
+        self.status = status
+        self.user = user
+        self.chunk_size = chunk_size or getattr(settings, 'INVOICE_GENERATION_CHUNK_SIZE', 500)
+        # Called as progress(processed, total) after every chunk
+        self.progress = progress
+
+    def get_due_date(self, fee_items):
+        """The explicit due date, else the earliest mandatory item due date, else INVOICE_DUE_DAYS out"""
+        if self.due_date:
+            return self.due_date
+        due_dates = [item.due_date for item in fee_items if item.due_date and not item.is_optional]
+        if due_dates:
+            return min(due_dates)
+        return self.issue_date + datetime.timedelta(days=getattr(settings, 'INVOICE_DUE_DAYS', 30))
+
+    def pending_student_ids(self):
+        """Students of the cohort this fee structure has not invoiced yet"""
+        return list(
+            self.students.exclude(invoices__fee_structure=self.fee_structure)
+            .order_by('pk').values_list('pk', flat=True)
+        )
+
+    def run(self):
+        """
+        Generate the invoices and return a summary of the run
+        """
+        fee_items = list(self.fee_structure.items.all())
+        mandatory = [item for item in fee_items if not item.is_optional]
+        optional = {item.pk: item for item in fee_items if item.is_optional}
+        due_date = self.get_due_date(fee_items)
+
+        student_ids = self.pending_student_ids()
+        result = {
+            'fee_structure': self.fee_structure.pk,
+            'students': len(student_ids),
+            'created': 0,
+            'items': 0,
+            'skipped': 0,
+        }
+        for start in range(0, len(student_ids), self.chunk_size):
+            chunk = student_ids[start:start + self.chunk_size]
+            created, items = self.generate_chunk(chunk, mandatory, optional, due_date)
+            result['created'] += created
+            result['items'] += items
+            result['skipped'] += len(chunk) - created
+            if self.progress:
+                self.progress(start + len(chunk), len(student_ids))
+        return result
+
+    def generate_chunk(self, student_ids, mandatory, optional, due_date):
+        """Invoice one chunk of students in a single transaction"""
+        # Reserved before the transaction so the sequence row is not locked while
+        # the chunk is written; numbers of skipped students are left as gaps
+        numbers = allocate_invoice_numbers(self.fee_structure.school.code, self.issue_date, len(student_ids))
+        
+        with transaction.atomic():
+            # Serialises concurrent runs for the same structure, so the check
+            # below cannot race with another run's inserts
+            FeeStructure.objects.select_for_update().filter(pk=self.fee_structure.pk).first()
+            invoiced = set(
+                Invoice.objects.filter(fee_structure=self.fee_structure, student_id__in=student_ids)
+                .values_list('student_id', flat=True)
+            )
+
+            opted_in = defaultdict(list)
+            if optional:
+                for student_id, fee_item_id in FeeItemOptIn.objects.filter(
+                    student_id__in=student_ids, fee_item_id__in=optional
+                ).values_list('student_id', 'fee_item_id'):
+                    opted_in[student_id].append(optional[fee_item_id])
+
+            lines = {}
+            for student_id in student_ids:
+                if student_id in invoiced:
+                    continue
+                items = mandatory + sorted(opted_in[student_id], key=lambda item: (item.fee_type, item.name))
+                # Nothing to bill, e.g. a structure of optional items nobody took
+                if items:
+                    lines[student_id] = items
+            if not lines:
+                return 0, 0
+
+            invoices = Invoice.objects.bulk_create([
+                Invoice(
+                    student_id=student_id,
+                    term_id=self.fee_structure.term_id,
+                    fee_structure=self.fee_structure,
+                    invoice_number=number,
+                    issue_date=self.issue_date,
+                    due_date=due_date,
+                    subtotal=sum(item.amount for item in items),
+                    total=sum(item.amount for item in items),
+                    status=self.status,
+                    created_by=self.user,
+                    updated_by=self.user
+                ) for (student_id, items), number in zip(lines.items(), numbers)
+            ])
+            invoice_items = InvoiceItem.objects.bulk_create([
+                InvoiceItem(
+                    invoice=invoice,
+                    fee_item=item,
+                    description=item.name,
+                    quantity=1,
+                    unit_price=item.amount,
+                    subtotal=item.amount,
+                    created_by=self.user,
+                    updated_by=self.user
+                ) for invoice in invoices for item in lines[invoice.student_id]
+            ])
+            # bulk_create sends no signals
+            transaction.on_commit(lambda: invalidate_aging(self.fee_structure.school_id))
+        return len(invoices), len(invoice_items)
@@ -0,0 +1,62 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.finance.billing import InvoiceGenerator, cohort_queryset
+from apps.finance.models import FeeStructure
+
+
+def parse_date(value):
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"'{value}' is not a YYYY-MM-DD date")
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates invoices for a term from its active fee structures. Students a structure "
+        "already invoiced are skipped, so the command can be re-run safely."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--term', type=int, required=True, help='Term id')
+        parser.add_argument('--fee-structure', type=int, action='append', dest='fee_structures',
+                            help='Only this fee structure id (repeatable)')
+        parser.add_argument('--student-status', default='active', help="Student status to invoice ('' for any)")
+        parser.add_argument('--enrolled-only', action='store_true',
+                            help='Only students enrolled in a course in the term')
+        parser.add_argument('--issue-date', type=parse_date, help='Issue date (default: today)')
+        parser.add_argument('--due-date', type=parse_date, help='Due date (default: from the fee items)')
+        parser.add_argument('--status', default='draft', choices=['draft', 'sent'], help='Status of new invoices')
+        parser.add_argument('--chunk-size', type=int, help='Students per transaction')
+
+    def handle(self, *args, **options):
+        fee_structures = FeeStructure.objects.filter(term_id=options['term'], is_active=True).select_related(
+            'school', 'term'
+        )
+        if options['fee_structures']:
+            fee_structures = fee_structures.filter(pk__in=options['fee_structures'])
+        if not fee_structures:
+            raise CommandError(f"No active fee structures for term {options['term']}")
+
+        for fee_structure in fee_structures:
+            self.stdout.write(f'{fee_structure}:')
+            result = InvoiceGenerator(
+                fee_structure,
+                students=cohort_queryset(
+                    fee_structure, status=options['student_status'], enrolled_only=options['enrolled_only']
+                ),
+                issue_date=options['issue_date'],
+                due_date=options['due_date'],
+                status=options['status'],
+                chunk_size=options['chunk_size'],
+                progress=self.report_progress
+            ).run()
+            self.stdout.write(self.style.SUCCESS(
+                f"  {result['created']} invoice(s) with {result['items']} item(s) created, "
+                f"{result['skipped']} student(s) skipped"
+            ))
+
+    def report_progress(self, processed, total):
+        self.stdout.write(f'  {processed}/{total} students processed')
@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.finance.aging import invalidate_student_aging
+from apps.finance.models import Invoice, Payment
+
+
+def completed_payments_total():
+    """Subquery: the sum of an invoice's completed payments, 0 when there are none"""
+    total = Payment.objects.filter(invoice=OuterRef('pk'), status='completed').values('invoice').annotate(
+        total=Sum('amount')
+    ).values('total')
+    output_field = DecimalField(max_digits=10, decimal_places=2)
+    return Coalesce(Subquery(total, output_field=output_field), Value(0, output_field=output_field))
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomputes Invoice.amount_paid from completed payments and repairs invoices that drifted '
+        '(e.g. after queryset updates or manual SQL). Meant to run nightly.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report drifted invoices without fixing them')
+
+    def handle(self, *args, **options):
+        drifted = Invoice.objects.annotate(actual_paid=completed_payments_total()).exclude(
+            amount_paid=F('actual_paid')
+        ).values_list('pk', flat=True)
+
+        repaired = 0
+        for invoice_id in drifted.iterator():
+            if options['dry_run']:
+                self.stdout.write(f'Invoice {invoice_id} has drifted')
+                repaired += 1
+                continue
+            if self.repair(invoice_id):
+                repaired += 1
+
+        verb = 'drifted' if options['dry_run'] else 'repaired'
+        self.stdout.write(self.style.SUCCESS(f'{repaired} invoice(s) {verb}'))
+
+    def repair(self, invoice_id):
+        """
+        Recompute one invoice under its row lock, so payments recorded since
+        the scan are neither lost nor counted twice
+        """
+        with transaction.atomic():
+            invoice = Invoice.objects.select_for_update().filter(pk=invoice_id).annotate(
+                actual_paid=completed_payments_total()
+            ).only('student_id', 'total', 'amount_paid', 'status').first()
+            if invoice is None or invoice.amount_paid == invoice.actual_paid:
+                return False
+
+            self.stdout.write(f'Invoice {invoice_id}: amount_paid {invoice.amount_paid} -> {invoice.actual_paid}')
+            Invoice.objects.filter(pk=invoice_id).update(
+                amount_paid=invoice.actual_paid,
+                status=invoice.status_for(invoice.actual_paid),
+                updated_at=timezone.now()
+            )
+            # Queryset updates send no signals
+            invalidate_student_aging(invoice.student_id)
+            return True
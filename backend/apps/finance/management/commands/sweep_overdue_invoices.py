@@ -0,0 +1,36 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.finance.overdue import sweep_overdue_invoices
+
+
+def parse_date(value):
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"'{value}' is not a YYYY-MM-DD date")
+
+
+class Command(BaseCommand):
+    help = (
+        "Marks sent and partially paid invoices that are past due with an outstanding balance as "
+        "overdue and notifies their students. Meant to run daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--as-of', type=parse_date, help='Treat this date as today (default: today)')
+        parser.add_argument('--dry-run', action='store_true', help='Count overdue invoices without changing them')
+        parser.add_argument('--no-notify', action='store_false', dest='notify',
+                            help='Do not create notifications')
+
+    def handle(self, *args, **options):
+        sweep = sweep_overdue_invoices(as_of=options['as_of'], dry_run=options['dry_run'], notify=options['notify'])
+
+        for school_id, flagged in sweep.schools.items():
+            self.stdout.write(f'School {school_id}: {flagged} invoice(s)')
+        verb = 'would be flagged' if sweep.dry_run else 'flagged overdue'
+        self.stdout.write(self.style.SUCCESS(
+            f'{sweep.invoices_flagged} invoice(s) {verb}, {sweep.notifications_sent} notification(s) sent '
+            f'in {(sweep.finished_at - sweep.started_at).total_seconds():.2f}s'
+        ))
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.2 on 2026-10-16 23:10
+
+import django.db.models.expressions
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_amount_paid(apps, schema_editor):
+    Invoice = apps.get_model('finance', 'Invoice')
+    Payment = apps.get_model('finance', 'Payment')
+    output_field = models.DecimalField(max_digits=10, decimal_places=2)
+    paid = Payment.objects.filter(invoice=OuterRef('pk'), status='completed').values('invoice').annotate(
+        total=Sum('amount')
+    ).values('total')
+    Invoice.objects.update(
+        amount_paid=Coalesce(Subquery(paid, output_field=output_field), Value(0, output_field=output_field))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='invoice',
+            name='amount_paid',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=10, verbose_name='Amount Paid'),
+        ),
+        migrations.RunPython(backfill_amount_paid, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='invoice',
+            name='balance',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(models.F('total'), '-', models.F('amount_paid')), output_field=models.DecimalField(decimal_places=2, max_digits=10), verbose_name='Balance'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(condition=models.Q(('balance__gt', 0)), fields=['due_date'], name='invoice_outstanding_idx'),
+        ),
+    ]
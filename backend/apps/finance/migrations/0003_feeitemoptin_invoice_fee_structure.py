@@ -0,0 +1,63 @@
+# Generated by Django 5.0.2 on 2026-10-16 23:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('finance', '0002_invoice_amount_paid_balance'),
+        ('students', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeeItemOptIn',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+            ],
+            options={
+                'verbose_name': 'Fee Item Opt-In',
+                'verbose_name_plural': 'Fee Item Opt-Ins',
+            },
+        ),
+        migrations.AddField(
+            model_name='invoice',
+            name='fee_structure',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='invoices', to='finance.feestructure'),
+        ),
+        migrations.AddConstraint(
+            model_name='invoice',
+            constraint=models.UniqueConstraint(condition=models.Q(('fee_structure__isnull', False)), fields=('student', 'fee_structure'), name='invoice_unique_student_fee_structure'),
+        ),
+        migrations.AddField(
+            model_name='feeitemoptin',
+            name='created_by',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_created', to=settings.AUTH_USER_MODEL, verbose_name='Created By'),
+        ),
+        migrations.AddField(
+            model_name='feeitemoptin',
+            name='fee_item',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='opt_ins', to='finance.feeitem'),
+        ),
+        migrations.AddField(
+            model_name='feeitemoptin',
+            name='student',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='fee_opt_ins', to='students.student'),
+        ),
+        migrations.AddField(
+            model_name='feeitemoptin',
+            name='updated_by',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='%(class)s_updated', to=settings.AUTH_USER_MODEL, verbose_name='Updated By'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='feeitemoptin',
+            unique_together={('student', 'fee_item')},
+        ),
+    ]
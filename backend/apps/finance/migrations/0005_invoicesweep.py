@@ -0,0 +1,36 @@
+# Generated by Django 5.0.2 on 2026-10-16 23:16
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0004_numbersequence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InvoiceSweep',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('as_of', models.DateField(verbose_name='As Of')),
+                ('dry_run', models.BooleanField(default=False, verbose_name='Dry Run')),
+                ('started_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Started At')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finished At')),
+                ('invoices_flagged', models.PositiveIntegerField(default=0, verbose_name='Invoices Flagged')),
+                ('notifications_sent', models.PositiveIntegerField(default=0, verbose_name='Notifications Sent')),
+                ('schools', models.JSONField(blank=True, default=dict, verbose_name='Per School')),
+                ('triggered_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='invoice_sweeps', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Invoice Sweep',
+                'verbose_name_plural': 'Invoice Sweeps',
+                'ordering': ['-started_at'],
+            },
+        ),
+    ]
@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth import get_user_model
 from apps.core.models import TimeStampedModel, School, Term
@@ -7,6 +9,22 @@ from apps.students.models import Student
 User = get_user_model()
 
 
+class NumberSequence(models.Model):
+    """
+    Model holding the last number handed out for each document number
+    prefix (e.g. ``INV-TS001-2025``); see apps.finance.numbering
+    """
+    key = models.CharField(_('Key'), max_length=100, unique=True)
+    last_value = models.BigIntegerField(_('Last Value'), default=0)
+    
+    class Meta:
+        verbose_name = _('Number Sequence')
+        verbose_name_plural = _('Number Sequences')
+    
+    def __str__(self):
+        return f"{self.key}: {self.last_value}"
+
+
 class FeeStructure(TimeStampedModel):
     """
     Model representing fee structures for different courses or programs
@@ -60,6 +78,22 @@ class FeeItem(TimeStampedModel):
         return f"{self.name} ({self.amount})"
 
 
+class FeeItemOptIn(TimeStampedModel):
+    """
+    Model recording that a student takes an optional fee item (transport, boarding...)
+    """
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='fee_opt_ins')
+    fee_item = models.ForeignKey(FeeItem, on_delete=models.CASCADE, related_name='opt_ins')
+    
+    class Meta:
+        verbose_name = _('Fee Item Opt-In')
+        verbose_name_plural = _('Fee Item Opt-Ins')
+        unique_together = ('student', 'fee_item')
+    
+    def __str__(self):
+        return f"{self.student.student_id} - {self.fee_item.name}"
+
+
 class Invoice(TimeStampedModel):
     """
     Model representing invoices issued to students
@@ -73,9 +107,26 @@ class Invoice(TimeStampedModel):
         ('cancelled', _('Cancelled')),
     )
     
+    # Allowed status changes; payments, refunds and the overdue sweep stay within them
+    STATUS_TRANSITIONS = {
+        'draft': {'sent', 'partially_paid', 'paid', 'cancelled'},
+        'sent': {'partially_paid', 'paid', 'overdue', 'cancelled'},
+        'partially_paid': {'sent', 'paid', 'overdue', 'cancelled'},
+        'overdue': {'sent', 'partially_paid', 'paid', 'cancelled'},
+        'paid': {'sent', 'partially_paid', 'overdue'},
+        'cancelled': {'draft'},
+    }
+    
+    # Statuses the overdue sweep moves to 'overdue' once past due with a balance
+    OVERDUE_FROM = ('sent', 'partially_paid')
+    
     student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='invoices')
     term = models.ForeignKey(Term, on_delete=models.CASCADE, related_name='invoices')
-    invoice_number = models.CharField(_('Invoice Number'), max_length=50, unique=True)
+    # Set on invoices generated from a fee structure, at most one per student
+    fee_structure = models.ForeignKey(FeeStructure, on_delete=models.SET_NULL, null=True, blank=True,
+                                      related_name='invoices')
+    # Allocated by apps.finance.numbering when left blank
+    invoice_number = models.CharField(_('Invoice Number'), max_length=50, unique=True, blank=True)
     issue_date = models.DateField(_('Issue Date'))
     due_date = models.DateField(_('Due Date'))
     
@@ -84,6 +135,16 @@ class Invoice(TimeStampedModel):
     tax = models.DecimalField(_('Tax'), max_digits=10, decimal_places=2, default=0.00)
     total = models.DecimalField(_('Total'), max_digits=10, decimal_places=2)
     
+    # Sum of completed payments, maintained by Invoice.record_payment()
+    amount_paid = models.DecimalField(_('Amount Paid'), max_digits=10, decimal_places=2, default=0,
+                                      editable=False)
+    balance = models.GeneratedField(
+        expression=F('total') - F('amount_paid'),
+        output_field=models.DecimalField(max_digits=10, decimal_places=2),
+        db_persist=True,
+        verbose_name=_('Balance')
+    )
+    
     status = models.CharField(_('Status'), max_length=20, choices=INVOICE_STATUS_CHOICES, default='draft')
     notes = models.TextField(_('Notes'), blank=True)
     
@@ -91,6 +152,16 @@ class Invoice(TimeStampedModel):
         verbose_name = _('Invoice')
         verbose_name_plural = _('Invoices')
         ordering = ['-issue_date', '-id']
+        indexes = [
+            # Outstanding invoices ("balance > 0"), by due date for collections and aging
+            models.Index(fields=['due_date'], name='invoice_outstanding_idx', condition=Q(balance__gt=0)),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['student', 'fee_structure'], name='invoice_unique_student_fee_structure',
+                condition=Q(fee_structure__isnull=False)
+            ),
+        ]
     
     def __str__(self):
         return f"Invoice #{self.invoice_number} - {self.student.user.get_full_name()}"
@@ -99,7 +170,76 @@ class Invoice(TimeStampedModel):
         # Calculate the total if not provided
         if not self.total:
             self.total = self.subtotal - self.discount + self.tax
+        if not self.invoice_number:
+            from .numbering import next_invoice_number
+            self.invoice_number = next_invoice_number(
+                Student.objects.filter(pk=self.student_id).values_list('school__code', flat=True).get(),
+                self.issue_date
+            )
+        # amount_paid only moves through record_payment(), which also sets the
+        # status; a full save of an instance loaded before a payment must not
+        # write either back unless the status was deliberately changed
+        if not self._state.adding and self.pk is not None and kwargs.get('update_fields') is None:
+            skipped = {'amount_paid'}
+            if self.status == getattr(self, '_loaded_status', None):
+                skipped.add('status')
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and not field.generated
+                and field.name not in skipped and field.attname not in deferred
+            ]
         super().save(*args, **kwargs)
+        self._loaded_status = self.__dict__.get('status')
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The status as read, so save() can tell whether it was changed
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+    
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._loaded_status = self.__dict__.get('status')
+    
+    def status_for(self, amount_paid):
+        """
+        Return the status this invoice should have once `amount_paid` has been received
+        """
+        if self.status == 'cancelled':
+            return self.status
+        if amount_paid > 0 and amount_paid >= self.total:
+            return 'paid'
+        if self.status == 'overdue':
+            # Still outstanding past the due date
+            return self.status
+        if amount_paid > 0:
+            return 'partially_paid'
+        if self.status in ('paid', 'partially_paid'):
+            # No completed payments left, revert to sent status
+            return 'sent'
+        return self.status
+    
+    def can_transition_to(self, status):
+        return status == self.status or status in self.STATUS_TRANSITIONS.get(self.status, ())
+    
+    @classmethod
+    def record_payment(cls, invoice_id, amount):
+        """
+        Add `amount` (negative for refunds and removals) to an invoice's
+        amount_paid and update its status. The invoice row is locked, so
+        concurrent payments against it are applied one after another.
+        """
+        if not amount:
+            return
+        with transaction.atomic():
+            invoice = cls.objects.select_for_update().only('total', 'amount_paid', 'status').get(pk=invoice_id)
+            cls.objects.filter(pk=invoice_id).update(
+                amount_paid=F('amount_paid') + amount,
+                status=invoice.status_for(invoice.amount_paid + amount),
+                updated_at=timezone.now()
+            )
 
 
 class InvoiceItem(TimeStampedModel):
@@ -168,6 +308,72 @@ class Payment(TimeStampedModel):
     
     def __str__(self):
         return f"Payment {self.receipt_number} - {self.amount} ({self.get_payment_method_display()})"
+    
+    @staticmethod
+    def paid_amount(amount, status):
+        """The part of a payment that counts towards its invoice's amount_paid"""
+        return amount if status == 'completed' else 0
+    
+    def save(self, *args, **kwargs):
+        if self._state.adding and not self.receipt_number:
+            from .numbering import next_receipt_number
+            self.receipt_number = next_receipt_number(
+                Invoice.objects.filter(pk=self.invoice_id).values_list('student__school__code', flat=True).get(),
+                self.payment_date
+            )
+        
+        # Keep Invoice.amount_paid in step: undo what the stored row counted, then add what this one counts
+        with transaction.atomic():
+            previous = None
+            if not self._state.adding and self.pk is not None:
+                previous = Payment.objects.select_for_update().filter(pk=self.pk).values_list(
+                    'invoice_id', 'amount', 'status'
+                ).first()
+            super().save(*args, **kwargs)
+            
+            paid = self.paid_amount(self.amount, self.status)
+            if previous is not None:
+                invoice_id, amount, status = previous
+                if invoice_id == self.invoice_id:
+                    paid -= self.paid_amount(amount, status)
+                else:
+                    Invoice.record_payment(invoice_id, -self.paid_amount(amount, status))
+            Invoice.record_payment(self.invoice_id, paid)
+    
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            previous = Payment.objects.select_for_update().filter(pk=self.pk).values_list(
+                'invoice_id', 'amount', 'status'
+            ).first()
+            result = super().delete(*args, **kwargs)
+            if previous is not None:
+                invoice_id, amount, status = previous
+                Invoice.record_payment(invoice_id, -self.paid_amount(amount, status))
+        return result
+
+
+class InvoiceSweep(models.Model):
+    """
+    Model recording each run of the overdue invoice sweep
+    """
+    as_of = models.DateField(_('As Of'))
+    dry_run = models.BooleanField(_('Dry Run'), default=False)
+    started_at = models.DateTimeField(_('Started At'), default=timezone.now)
+    finished_at = models.DateTimeField(_('Finished At'), null=True, blank=True)
+    invoices_flagged = models.PositiveIntegerField(_('Invoices Flagged'), default=0)
+    notifications_sent = models.PositiveIntegerField(_('Notifications Sent'), default=0)
+    # {school id: invoices flagged}
+    schools = models.JSONField(_('Per School'), default=dict, blank=True)
+    triggered_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True,
+                                     related_name='invoice_sweeps')
+    
+    class Meta:
+        verbose_name = _('Invoice Sweep')
+        verbose_name_plural = _('Invoice Sweeps')
+        ordering = ['-started_at']
+    
+    def __str__(self):
+        return f"Overdue sweep {self.as_of} ({self.invoices_flagged} flagged{', dry run' if self.dry_run else ''})"
 
 
 class Expense(TimeStampedModel):
@@ -0,0 +1,109 @@
+"""
+Invoice and receipt number allocation.
+
+Numbers look like ``INV-<school code>-<year>-000123`` and
+``RCT-<school code>-<year>-000123``. Each prefix has its own counter in
+NumberSequence. Reserving any count of numbers costs one
+``INSERT ... ON CONFLICT DO UPDATE ... RETURNING`` round trip, which also
+creates the counter the first time a prefix is used.
+
+In autocommit mode, each worker process reserves NUMBER_BLOCK_SIZE
+numbers at a time and hands them out from memory. Most single invoices
+and receipts then never touch the counter row, and concurrent workers
+do not queue on its lock. Inside a transaction, numbers are reserved
+exactly as requested and are never cached: a rollback also rolls back
+the reservation, and cached numbers could then be handed out twice.
+
+Numbers are unique but not gapless. Numbers a worker reserved but did not
+use, or that belonged to a rolled back invoice, are skipped.
+"""
+import threading
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+
+from .models import NumberSequence
+
+NUMBER_WIDTH = 6
+INVOICE_PREFIX = 'INV'
+RECEIPT_PREFIX = 'RCT'
+
+
+def sequence_key(prefix, school_code, date):
+    return f"{prefix}-{school_code}-{date.year}"
+
+
+def format_number(key, value):
+    return f"{key}-{value:0{NUMBER_WIDTH}d}"
+
+
+def reserve(key, count):
+    """
+    Advance the `key` counter by `count` and return the first reserved value
+    """
+    if connection.vendor in ('postgresql', 'sqlite'):
+        table, key_column, value_column = (
+            connection.ops.quote_name(name) for name in (NumberSequence._meta.db_table, 'key', 'last_value')
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} ({key_column}, {value_column}) VALUES (%s, %s) "
+                f"ON CONFLICT ({key_column}) DO UPDATE "
+                f"SET {value_column} = {table}.{value_column} + EXCLUDED.{value_column} "
+                f"RETURNING {value_column}",
+                [key, count]
+            )
+            last_value = cursor.fetchone()[0]
+    else:
+        with transaction.atomic():
+            NumberSequence.objects.get_or_create(key=key)
+            NumberSequence.objects.filter(key=key).update(last_value=F('last_value') + count)
+            last_value = NumberSequence.objects.filter(key=key).values_list('last_value', flat=True).get()
+    return last_value - count + 1
+
+
+class NumberAllocator:
+    """
+    Hands out numbers per key from blocks reserved in NumberSequence
+    """
+
+    def __init__(self):
+        self._blocks = {}
+        self._lock = threading.Lock()
+
+    def allocate(self, key, count=1):
+        """Return `count` unique numbers for `key`, in increasing order"""
+        block_size = getattr(settings, 'NUMBER_BLOCK_SIZE', 20)
+        if count >= block_size or connection.in_atomic_block:
+            start = reserve(key, count)
+            return [format_number(key, value) for value in range(start, start + count)]
+
+        with self._lock:
+            start, end = self._blocks.get(key, (0, 0))
+            if end - start < count:
+                # The rest of the old block is dropped; numbers may have gaps
+                start = reserve(key, block_size)
+                end = start + block_size
+            self._blocks[key] = (start + count, end)
+        return [format_number(key, value) for value in range(start, start + count)]
+
+    def reset(self):
+        """Forget cached blocks (tests, or after renumbering a sequence)"""
+        with self._lock:
+            self._blocks.clear()
+
+
+allocator = NumberAllocator()
+
+
+def allocate_invoice_numbers(school_code, issue_date, count):
+    return allocator.allocate(sequence_key(INVOICE_PREFIX, school_code, issue_date), count)
+
+
+def next_invoice_number(school_code, issue_date):
+    return allocate_invoice_numbers(school_code, issue_date, 1)[0]
+
+
+def next_receipt_number(school_code, payment_date):
+    return allocator.allocate(sequence_key(RECEIPT_PREFIX, school_code, payment_date), 1)[0]
@@ -0,0 +1,84 @@
+"""
+Overdue invoice sweep.
+
+`sweep_overdue_invoices` moves every ``sent`` or ``partially_paid`` invoice
+with ``due_date < as_of`` and ``balance > 0`` to ``overdue``. It issues one
+set-based UPDATE per school, served by the partial ``balance > 0``
+due-date index, and never loads the invoices into Python. The rows that
+UPDATE flipped are the ones it stamped with the sweep's ``updated_at``.
+The same transaction reads them back to bulk_create one Notification per
+invoice. Every run, dry runs included, is recorded as an InvoiceSweep.
+"""
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.models import Notification, School
+
+from .models import Invoice, InvoiceSweep
+
+
+def overdue_candidates(as_of, school_id=None):
+    invoices = Invoice.objects.filter(status__in=Invoice.OVERDUE_FROM, due_date__lt=as_of, balance__gt=0)
+    if school_id is not None:
+        invoices = invoices.filter(student__school_id=school_id)
+    return invoices
+
+
+def overdue_notification(invoice_id, invoice_number, due_date, balance, user_id):
+    return Notification(
+        user_id=user_id,
+        title=f"Invoice {invoice_number} is overdue",
+        message=f"Invoice {invoice_number} was due on {due_date.isoformat()}. {balance} remains outstanding.",
+        link=f"/finance/invoices/{invoice_id}",
+        notification_type='warning'
+    )
+
+
+def sweep_school(school_id, as_of, notify=True):
+    """
+    Flag one school's overdue invoices; returns (invoices flagged, notifications sent)
+    """
+    batch_size = getattr(settings, 'OVERDUE_NOTIFICATION_BATCH_SIZE', 1000)
+    with transaction.atomic():
+        swept_at = timezone.now()
+        flagged = overdue_candidates(as_of, school_id).update(status='overdue', updated_at=swept_at)
+        if not flagged or not notify:
+            return flagged, 0
+
+        # The updated rows stay locked until commit, so the stamp identifies exactly them
+        rows = Invoice.objects.filter(
+            student__school_id=school_id, status='overdue', updated_at=swept_at
+        ).values_list('id', 'invoice_number', 'due_date', 'balance', 'student__user_id')
+
+        sent = 0
+        batch = []
+        for row in rows.iterator(chunk_size=batch_size):
+            batch.append(overdue_notification(*row))
+            if len(batch) >= batch_size:
+                sent += len(Notification.objects.bulk_create(batch))
+                batch = []
+        if batch:
+            sent += len(Notification.objects.bulk_create(batch))
+    return flagged, sent
+
+
+def sweep_overdue_invoices(as_of=None, dry_run=False, notify=True, user=None):
+    """
+    Run the overdue sweep for every school and return its InvoiceSweep record
+    """
+    sweep = InvoiceSweep.objects.create(as_of=as_of or timezone.localdate(), dry_run=dry_run, triggered_by=user)
+
+    for school_id in School.objects.order_by('pk').values_list('pk', flat=True):
+        if dry_run:
+            flagged, sent = overdue_candidates(sweep.as_of, school_id).count(), 0
+        else:
+            flagged, sent = sweep_school(school_id, sweep.as_of, notify=notify)
+        if flagged:
+            sweep.schools[str(school_id)] = flagged
+        sweep.invoices_flagged += flagged
+        sweep.notifications_sent += sent
+
+    sweep.finished_at = timezone.now()
+    sweep.save()
+    return sweep
@@ -2,8 +2,10 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.db import transaction
 from django.utils import timezone
-from apps.core.serializers import UserMinimalSerializer
+from apps.core.serializers import TermSerializer, UserMinimalSerializer
+from apps.students.models import Student
 from apps.students.serializers import StudentSerializer
+from .aging import GROUPINGS
 from .models import (
     FeeStructure,
     FeeItem,
@@ -56,6 +58,20 @@ class FeeStructureDetailSerializer(FeeStructureSerializer):
         pass
 
 
+class InvoiceGenerationSerializer(serializers.Serializer):
+    """
+    Serializer for the options of FeeStructureViewSet.generate_invoices
+    """
+    students = serializers.ListField(child=serializers.IntegerField(), required=False,
+                                     help_text='Only invoice these student ids')
+    student_status = serializers.ChoiceField(choices=Student.STATUS_CHOICES, default='active')
+    enrolled_only = serializers.BooleanField(default=False,
+                                             help_text="Only invoice students enrolled in a course in the term")
+    issue_date = serializers.DateField(required=False)
+    due_date = serializers.DateField(required=False)
+    status = serializers.ChoiceField(choices=(('draft', 'Draft'), ('sent', 'Sent')), default='draft')
+
+
 class InvoiceItemSerializer(serializers.ModelSerializer):
     """
     Serializer for the InvoiceItem model
@@ -96,11 +112,20 @@ class InvoiceSerializer(serializers.ModelSerializer):
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     items = InvoiceItemSerializer(many=True, read_only=True)
     payments = PaymentSerializer(many=True, read_only=True)
+    balance = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
     
     class Meta:
         model = Invoice
         fields = '__all__'
         read_only_fields = ('created_at', 'updated_at', 'created_by', 'updated_by')
+        expandable_fields = {'term': TermSerializer}
+    
+    def validate_status(self, value):
+        if self.instance is not None and not self.instance.can_transition_to(value):
+            raise serializers.ValidationError(
+                f"An invoice cannot move from '{self.instance.status}' to '{value}'."
+            )
+        return value
 
 
 class InvoiceCreateSerializer(serializers.ModelSerializer):
@@ -108,6 +133,7 @@ class InvoiceCreateSerializer(serializers.ModelSerializer):
     Serializer for creating an invoice with its items
     """
     items = InvoiceItemSerializer(many=True)
+    balance = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
     
     class Meta:
         model = Invoice
@@ -207,4 +233,15 @@ class BudgetCreateSerializer(serializers.ModelSerializer):
         for item_data in items_data:
             BudgetItem.objects.create(budget=budget, **item_data)
         
-        return budget
\ No newline at end of file
+        return budget
+
+
+class ARAgingQuerySerializer(serializers.Serializer):
+    """
+    Serializer for the query parameters of ARAgingView
+    """
+    as_of = serializers.DateField(required=False, help_text='Aging date (default: today)')
+    group_by = serializers.ChoiceField(choices=GROUPINGS, default='school')
+    school = serializers.IntegerField(required=False)
+    term = serializers.IntegerField(required=False)
+    student = serializers.IntegerField(required=False)
@@ -0,0 +1,27 @@
+"""
+Signal handlers for the finance app
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .aging import invalidate_student_aging
+from .models import Invoice, Payment
+
+
+@receiver(post_save, sender=Invoice)
+@receiver(post_delete, sender=Invoice)
+def invalidate_invoice_aging(sender, instance, **kwargs):
+    """
+    Invoice totals, due dates and statuses all move the aging buckets
+    """
+    invalidate_student_aging(instance.student_id)
+
+
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+def invalidate_payment_aging(sender, instance, **kwargs):
+    """
+    Payments change the balance of their invoice
+    """
+    student_id = Invoice.objects.filter(pk=instance.invoice_id).values_list('student_id', flat=True).first()
+    invalidate_student_aging(student_id)
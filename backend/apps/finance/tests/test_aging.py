@@ -0,0 +1,199 @@
+import datetime
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.core.cache import REPORTS, get_cache
+from apps.core.models import School, SchoolYear, Term
+from apps.finance.aging import aging_queryset, bucket_for
+from apps.finance.models import FeeItem, FeeStructure, Invoice, InvoiceItem, Payment
+
+User = get_user_model()
+
+
+class ARAgingTest(TestCase):
+    """
+    Test case for the accounts-receivable aging report
+    """
+
+    def setUp(self):
+        get_cache(REPORTS).clear()
+        self.client = APIClient()
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='admin123',
+            user_type='admin'
+        )
+        self.client.force_authenticate(user=self.admin_user)
+        self.school = School.objects.create(
+            name='Test School',
+            code='TS001',
+            address='123 Test Street',
+            city='Test City',
+            state='Test State',
+            country='Test Country',
+            postal_code='12345',
+            phone='123-456-7890',
+            email='school@example.com'
+        )
+        self.today = datetime.date.today()
+        school_year = SchoolYear.objects.create(
+            school=self.school,
+            name='2024-2025',
+            start_date=self.today - datetime.timedelta(days=200),
+            end_date=self.today + datetime.timedelta(days=200)
+        )
+        self.term = Term.objects.create(
+            school_year=school_year,
+            name='Fall Semester',
+            term_type='semester',
+            start_date=self.today - datetime.timedelta(days=200),
+            end_date=self.today + datetime.timedelta(days=60)
+        )
+        fee_structure = FeeStructure.objects.create(name='Day scholars', school=self.school, term=self.term)
+        tuition = FeeItem.objects.create(
+            fee_structure=fee_structure, name='Tuition', fee_type='tuition', amount=Decimal('75.00')
+        )
+        library = FeeItem.objects.create(
+            fee_structure=fee_structure, name='Library', fee_type='library', amount=Decimal('25.00')
+        )
+
+        # Days past due -> invoice status
+        cases = [(-5, 'sent'), (10, 'sent'), (45, 'overdue'), (75, 'overdue'), (120, 'overdue'), (10, 'draft')]
+        self.invoices = []
+        for index, (days_past_due, status) in enumerate(cases):
+            user = User.objects.create_user(
+                username=f'student{index}', email=f'student{index}@example.com', password='student123'
+            )
+            invoice = Invoice.objects.create(
+                student=user.student_profile,
+                term=self.term,
+                issue_date=self.today - datetime.timedelta(days=150),
+                due_date=self.today - datetime.timedelta(days=days_past_due),
+                subtotal=Decimal('100.00'),
+                total=Decimal('100.00'),
+                status=status
+            )
+            for fee_item in (tuition, library):
+                InvoiceItem.objects.create(
+                    invoice=invoice, fee_item=fee_item, description=fee_item.name,
+                    quantity=1, unit_price=fee_item.amount, subtotal=fee_item.amount
+                )
+            self.invoices.append(invoice)
+
+        # Half of the 31-60 invoice is paid
+        Payment.objects.create(
+            invoice=self.invoices[2],
+            amount=Decimal('50.00'),
+            payment_date=self.today,
+            payment_method='cash',
+            status='completed'
+        )
+        self.url = reverse('ar-aging')
+
+    def test_bucket_boundaries(self):
+        """
+        Test that due dates land in the expected bucket
+        """
+        for days_past_due, bucket in ((-1, 'current'), (0, 'days_0_30'), (30, 'days_0_30'), (31, 'days_31_60'),
+                                      (60, 'days_31_60'), (61, 'days_61_90'), (90, 'days_61_90'),
+                                      (91, 'days_90_plus')):
+            self.assertEqual(bucket_for(self.today - datetime.timedelta(days=days_past_due), self.today), bucket)
+
+    def test_school_report(self):
+        """
+        Test the buckets of the school report; drafts are left out
+        """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        row, = response.data['results']
+        self.assertEqual(row['student__school_id'], self.school.pk)
+        self.assertEqual(row['current'], Decimal('100.00'))
+        self.assertEqual(row['days_0_30'], Decimal('100.00'))
+        self.assertEqual(row['days_31_60'], Decimal('50.00'))
+        self.assertEqual(row['days_61_90'], Decimal('100.00'))
+        self.assertEqual(row['days_90_plus'], Decimal('100.00'))
+        self.assertEqual(row['total'], Decimal('450.00'))
+        self.assertEqual(response.data['totals']['total'], Decimal('450.00'))
+
+    def test_report_is_one_query(self):
+        """
+        Test that a grouped report computes every bucket in a single query
+        """
+        with self.assertNumQueries(1):
+            rows = list(aging_queryset('term', self.today))
+        self.assertEqual(rows[0]['total'], Decimal('450.00'))
+
+    def test_as_of_date(self):
+        """
+        Test that invoices issued after the as-of date are left out and the rest re-aged
+        """
+        as_of = self.today - datetime.timedelta(days=149)
+        Invoice.objects.filter(pk=self.invoices[0].pk).update(issue_date=self.today)
+        response = self.client.get(self.url, {'as_of': as_of.isoformat()})
+        totals = response.data['totals']
+        self.assertEqual(totals['current'], Decimal('350.00'))
+        self.assertEqual(totals['total'], Decimal('350.00'))
+
+    def test_fee_type_report(self):
+        """
+        Test that invoice balances are split across fee types by item subtotal
+        """
+        response = self.client.get(self.url, {'group_by': 'fee_type'})
+        rows = {row['fee_type']: row for row in response.data['results']}
+        self.assertEqual(rows['tuition']['total'], Decimal('337.50'))
+        self.assertEqual(rows['library']['total'], Decimal('112.50'))
+        self.assertEqual(rows['tuition']['days_31_60'], Decimal('37.50'))
+
+    def test_student_drill_down_pages(self):
+        """
+        Test that the student drill-down is keyset paginated
+        """
+        response = self.client.get(self.url, {'group_by': 'student', 'page_size': 2})
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(response.data['totals']['total'], Decimal('450.00'))
+        seen = [row['id'] for row in response.data['results']]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            seen.extend(row['id'] for row in response.data['results'])
+        expected = [invoice.student_id for invoice in self.invoices if invoice.status != 'draft']
+        self.assertEqual(seen, expected)
+
+    def test_invoice_drill_down(self):
+        """
+        Test the invoice drill-down rows of one student
+        """
+        response = self.client.get(self.url, {'group_by': 'invoice', 'student': self.invoices[2].student_id})
+        row, = response.data['results']
+        self.assertEqual(row['bucket'], 'days_31_60')
+        self.assertEqual(row['balance'], Decimal('50.00'))
+
+    def test_payment_invalidates_cached_report(self):
+        """
+        Test that a payment orphans the cached report of its school
+        """
+        params = {'school': self.school.pk}
+        self.assertEqual(self.client.get(self.url, params).data['totals']['total'], Decimal('450.00'))
+        with self.assertNumQueries(0):
+            self.client.get(self.url, params)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Payment.objects.create(
+                invoice=self.invoices[4],
+                amount=Decimal('100.00'),
+                payment_date=self.today,
+                payment_method='cash',
+                status='completed'
+            )
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.data['totals']['total'], Decimal('350.00'))
+        self.assertEqual(response.data['totals']['days_90_plus'], Decimal('0.00'))
+
+    def test_requires_admin(self):
+        """
+        Test that students cannot read the report
+        """
+        self.client.force_authenticate(user=self.invoices[0].student.user)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
@@ -0,0 +1,173 @@
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.core.models import School, SchoolYear, Term
+from apps.finance.models import Invoice, Payment
+from apps.finance.serializers import InvoiceSerializer
+
+User = get_user_model()
+
+
+class InvoiceBalanceTest(TestCase):
+    """
+    Test case for the denormalized Invoice.amount_paid/balance
+    """
+
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='admin123',
+            user_type='admin'
+        )
+        school = School.objects.create(
+            name='Test School',
+            code='TS001',
+            address='123 Test Street',
+            city='Test City',
+            state='Test State',
+            country='Test Country',
+            postal_code='12345',
+            phone='123-456-7890',
+            email='school@example.com'
+        )
+        self.today = timezone.now().date()
+        school_year = SchoolYear.objects.create(
+            school=school,
+            name='2024-2025',
+            start_date=self.today,
+            end_date=self.today + timezone.timedelta(days=365)
+        )
+        term = Term.objects.create(
+            school_year=school_year,
+            name='Fall Semester',
+            term_type='semester',
+            start_date=self.today,
+            end_date=self.today + timezone.timedelta(days=120)
+        )
+        student_user = User.objects.create_user(
+            username='student',
+            email='student@example.com',
+            password='student123'
+        )
+        self.invoice = Invoice.objects.create(
+            student=student_user.student_profile,
+            term=term,
+            invoice_number='INV-00001',
+            issue_date=self.today,
+            due_date=self.today + timezone.timedelta(days=30),
+            subtotal=Decimal('100.00'),
+            total=Decimal('100.00'),
+            status='sent'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin_user)
+
+    def pay(self, amount, status='completed'):
+        return Payment.objects.create(
+            invoice=self.invoice,
+            amount=Decimal(amount),
+            payment_date=self.today,
+            payment_method='cash',
+            status=status
+        )
+
+    def assertPaid(self, amount_paid, balance, status):
+        invoice = Invoice.objects.get(pk=self.invoice.pk)
+        self.assertEqual(invoice.amount_paid, Decimal(amount_paid))
+        self.assertEqual(invoice.balance, Decimal(balance))
+        self.assertEqual(invoice.status, status)
+
+    def test_completed_payments_roll_up(self):
+        self.pay('40.00')
+        self.assertPaid('40.00', '60.00', 'partially_paid')
+
+        self.pay('60.00')
+        self.assertPaid('100.00', '0.00', 'paid')
+
+    def test_pending_failed_and_refunded_payments(self):
+        payment = self.pay('100.00', status='pending')
+        self.assertPaid('0.00', '100.00', 'sent')
+
+        payment.status = 'completed'
+        payment.save()
+        self.assertPaid('100.00', '0.00', 'paid')
+
+        payment.status = 'refunded'
+        payment.save()
+        self.assertPaid('0.00', '100.00', 'sent')
+
+        self.pay('30.00', status='failed')
+        self.assertPaid('0.00', '100.00', 'sent')
+
+    def test_amount_change_and_delete(self):
+        payment = self.pay('40.00')
+        payment.amount = Decimal('25.00')
+        payment.save()
+        self.assertPaid('25.00', '75.00', 'partially_paid')
+
+        payment.delete()
+        self.assertPaid('0.00', '100.00', 'sent')
+
+    def test_stale_invoice_save_keeps_amount_paid(self):
+        stale = Invoice.objects.get(pk=self.invoice.pk)
+        self.pay('40.00')
+
+        stale.notes = 'Edited'
+        stale.save()
+        self.assertPaid('40.00', '60.00', 'partially_paid')
+        self.assertEqual(Invoice.objects.get(pk=self.invoice.pk).notes, 'Edited')
+
+    def test_stale_invoice_patch_keeps_payment_status(self):
+        stale = Invoice.objects.get(pk=self.invoice.pk)
+        self.pay('100.00')
+
+        serializer = InvoiceSerializer(stale, data={'notes': 'Edited'}, partial=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        self.assertPaid('100.00', '0.00', 'paid')
+
+    def test_changed_status_is_saved(self):
+        invoice = Invoice.objects.get(pk=self.invoice.pk)
+        invoice.status = 'cancelled'
+        invoice.save()
+
+        self.assertEqual(Invoice.objects.get(pk=self.invoice.pk).status, 'cancelled')
+
+    def test_add_payment_action(self):
+        response = self.client.post(reverse('invoice-add-payment', args=[self.invoice.pk]), {
+            'invoice': self.invoice.pk,
+            'amount': '100.00',
+            'payment_date': self.today.isoformat(),
+            'payment_method': 'cash',
+            'status': 'completed'
+        })
+
+        self.assertEqual(response.status_code, 201)
+        self.assertPaid('100.00', '0.00', 'paid')
+
+    def test_outstanding_filter(self):
+        url = reverse('invoice-list')
+        self.assertEqual(self.client.get(url, {'outstanding': 'true'}).data['count'], 1)
+
+        self.pay('100.00')
+        self.assertEqual(self.client.get(url, {'outstanding': 'true'}).data['count'], 0)
+        self.assertEqual(self.client.get(url, {'outstanding': 'false'}).data['count'], 1)
+
+    def test_reconcile_repairs_drift(self):
+        self.pay('40.00')
+        # Queryset updates bypass Payment.save()
+        Payment.objects.filter(invoice=self.invoice).update(amount=Decimal('100.00'))
+
+        out = StringIO()
+        call_command('reconcile_invoices', '--dry-run', stdout=out)
+        self.assertPaid('40.00', '60.00', 'partially_paid')
+
+        call_command('reconcile_invoices', stdout=out)
+        self.assertPaid('100.00', '0.00', 'paid')
+        self.assertIn('1 invoice(s) repaired', out.getvalue())
@@ -0,0 +1,124 @@
+import datetime
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.core.models import School, SchoolYear, Term
+from apps.finance.billing import InvoiceGenerator
+from apps.finance.models import FeeItem, FeeItemOptIn, FeeStructure, Invoice, InvoiceItem
+
+User = get_user_model()
+
+
+class InvoiceGenerationTest(TestCase):
+    """
+    Test case for bulk invoice generation from fee structures
+    """
+
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='admin123',
+            user_type='admin'
+        )
+        self.school = School.objects.create(
+            name='Test School',
+            code='TS001',
+            address='123 Test Street',
+            city='Test City',
+            state='Test State',
+            country='Test Country',
+            postal_code='12345',
+            phone='123-456-7890',
+            email='school@example.com'
+        )
+        self.today = datetime.date.today()
+        school_year = SchoolYear.objects.create(
+            school=self.school,
+            name='2024-2025',
+            start_date=self.today,
+            end_date=self.today + datetime.timedelta(days=365)
+        )
+        self.term = Term.objects.create(
+            school_year=school_year,
+            name='Fall Semester',
+            term_type='semester',
+            start_date=self.today,
+            end_date=self.today + datetime.timedelta(days=120)
+        )
+        self.fee_structure = FeeStructure.objects.create(name='Day scholars', school=self.school, term=self.term)
+        self.due_date = self.today + datetime.timedelta(days=14)
+        FeeItem.objects.create(
+            fee_structure=self.fee_structure, name='Tuition', fee_type='tuition',
+            amount=Decimal('500.00'), due_date=self.due_date
+        )
+        FeeItem.objects.create(
+            fee_structure=self.fee_structure, name='Library', fee_type='library', amount=Decimal('20.00')
+        )
+        self.transport = FeeItem.objects.create(
+            fee_structure=self.fee_structure, name='Bus', fee_type='transportation',
+            amount=Decimal('80.00'), is_optional=True
+        )
+
+        self.students = []
+        for index in range(5):
+            user = User.objects.create_user(
+                username=f'student{index}',
+                email=f'student{index}@example.com',
+                password='student123'
+            )
+            self.students.append(user.student_profile)
+        FeeItemOptIn.objects.create(student=self.students[0], fee_item=self.transport)
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin_user)
+
+    def test_generates_invoices_in_chunks(self):
+        progress = []
+        result = InvoiceGenerator(
+            self.fee_structure, chunk_size=2, progress=lambda done, total: progress.append((done, total))
+        ).run()
+
+        self.assertEqual(result['created'], 5)
+        self.assertEqual(result['items'], 11)
+        self.assertEqual(progress, [(2, 5), (4, 5), (5, 5)])
+
+        invoice = Invoice.objects.get(student=self.students[0])
+        self.assertEqual(invoice.total, Decimal('600.00'))
+        self.assertEqual(invoice.balance, Decimal('600.00'))
+        self.assertEqual(invoice.due_date, self.due_date)
+        self.assertEqual(Invoice.objects.get(student=self.students[1]).total, Decimal('520.00'))
+
+        numbers = sorted(Invoice.objects.values_list('invoice_number', flat=True))
+        self.assertEqual(len(set(numbers)), 5)
+        self.assertEqual(numbers[0], f'INV-TS001-{self.today.year}-000001')
+
+    def test_rerun_is_idempotent(self):
+        InvoiceGenerator(self.fee_structure).run()
+        result = InvoiceGenerator(self.fee_structure).run()
+
+        self.assertEqual(result['created'], 0)
+        self.assertEqual(Invoice.objects.count(), 5)
+        self.assertEqual(InvoiceItem.objects.count(), 11)
+
+    def test_generate_invoices_action(self):
+        url = reverse('feestructure-generate-invoices', args=[self.fee_structure.pk])
+
+        response = self.client.post(url, {'students': [self.students[0].pk, self.students[1].pk]}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 2)
+
+        response = self.client.post(url, {}, format='json')
+        self.assertEqual(response.data['created'], 3)
+        self.assertEqual(Invoice.objects.filter(fee_structure=self.fee_structure).count(), 5)
+
+    def test_command(self):
+        out = StringIO()
+        call_command('generate_invoices', '--term', str(self.term.pk), '--status', 'sent', stdout=out)
+
+        self.assertIn('5 invoice(s) with 11 item(s) created', out.getvalue())
+        self.assertEqual(Invoice.objects.filter(status='sent').count(), 5)
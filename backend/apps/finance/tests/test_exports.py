@@ -0,0 +1,138 @@
+import csv
+import io
+import json
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.core.models import School, SchoolYear, Term
+from apps.finance.models import Invoice, Payment
+
+User = get_user_model()
+
+
+class FinanceExportTest(TestCase):
+    """
+    Test case for the streaming CSV/NDJSON finance exports
+    """
+
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='admin123',
+            user_type='admin'
+        )
+        school = School.objects.create(
+            name='Test School',
+            code='TS001',
+            address='123 Test Street',
+            city='Test City',
+            state='Test State',
+            country='Test Country',
+            postal_code='12345',
+            phone='123-456-7890',
+            email='school@example.com'
+        )
+        today = timezone.now().date()
+        school_year = SchoolYear.objects.create(
+            school=school,
+            name='2024-2025',
+            start_date=today,
+            end_date=today + timezone.timedelta(days=365)
+        )
+        self.term = Term.objects.create(
+            school_year=school_year,
+            name='Fall Semester',
+            term_type='semester',
+            start_date=today,
+            end_date=today + timezone.timedelta(days=120)
+        )
+        other_term = Term.objects.create(
+            school_year=school_year,
+            name='Spring Semester',
+            term_type='semester',
+            start_date=today + timezone.timedelta(days=121),
+            end_date=today + timezone.timedelta(days=240)
+        )
+
+        for index in range(5):
+            user = User.objects.create_user(
+                username=f'student{index}',
+                email=f'student{index}@example.com',
+                password='student123'
+            )
+            invoice = Invoice.objects.create(
+                student=user.student_profile,
+                term=self.term if index < 4 else other_term,
+                invoice_number=f'INV-{index:05d}',
+                issue_date=today,
+                due_date=today + timezone.timedelta(days=30),
+                subtotal=Decimal('100.10'),
+                total=Decimal('100.10')
+            )
+            Payment.objects.create(
+                invoice=invoice,
+                amount=Decimal('50.05'),
+                payment_date=today,
+                payment_method='cash',
+                status='completed'
+            )
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin_user)
+
+    def test_csv_export_applies_list_filters(self):
+        response = self.client.get(reverse('invoice-export'), {'term': self.term.pk}, HTTP_ACCEPT='text/csv')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('attachment; filename="invoices-', response['Content-Disposition'])
+
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]['term'], 'Fall Semester')
+        self.assertEqual(rows[0]['total'], '100.10')
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_ndjson_export_streams_in_chunks(self):
+        response = self.client.get(reverse('payment-export'), {'export_format': 'ndjson'})
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        chunks = list(response.streaming_content)
+        # 5 rows at 2 per chunk
+        self.assertEqual(len(chunks), 3)
+
+        rows = [json.loads(line) for line in b''.join(chunks).splitlines()]
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]['amount'], '50.05')
+        self.assertIsNone(rows[0]['received_by'])
+
+    def test_csv_export_neutralises_formulas(self):
+        formula = '=HYPERLINK("http://example.com","Click")'
+        Payment.objects.update(transaction_id=formula)
+
+        response = self.client.get(reverse('payment-export'))
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[0]['transaction_id'], f"'{formula}")
+        self.assertEqual(rows[0]['amount'], '50.05')
+
+        response = self.client.get(reverse('payment-export'), {'export_format': 'ndjson'})
+        row = json.loads(b''.join(response.streaming_content).splitlines()[0])
+        self.assertEqual(row['transaction_id'], formula)
+
+    def test_students_only_export_their_own_rows(self):
+        student = User.objects.get(username='student0')
+        self.client.force_authenticate(user=student)
+
+        response = self.client.get(reverse('invoice-export'))
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+
+        self.assertEqual([row['invoice_number'] for row in rows], ['INV-00000'])
+
+    def test_unknown_format_is_rejected(self):
+        response = self.client.get(reverse('expense-export'), {'export_format': 'xlsx'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,105 @@
+import datetime
+from decimal import Decimal
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from apps.core.models import School, SchoolYear, Term
+from apps.finance.models import Invoice, NumberSequence, Payment
+from apps.finance.numbering import allocate_invoice_numbers, allocator, next_receipt_number
+
+User = get_user_model()
+
+
+class NumberingTest(TestCase):
+    """
+    Test case for invoice and receipt number allocation
+    """
+
+    def setUp(self):
+        allocator.reset()
+        school = School.objects.create(
+            name='Test School',
+            code='TS001',
+            address='123 Test Street',
+            city='Test City',
+            state='Test State',
+            country='Test Country',
+            postal_code='12345',
+            phone='123-456-7890',
+            email='school@example.com'
+        )
+        self.today = datetime.date(2025, 9, 1)
+        school_year = SchoolYear.objects.create(
+            school=school,
+            name='2025-2026',
+            start_date=self.today,
+            end_date=self.today + datetime.timedelta(days=365)
+        )
+        self.term = Term.objects.create(
+            school_year=school_year,
+            name='Fall Semester',
+            term_type='semester',
+            start_date=self.today,
+            end_date=self.today + datetime.timedelta(days=120)
+        )
+        user = User.objects.create_user(
+            username='student',
+            email='student@example.com',
+            password='student123'
+        )
+        self.student = user.student_profile
+
+    def test_reserves_a_block_in_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            numbers = allocate_invoice_numbers('TS001', self.today, 3)
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(numbers, ['INV-TS001-2025-000001', 'INV-TS001-2025-000002', 'INV-TS001-2025-000003'])
+
+        self.assertEqual(allocate_invoice_numbers('TS001', self.today, 1), ['INV-TS001-2025-000004'])
+        # Other schools and years count separately
+        self.assertEqual(allocate_invoice_numbers('TS002', self.today, 1), ['INV-TS002-2025-000001'])
+        self.assertEqual(next_receipt_number('TS001', self.today), 'RCT-TS001-2025-000001')
+
+    def test_blank_numbers_are_allocated(self):
+        invoice = Invoice.objects.create(
+            student=self.student,
+            term=self.term,
+            issue_date=self.today,
+            due_date=self.today + datetime.timedelta(days=30),
+            subtotal=Decimal('100.00'),
+            total=Decimal('100.00')
+        )
+        payment = Payment.objects.create(
+            invoice=invoice,
+            amount=Decimal('10.00'),
+            payment_date=self.today,
+            payment_method='cash'
+        )
+
+        self.assertEqual(invoice.invoice_number, 'INV-TS001-2025-000001')
+        self.assertEqual(payment.receipt_number, 'RCT-TS001-2025-000001')
+
+
+class NumberBlockTest(TransactionTestCase):
+    """
+    Test case for the per-process number blocks used outside transactions
+    """
+
+    def setUp(self):
+        allocator.reset()
+
+    def tearDown(self):
+        allocator.reset()
+
+    @override_settings(NUMBER_BLOCK_SIZE=5)
+    def test_numbers_come_from_cached_blocks(self):
+        today = datetime.date(2025, 9, 1)
+        with CaptureQueriesContext(connection) as queries:
+            numbers = [allocate_invoice_numbers('TS001', today, 1)[0] for _ in range(7)]
+
+        # Two blocks of 5 cover 7 numbers
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(numbers[0], 'INV-TS001-2025-000001')
+        self.assertEqual(len(set(numbers)), 7)
+        self.assertEqual(NumberSequence.objects.get().last_value, 10)
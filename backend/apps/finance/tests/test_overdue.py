@@ -0,0 +1,140 @@
+import datetime
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.core.models import Notification, School, SchoolYear, Term
+from apps.finance.models import Invoice, InvoiceSweep, Payment
+from apps.finance.overdue import sweep_overdue_invoices
+
+User = get_user_model()
+
+
+class OverdueSweepTest(TestCase):
+    """
+    Test case for the overdue invoice sweep and the invoice status transitions
+    """
+
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='admin123',
+            user_type='admin'
+        )
+        school = School.objects.create(
+            name='Test School',
+            code='TS001',
+            address='123 Test Street',
+            city='Test City',
+            state='Test State',
+            country='Test Country',
+            postal_code='12345',
+            phone='123-456-7890',
+            email='school@example.com'
+        )
+        self.today = datetime.date.today()
+        school_year = SchoolYear.objects.create(
+            school=school,
+            name='2024-2025',
+            start_date=self.today - datetime.timedelta(days=60),
+            end_date=self.today + datetime.timedelta(days=300)
+        )
+        term = Term.objects.create(
+            school_year=school_year,
+            name='Fall Semester',
+            term_type='semester',
+            start_date=self.today - datetime.timedelta(days=60),
+            end_date=self.today + datetime.timedelta(days=60)
+        )
+
+        self.invoices = {}
+        cases = {
+            'past_due': ('sent', -10),
+            'partially_paid': ('sent', -10),
+            'paid': ('sent', -10),
+            'draft': ('draft', -10),
+            'not_due': ('sent', 10),
+        }
+        for name, (status, due_in) in cases.items():
+            user = User.objects.create_user(username=name, email=f'{name}@example.com', password='student123')
+            self.invoices[name] = Invoice.objects.create(
+                student=user.student_profile,
+                term=term,
+                issue_date=self.today - datetime.timedelta(days=40),
+                due_date=self.today + datetime.timedelta(days=due_in),
+                subtotal=Decimal('100.00'),
+                total=Decimal('100.00'),
+                status=status
+            )
+        for name, amount in (('partially_paid', '40.00'), ('paid', '100.00')):
+            Payment.objects.create(
+                invoice=self.invoices[name],
+                amount=Decimal(amount),
+                payment_date=self.today,
+                payment_method='cash',
+                status='completed'
+            )
+
+    def status(self, name):
+        return Invoice.objects.get(pk=self.invoices[name].pk).status
+
+    def test_sweep_flags_past_due_outstanding_invoices(self):
+        sweep = sweep_overdue_invoices()
+
+        self.assertEqual(self.status('past_due'), 'overdue')
+        self.assertEqual(self.status('partially_paid'), 'overdue')
+        self.assertEqual(self.status('paid'), 'paid')
+        self.assertEqual(self.status('draft'), 'draft')
+        self.assertEqual(self.status('not_due'), 'sent')
+
+        self.assertEqual(sweep.invoices_flagged, 2)
+        self.assertEqual(sweep.notifications_sent, 2)
+        self.assertIsNotNone(sweep.finished_at)
+        notification = Notification.objects.get(user__username='past_due')
+        self.assertIn(self.invoices['past_due'].invoice_number, notification.title)
+
+        # Already overdue invoices are not flagged or notified again
+        self.assertEqual(sweep_overdue_invoices().invoices_flagged, 0)
+        self.assertEqual(Notification.objects.count(), 2)
+
+    def test_dry_run_changes_nothing(self):
+        out = StringIO()
+        call_command('sweep_overdue_invoices', '--dry-run', stdout=out)
+
+        self.assertIn('2 invoice(s) would be flagged', out.getvalue())
+        self.assertEqual(self.status('past_due'), 'sent')
+        self.assertFalse(Notification.objects.exists())
+        self.assertTrue(InvoiceSweep.objects.get().dry_run)
+
+    def test_payments_keep_overdue_until_paid(self):
+        sweep_overdue_invoices()
+        invoice = self.invoices['partially_paid']
+
+        Payment.objects.create(
+            invoice=invoice, amount=Decimal('10.00'), payment_date=self.today, payment_method='cash',
+            status='completed'
+        )
+        self.assertEqual(self.status('partially_paid'), 'overdue')
+
+        Payment.objects.create(
+            invoice=invoice, amount=Decimal('50.00'), payment_date=self.today, payment_method='cash',
+            status='completed'
+        )
+        self.assertEqual(self.status('partially_paid'), 'paid')
+
+    def test_api_rejects_invalid_transitions(self):
+        client = APIClient()
+        client.force_authenticate(user=self.admin_user)
+        url = reverse('invoice-detail', args=[self.invoices['paid'].pk])
+
+        response = client.patch(url, {'status': 'draft'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('status', response.data)
+
+        url = reverse('invoice-detail', args=[self.invoices['draft'].pk])
+        response = client.patch(url, {'status': 'sent'}, format='json')
+        self.assertEqual(response.status_code, 200)
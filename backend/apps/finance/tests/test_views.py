@@ -0,0 +1,113 @@
+from decimal import Decimal
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from apps.core.models import School, SchoolYear, Term
+from apps.core.testing import QueryBudgetTestMixin
+from apps.finance.models import Invoice, InvoiceItem, Payment
+
+User = get_user_model()
+
+
+class InvoiceViewSetQueryTest(QueryBudgetTestMixin, TestCase):
+    """
+    Test case for the number of queries run by the invoice endpoints
+    """
+
+    def setUp(self):
+        self.school = School.objects.create(
+            name='Test School',
+            code='TS001',
+            address='123 Test Street',
+            city='Test City',
+            state='Test State',
+            country='Test Country',
+            postal_code='12345',
+            phone='123-456-7890',
+            email='school@example.com'
+        )
+        self.admin_user = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='admin123',
+            user_type='admin'
+        )
+        school_year = SchoolYear.objects.create(
+            school=self.school,
+            name='2024-2025',
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timezone.timedelta(days=365)
+        )
+        self.term = Term.objects.create(
+            school_year=school_year,
+            name='Fall Semester',
+            term_type='semester',
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timezone.timedelta(days=120)
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin_user)
+
+    def create_invoices(self, count):
+        for index in range(Invoice.objects.count(), Invoice.objects.count() + count):
+            user = User.objects.create_user(
+                username=f'student{index}',
+                email=f'student{index}@example.com',
+                password='student123'
+            )
+            invoice = Invoice.objects.create(
+                student=user.student_profile,
+                term=self.term,
+                invoice_number=f'INV-{index:05d}',
+                issue_date=timezone.now().date(),
+                due_date=timezone.now().date() + timezone.timedelta(days=30),
+                subtotal=Decimal('100.00'),
+                total=Decimal('100.00'),
+                created_by=self.admin_user,
+                updated_by=self.admin_user
+            )
+            InvoiceItem.objects.create(
+                invoice=invoice,
+                description='Tuition',
+                quantity=1,
+                unit_price=Decimal('100.00'),
+                subtotal=Decimal('100.00')
+            )
+            Payment.objects.create(
+                invoice=invoice,
+                amount=Decimal('50.00'),
+                payment_date=timezone.now().date(),
+                payment_method='cash',
+                status='completed'
+            )
+
+    def test_list_runs_constant_number_of_queries(self):
+        url = reverse('invoice-list')
+
+        self.create_invoices(2)
+        with self.assertMaxQueries(100) as small:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.create_invoices(8)
+        with self.assertMaxQueries(100) as large:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 10)
+
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+    def test_list_and_retrieve_stay_within_budget(self):
+        self.create_invoices(5)
+        invoice = Invoice.objects.first()
+
+        response = self.assertEndpointWithinBudget('get', reverse('invoice-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.assertEndpointWithinBudget(
+            'get', reverse('invoice-detail', args=[invoice.id])
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -17,5 +17,6 @@ router.register(r'budgets', views.BudgetViewSet)
 
 # URLs patterns
 urlpatterns = [
+    path('reports/ar-aging/', views.ARAgingView.as_view(), name='ar-aging'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
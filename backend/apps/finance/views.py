@@ -3,8 +3,18 @@ from django.db.models import Q, Sum, F, Count
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.db import transaction
+from rest_framework.views import APIView
 
+from apps.core.compiled import CompiledListMixin
+from apps.core.conditional import ConditionalGetMixin
+from apps.core.exports import StreamingExportMixin
+from apps.core.fieldsets import SparseFieldsetMixin
+from apps.core.instrumentation import QueryBudgetMixin
+from apps.core.optimizer import QuerySetOptimizerMixin, optimize_queryset
+from apps.core.pagination import KeysetPagination
+
+from .aging import DRILL_DOWN, aging_queryset, aging_totals, cached_report, present_row, row_totals
+from .billing import InvoiceGenerator, cohort_queryset
 from .models import (
     FeeStructure,
     FeeItem,
@@ -16,11 +26,13 @@ from .models import (
     BudgetItem
 )
 from .serializers import (
+    ARAgingQuerySerializer,
     FeeStructureSerializer,
     FeeStructureDetailSerializer,
     FeeItemSerializer,
     InvoiceSerializer,
     InvoiceCreateSerializer,
+    InvoiceGenerationSerializer,
     InvoiceItemSerializer,
     PaymentSerializer,
     ExpenseSerializer,
@@ -30,7 +42,7 @@ from .serializers import (
 )
 
 
-class FeeStructureViewSet(viewsets.ModelViewSet):
+class FeeStructureViewSet(QuerySetOptimizerMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing FeeStructure instances
     """
@@ -42,7 +54,7 @@ class FeeStructureViewSet(viewsets.ModelViewSet):
         """
         Instantiates and returns the list of permissions that this view requires.
         """
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'generate_invoices']:
             permission_classes = [permissions.IsAdminUser]
         else:
             permission_classes = [permissions.IsAuthenticated]
@@ -90,9 +102,37 @@ class FeeStructureViewSet(viewsets.ModelViewSet):
     
     def perform_update(self, serializer):
         serializer.save(updated_by=self.request.user)
+    
+    @action(detail=True, methods=['post'])
+    def generate_invoices(self, request, pk=None):
+        """
+        Generate invoices for a cohort of the fee structure's students; students
+        it already invoiced are skipped, so the call can be repeated
+        """
+        fee_structure = self.get_object()
+        serializer = InvoiceGenerationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        options = serializer.validated_data
+        
+        students = cohort_queryset(
+            fee_structure,
+            status=options['student_status'],
+            student_ids=options.get('students'),
+            enrolled_only=options['enrolled_only']
+        )
+        result = InvoiceGenerator(
+            fee_structure,
+            students=students,
+            issue_date=options.get('issue_date'),
+            due_date=options.get('due_date'),
+            status=options['status'],
+            user=request.user
+        ).run()
+        
+        return Response(result, status=status.HTTP_201_CREATED if result['created'] else status.HTTP_200_OK)
 
 
-class FeeItemViewSet(viewsets.ModelViewSet):
+class FeeItemViewSet(QuerySetOptimizerMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing FeeItem instances
     """
@@ -146,13 +186,19 @@ class FeeItemViewSet(viewsets.ModelViewSet):
         serializer.save(updated_by=self.request.user)
 
 
-class InvoiceViewSet(viewsets.ModelViewSet):
+class InvoiceViewSet(ConditionalGetMixin, QueryBudgetMixin, QuerySetOptimizerMixin, SparseFieldsetMixin, StreamingExportMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Invoice instances
     """
     queryset = Invoice.objects.all()
     serializer_class = InvoiceSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = {'list': 7, 'retrieve': 6, 'my_invoices': 5}
+    conditional_relations = ('items', 'payments', 'student')
+    export_fields = (
+        'id', 'invoice_number', ('student_id', 'student__student_id'), ('term', 'term__name'),
+        'issue_date', 'due_date', 'subtotal', 'discount', 'tax', 'total', 'amount_paid', 'balance', 'status'
+    )
     
     def get_permissions(self):
         """
@@ -181,7 +227,7 @@ class InvoiceViewSet(viewsets.ModelViewSet):
         # Regular users can only see their own invoices
         if not self.request.user.is_staff:
             try:
-                student = self.request.user.student_profile
+                student = self.request.profiles.get_student()
                 queryset = queryset.filter(student=student)
             except:
                 return Invoice.objects.none()
@@ -211,6 +257,14 @@ class InvoiceViewSet(viewsets.ModelViewSet):
         if end_date:
             queryset = queryset.filter(issue_date__lte=end_date)
         
+        # Filter to invoices with an outstanding balance
+        outstanding = self.request.query_params.get('outstanding', None)
+        if outstanding is not None:
+            if outstanding.lower() in ('true', '1'):
+                queryset = queryset.filter(balance__gt=0)
+            elif outstanding.lower() in ('false', '0'):
+                queryset = queryset.filter(balance__lte=0)
+        
         # Search by invoice number
         search = self.request.query_params.get('search', None)
         if search:
@@ -230,7 +284,7 @@ class InvoiceViewSet(viewsets.ModelViewSet):
         Get all items for a specific invoice
         """
         invoice = self.get_object()
-        items = InvoiceItem.objects.filter(invoice=invoice)
+        items = optimize_queryset(InvoiceItem.objects.filter(invoice=invoice), InvoiceItemSerializer)
         serializer = InvoiceItemSerializer(items, many=True)
         return Response(serializer.data)
     
@@ -240,7 +294,7 @@ class InvoiceViewSet(viewsets.ModelViewSet):
         Get all payments for a specific invoice
         """
         invoice = self.get_object()
-        payments = Payment.objects.filter(invoice=invoice)
+        payments = optimize_queryset(Payment.objects.filter(invoice=invoice), PaymentSerializer)
         serializer = PaymentSerializer(payments, many=True)
         return Response(serializer.data)
     
@@ -269,19 +323,8 @@ class InvoiceViewSet(viewsets.ModelViewSet):
         if 'received_by' not in payment_data:
             payment_data['received_by'] = request.user
         
-        # Create payment
-        with transaction.atomic():
-            payment = Payment.objects.create(**payment_data, created_by=request.user, updated_by=request.user)
-            
-            # Update invoice status based on payments
-            total_paid = Payment.objects.filter(invoice=invoice, status='completed').aggregate(total=Sum('amount'))['total'] or 0
-            
-            if total_paid >= invoice.total:
-                invoice.status = 'paid'
-            elif total_paid > 0:
-                invoice.status = 'partially_paid'
-            
-            invoice.save()
+        # Create payment; Payment.save() updates the invoice's amount_paid and status
+        payment = Payment.objects.create(**payment_data, created_by=request.user, updated_by=request.user)
         
         return Response(PaymentSerializer(payment).data, status=status.HTTP_201_CREATED)
     
@@ -291,7 +334,7 @@ class InvoiceViewSet(viewsets.ModelViewSet):
         Get invoices for the current user
         """
         try:
-            student = request.user.student_profile
+            student = request.profiles.get_student()
             invoices = Invoice.objects.filter(student=student)
             
             # Filter by status
@@ -304,19 +347,25 @@ class InvoiceViewSet(viewsets.ModelViewSet):
             if term_id:
                 invoices = invoices.filter(term_id=term_id)
             
-            serializer = self.get_serializer(invoices, many=True)
+            serializer = self.get_serializer(self.optimize_queryset(invoices), many=True)
             return Response(serializer.data)
         except:
             return Response([])
 
 
-class PaymentViewSet(viewsets.ModelViewSet):
+class PaymentViewSet(ConditionalGetMixin, CompiledListMixin, QuerySetOptimizerMixin, SparseFieldsetMixin, StreamingExportMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Payment instances
     """
     queryset = Payment.objects.all()
     serializer_class = PaymentSerializer
+    export_fields = (
+        'id', ('invoice_number', 'invoice__invoice_number'), ('student_id', 'invoice__student__student_id'),
+        'amount', 'payment_date', 'payment_method', 'transaction_id', 'receipt_number', 'status',
+        ('received_by', 'received_by__email')
+    )
     permission_classes = [permissions.IsAuthenticated]
+    page_size = 25
     
     def get_permissions(self):
         """
@@ -337,7 +386,7 @@ class PaymentViewSet(viewsets.ModelViewSet):
         # Regular users can only see their own payments
         if not self.request.user.is_staff:
             try:
-                student = self.request.user.student_profile
+                student = self.request.profiles.get_student()
                 queryset = queryset.filter(invoice__student=student)
             except:
                 return Payment.objects.none()
@@ -382,37 +431,12 @@ class PaymentViewSet(viewsets.ModelViewSet):
         
         return queryset
     
+    # Payment.save() and Payment.delete() keep the invoice's amount_paid and status up to date
     def perform_create(self, serializer):
-        payment = serializer.save(created_by=self.request.user, updated_by=self.request.user)
-        
-        # Update invoice status based on payments
-        invoice = payment.invoice
-        total_paid = Payment.objects.filter(invoice=invoice, status='completed').aggregate(total=Sum('amount'))['total'] or 0
-        
-        if total_paid >= invoice.total:
-            invoice.status = 'paid'
-        elif total_paid > 0:
-            invoice.status = 'partially_paid'
-        
-        invoice.save()
+        serializer.save(created_by=self.request.user, updated_by=self.request.user)
     
     def perform_update(self, serializer):
-        payment = serializer.save(updated_by=self.request.user)
-        
-        # Update invoice status based on payments when payment status changes
-        if 'status' in serializer.validated_data:
-            invoice = payment.invoice
-            total_paid = Payment.objects.filter(invoice=invoice, status='completed').aggregate(total=Sum('amount'))['total'] or 0
-            
-            if total_paid >= invoice.total:
-                invoice.status = 'paid'
-            elif total_paid > 0:
-                invoice.status = 'partially_paid'
-            else:
-                # If no completed payments, revert to sent status
-                invoice.status = 'sent'
-            
-            invoice.save()
+        serializer.save(updated_by=self.request.user)
     
     @action(detail=False, methods=['get'])
     def my_payments(self, request):
@@ -420,7 +444,7 @@ class PaymentViewSet(viewsets.ModelViewSet):
         Get payments for the current user
         """
         try:
-            student = request.user.student_profile
+            student = request.profiles.get_student()
             payments = Payment.objects.filter(invoice__student=student)
             
             # Filter by status
@@ -428,18 +452,23 @@ class PaymentViewSet(viewsets.ModelViewSet):
             if status_param:
                 payments = payments.filter(status=status_param)
             
-            serializer = self.get_serializer(payments, many=True)
+            serializer = self.get_serializer(self.optimize_queryset(payments), many=True)
             return Response(serializer.data)
         except:
             return Response([])
 
 
-class ExpenseViewSet(viewsets.ModelViewSet):
+class ExpenseViewSet(QuerySetOptimizerMixin, SparseFieldsetMixin, StreamingExportMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Expense instances
     """
     queryset = Expense.objects.all()
     serializer_class = ExpenseSerializer
+    export_fields = (
+        'id', 'title', ('school', 'school__name'), 'expense_type', 'amount', 'expense_date', 'vendor',
+        'status', ('requested_by', 'requested_by__email'), ('approved_by', 'approved_by__email'),
+        'approved_date', 'payment_date', 'payment_method', 'payment_reference'
+    )
     permission_classes = [permissions.IsAuthenticated]
     
     def get_permissions(self):
@@ -626,11 +655,11 @@ class ExpenseViewSet(viewsets.ModelViewSet):
         if status_param:
             expenses = expenses.filter(status=status_param)
         
-        serializer = self.get_serializer(expenses, many=True)
+        serializer = self.get_serializer(self.optimize_queryset(expenses), many=True)
         return Response(serializer.data)
 
 
-class BudgetViewSet(viewsets.ModelViewSet):
+class BudgetViewSet(QuerySetOptimizerMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Budget instances
     """
@@ -722,7 +751,7 @@ class BudgetViewSet(viewsets.ModelViewSet):
         })
 
 
-class BudgetItemViewSet(viewsets.ModelViewSet):
+class BudgetItemViewSet(QuerySetOptimizerMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing BudgetItem instances
     """
@@ -802,4 +831,41 @@ class BudgetItemViewSet(viewsets.ModelViewSet):
         budget_item.save()
         
         serializer = self.get_serializer(budget_item)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
+
+
+class ARAgingView(APIView):
+    """
+    Accounts-receivable aging report.
+
+    Outstanding balances as of `as_of` in current/0-30/31-60/61-90/90+ day
+    buckets, grouped by school, term or fee type with report totals, or
+    drilled down to one row per student or invoice with keyset pagination.
+    Reports are cached per school and as-of date until a payment or invoice
+    of that school changes.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    pagination_class = KeysetPagination
+
+    def get(self, request):
+        serializer = ARAgingQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        options = serializer.validated_data
+        as_of = options.get('as_of') or timezone.localdate()
+        filters = {name: options.get(name) for name in ('school', 'term', 'student')}
+        group_by = options['group_by']
+
+        def build():
+            rows = aging_queryset(group_by, as_of, **filters)
+            if group_by in DRILL_DOWN:
+                paginator = self.pagination_class()
+                page = paginator.paginate_queryset(rows, request, view=self)
+                payload = paginator.get_paginated_response([present_row(row, as_of) for row in page]).data
+                totals = aging_totals(as_of, **filters)
+            else:
+                payload = {'results': [present_row(row, as_of) for row in rows]}
+                totals = row_totals(payload['results'])
+            return {'as_of': as_of, 'group_by': group_by, 'totals': totals, **payload}
+
+        params = dict(request.query_params.items())
+        return Response(cached_report(filters['school'], as_of, params, build))
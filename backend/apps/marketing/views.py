@@ -4,6 +4,7 @@ from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from apps.core.fieldsets import SparseFieldsetMixin
 from .models import (
     Campaign,
     Lead,
@@ -22,7 +23,7 @@ from .serializers import (
 )
 
 
-class CampaignViewSet(viewsets.ModelViewSet):
+class CampaignViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Campaign instances
     """
@@ -187,7 +188,7 @@ class CampaignViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class LeadViewSet(viewsets.ModelViewSet):
+class LeadViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Lead instances
     """
@@ -441,7 +442,7 @@ class LeadViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class InteractionViewSet(viewsets.ModelViewSet):
+class InteractionViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Interaction instances
     """
@@ -540,7 +541,7 @@ class InteractionViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class PromotionViewSet(viewsets.ModelViewSet):
+class PromotionViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Promotion instances
     """
@@ -733,7 +734,7 @@ class PromotionViewSet(viewsets.ModelViewSet):
             )
 
 
-class MarketingAnalyticsViewSet(viewsets.ModelViewSet):
+class MarketingAnalyticsViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing MarketingAnalytics instances
     """
@@ -4,6 +4,7 @@ from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from apps.core.fieldsets import SparseFieldsetMixin
 from .models import (
     Survey,
     Question,
@@ -31,7 +32,7 @@ from .serializers import (
 )
 
 
-class SurveyViewSet(viewsets.ModelViewSet):
+class SurveyViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Survey instances
     """
@@ -236,7 +237,7 @@ class SurveyViewSet(viewsets.ModelViewSet):
         })
 
 
-class QuestionViewSet(viewsets.ModelViewSet):
+class QuestionViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Question instances
     """
@@ -300,7 +301,7 @@ class QuestionViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class QuestionOptionViewSet(viewsets.ModelViewSet):
+class QuestionOptionViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing QuestionOption instances
     """
@@ -343,7 +344,7 @@ class QuestionOptionViewSet(viewsets.ModelViewSet):
         serializer.save(updated_by=self.request.user)
 
 
-class SurveyResponseViewSet(viewsets.ModelViewSet):
+class SurveyResponseViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and creating SurveyResponse instances
     """
@@ -440,7 +441,7 @@ class SurveyResponseViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class FeedbackViewSet(viewsets.ModelViewSet):
+class FeedbackViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Feedback instances
     """
@@ -631,7 +632,7 @@ class FeedbackViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class ImprovementPlanViewSet(viewsets.ModelViewSet):
+class ImprovementPlanViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing ImprovementPlan instances
     """
@@ -771,7 +772,7 @@ class ImprovementPlanViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class QualityMetricViewSet(viewsets.ModelViewSet):
+class QualityMetricViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing QualityMetric instances
     """
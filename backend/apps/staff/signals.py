@@ -1,9 +1,10 @@
 """
 Signal handlers for the staff app
 """
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
+from apps.core.profiles import invalidate_profiles
 from .models import StaffMember, TeacherProfile
 
 User = get_user_model()
@@ -61,4 +62,26 @@ def create_staff_profile(sender, instance, created, **kwargs):
                 
         except (School.DoesNotExist, IndexError):
             # Log this error in a real system
-            pass
\ No newline at end of file
+            pass
+
+
+@receiver(post_save, sender=StaffMember)
+@receiver(post_delete, sender=StaffMember)
+def invalidate_staff_profile(sender, instance, **kwargs):
+    """
+    Drop the cached profiles of the staff member's user
+    """
+    invalidate_profiles(instance.user_id)
+
+
+@receiver(post_save, sender=TeacherProfile)
+@receiver(post_delete, sender=TeacherProfile)
+def invalidate_teacher_profile(sender, instance, **kwargs):
+    """
+    Drop the cached profiles of the teacher's user
+    """
+    if TeacherProfile.staff_member.is_cached(instance):
+        user_id = instance.staff_member.user_id
+    else:
+        user_id = StaffMember.objects.filter(id=instance.staff_member_id).values_list('user_id', flat=True).first()
+    invalidate_profiles(user_id)
@@ -4,6 +4,7 @@ from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from apps.core.fieldsets import SparseFieldsetMixin
 from .models import (
     StaffMember,
     TeacherProfile,
@@ -44,7 +45,7 @@ class IsAdminOrManagerOrSelf(permissions.BasePermission):
             return True
         
         # Allow managers with specific permission (simplified)
-        if request.user.user_type == 'staff' and hasattr(request.user, 'staff_profile') and 'Manager' in request.user.staff_profile.designation:
+        if request.user.user_type == 'staff' and request.profiles.is_manager:
             return True
         
         # Allow the staff member themselves
@@ -57,7 +58,7 @@ class IsAdminOrManagerOrSelf(permissions.BasePermission):
         return False
 
 
-class StaffMemberViewSet(viewsets.ModelViewSet):
+class StaffMemberViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing StaffMember instances
     """
@@ -121,9 +122,9 @@ class StaffMemberViewSet(viewsets.ModelViewSet):
             )
         
         # If the user is a regular staff member, only allow them to see themselves
-        if not self.request.user.is_staff and not (hasattr(self.request.user, 'staff_profile') and 'Manager' in getattr(self.request.user.staff_profile, 'designation', '')):
+        if not self.request.user.is_staff and not self.request.profiles.is_manager:
             try:
-                staff_member = StaffMember.objects.get(user=self.request.user)
+                staff_member = self.request.profiles.get_staff_member()
                 return StaffMember.objects.filter(id=staff_member.id)
             except StaffMember.DoesNotExist:
                 return StaffMember.objects.none()
@@ -209,7 +210,7 @@ class StaffMemberViewSet(viewsets.ModelViewSet):
         Get the current user's staff profile
         """
         try:
-            staff_member = StaffMember.objects.get(user=request.user)
+            staff_member = request.profiles.get_staff_member()
             serializer = StaffDetailSerializer(staff_member, context={'request': request})
             return Response(serializer.data)
         except StaffMember.DoesNotExist:
@@ -219,7 +220,7 @@ class StaffMemberViewSet(viewsets.ModelViewSet):
             )
 
 
-class TeacherProfileViewSet(viewsets.ModelViewSet):
+class TeacherProfileViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing TeacherProfile instances
     """
@@ -251,7 +252,7 @@ class TeacherProfileViewSet(viewsets.ModelViewSet):
         # If the user is a regular teacher, only allow them to see their own profile
         if not self.request.user.is_staff and self.request.user.user_type == 'teacher':
             try:
-                staff_member = StaffMember.objects.get(user=self.request.user)
+                staff_member = self.request.profiles.get_staff_member()
                 return TeacherProfile.objects.filter(staff_member=staff_member)
             except (StaffMember.DoesNotExist, TeacherProfile.DoesNotExist):
                 return TeacherProfile.objects.none()
@@ -265,7 +266,7 @@ class TeacherProfileViewSet(viewsets.ModelViewSet):
         serializer.save(updated_by=self.request.user)
 
 
-class LeaveViewSet(viewsets.ModelViewSet):
+class LeaveViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Leave instances
     """
@@ -305,9 +306,9 @@ class LeaveViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(end_date__lte=end_date)
         
         # If the user is a regular staff member, only allow them to see their own leaves
-        if not self.request.user.is_staff and not (hasattr(self.request.user, 'staff_profile') and 'Manager' in getattr(self.request.user.staff_profile, 'designation', '')):
+        if not self.request.user.is_staff and not self.request.profiles.is_manager:
             try:
-                staff_member = StaffMember.objects.get(user=self.request.user)
+                staff_member = self.request.profiles.get_staff_member()
                 return queryset.filter(staff_member=staff_member)
             except StaffMember.DoesNotExist:
                 return Leave.objects.none()
@@ -325,7 +326,7 @@ class LeaveViewSet(viewsets.ModelViewSet):
         """
         Approve a leave request
         """
-        if not request.user.is_staff and not (hasattr(request.user, 'staff_profile') and 'Manager' in getattr(request.user.staff_profile, 'designation', '')):
+        if not request.user.is_staff and not request.profiles.is_manager:
             return Response(
                 {"detail": "You do not have permission to approve leave requests."},
                 status=status.HTTP_403_FORBIDDEN
@@ -353,7 +354,7 @@ class LeaveViewSet(viewsets.ModelViewSet):
         """
         Reject a leave request
         """
-        if not request.user.is_staff and not (hasattr(request.user, 'staff_profile') and 'Manager' in getattr(request.user.staff_profile, 'designation', '')):
+        if not request.user.is_staff and not request.profiles.is_manager:
             return Response(
                 {"detail": "You do not have permission to reject leave requests."},
                 status=status.HTTP_403_FORBIDDEN
@@ -391,7 +392,7 @@ class LeaveViewSet(viewsets.ModelViewSet):
         Get the current staff member's leave requests
         """
         try:
-            staff_member = StaffMember.objects.get(user=request.user)
+            staff_member = request.profiles.get_staff_member()
             leaves = Leave.objects.filter(staff_member=staff_member)
             
             # Filter by status if provided
@@ -408,7 +409,7 @@ class LeaveViewSet(viewsets.ModelViewSet):
             )
 
 
-class PerformanceViewSet(viewsets.ModelViewSet):
+class PerformanceViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Performance instances
     """
@@ -448,9 +449,9 @@ class PerformanceViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(evaluation_date__lte=end_date)
         
         # If the user is a regular staff member, only allow them to see their own evaluations
-        if not self.request.user.is_staff and not (hasattr(self.request.user, 'staff_profile') and 'Manager' in getattr(self.request.user.staff_profile, 'designation', '')):
+        if not self.request.user.is_staff and not self.request.profiles.is_manager:
             try:
-                staff_member = StaffMember.objects.get(user=self.request.user)
+                staff_member = self.request.profiles.get_staff_member()
                 return queryset.filter(staff_member=staff_member)
             except StaffMember.DoesNotExist:
                 return Performance.objects.none()
@@ -469,7 +470,7 @@ class PerformanceViewSet(viewsets.ModelViewSet):
         Get the current staff member's performance evaluations
         """
         try:
-            staff_member = StaffMember.objects.get(user=request.user)
+            staff_member = request.profiles.get_staff_member()
             performances = Performance.objects.filter(staff_member=staff_member)
             
             serializer = self.get_serializer(performances, many=True)
@@ -481,7 +482,7 @@ class PerformanceViewSet(viewsets.ModelViewSet):
             )
 
 
-class StaffDocumentViewSet(viewsets.ModelViewSet):
+class StaffDocumentViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing StaffDocument instances
     """
@@ -512,9 +513,9 @@ class StaffDocumentViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(is_confidential=is_confidential_bool)
         
         # If the user is a regular staff member, only allow them to see their own non-confidential documents
-        if not self.request.user.is_staff and not (hasattr(self.request.user, 'staff_profile') and 'Manager' in getattr(self.request.user.staff_profile, 'designation', '')):
+        if not self.request.user.is_staff and not self.request.profiles.is_manager:
             try:
-                staff_member = StaffMember.objects.get(user=self.request.user)
+                staff_member = self.request.profiles.get_staff_member()
                 return queryset.filter(staff_member=staff_member, is_confidential=False)
             except StaffMember.DoesNotExist:
                 return StaffDocument.objects.none()
@@ -533,7 +534,7 @@ class StaffDocumentViewSet(viewsets.ModelViewSet):
         Get the current staff member's documents
         """
         try:
-            staff_member = StaffMember.objects.get(user=request.user)
+            staff_member = request.profiles.get_staff_member()
             documents = StaffDocument.objects.filter(staff_member=staff_member, is_confidential=False)
             
             # Filter by document type if provided
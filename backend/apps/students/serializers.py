@@ -1,5 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from apps.core.compiled import reads
+from apps.core.optimizer import depends_on
 from apps.core.serializers import UserMinimalSerializer
 from apps.curriculum.serializers import CourseSerializer
 from .models import (
@@ -13,6 +15,18 @@ from .models import (
 User = get_user_model()
 
 
+# The User columns get_full_name() reads, where the model has them
+USER_NAME_FIELDS = tuple(
+    name for name in ('first_name', 'last_name', 'email')
+    if name in {field.name for field in User._meta.concrete_fields}
+)
+
+
+def student_full_name(row, prefix):
+    """Student.full_name from the USER_NAME_FIELDS columns of a compiled row"""
+    return User(**{name: row[f'{prefix}{name}'] for name in USER_NAME_FIELDS}).get_full_name()
+
+
 class StudentSerializer(serializers.ModelSerializer):
     """
     Serializer for the Student model
@@ -89,6 +103,7 @@ class AttendanceSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('created_at', 'updated_at', 'created_by', 'updated_by')
     
+    @depends_on('enrollment__student__user', 'enrollment__course')
     def get_enrollment_details(self, obj):
         return {
             'id': obj.enrollment.id,
@@ -103,6 +118,29 @@ class AttendanceSerializer(serializers.ModelSerializer):
                 'name': obj.enrollment.course.name
             }
         }
+    
+    @reads(
+        'enrollment_id', 'enrollment__student_id', 'enrollment__student__student_id',
+        *(f'enrollment__student__user__{name}' for name in USER_NAME_FIELDS),
+        'enrollment__course_id', 'enrollment__course__code', 'enrollment__course__name'
+    )
+    def row_enrollment_details(self, row):
+        """
+        get_enrollment_details for compiled lists, built from values() columns
+        """
+        return {
+            'id': row['enrollment_id'],
+            'student': {
+                'id': row['enrollment__student_id'],
+                'student_id': row['enrollment__student__student_id'],
+                'full_name': student_full_name(row, 'enrollment__student__user__')
+            },
+            'course': {
+                'id': row['enrollment__course_id'],
+                'code': row['enrollment__course__code'],
+                'name': row['enrollment__course__name']
+            }
+        }
 
 
 class AssignmentSubmissionSerializer(serializers.ModelSerializer):
@@ -119,6 +157,7 @@ class AssignmentSubmissionSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('created_at', 'updated_at', 'created_by', 'updated_by', 'submission_date', 'is_late')
     
+    @depends_on('enrollment__student__user', 'enrollment__course')
     def get_enrollment_details(self, obj):
         return {
             'id': obj.enrollment.id,
@@ -134,6 +173,7 @@ class AssignmentSubmissionSerializer(serializers.ModelSerializer):
             }
         }
     
+    @depends_on('assignment')
     def get_assignment_details(self, obj):
         return {
             'id': obj.assignment.id,
@@ -156,6 +196,7 @@ class StudentNoteSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('created_at', 'updated_at', 'created_by', 'updated_by')
     
+    @depends_on('student__user')
     def get_student_details(self, obj):
         return {
             'id': obj.student.id,
@@ -1,10 +1,11 @@
 """
 Signal handlers for the students app
 """
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from .models import Student
+from apps.core.profiles import invalidate_profiles
+from .models import Enrollment, Student
 
 User = get_user_model()
 
@@ -45,4 +46,26 @@ def create_student_profile(sender, instance, created, **kwargs):
             )
         except (School.DoesNotExist, IndexError):
             # Log this error in a real system
-            pass
\ No newline at end of file
+            pass
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+def invalidate_student_profile(sender, instance, **kwargs):
+    """
+    Drop the cached profiles of the student's user
+    """
+    invalidate_profiles(instance.user_id)
+
+
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+def invalidate_enrollment_ids(sender, instance, **kwargs):
+    """
+    Drop the cached enrollment ids of the enrolled student's user
+    """
+    if Enrollment.student.is_cached(instance):
+        user_id = instance.student.user_id
+    else:
+        user_id = Student.objects.filter(id=instance.student_id).values_list('user_id', flat=True).first()
+    invalidate_profiles(user_id)
@@ -4,6 +4,11 @@ from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from apps.core.compiled import CompiledListMixin
+from apps.core.fieldsets import SparseFieldsetMixin
+from apps.core.instrumentation import QueryBudgetMixin
+from apps.core.optimizer import QuerySetOptimizerMixin, optimize_queryset
+
 from .models import (
     Student,
     Enrollment,
@@ -61,7 +66,7 @@ class IsAdminOrTeacherOrSelf(permissions.BasePermission):
         return False
 
 
-class StudentViewSet(viewsets.ModelViewSet):
+class StudentViewSet(QuerySetOptimizerMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Student instances
     """
@@ -106,7 +111,7 @@ class StudentViewSet(viewsets.ModelViewSet):
         # Filter by user (student themselves can only see their profile)
         if self.request.user.user_type == 'student':
             try:
-                student = Student.objects.get(user=self.request.user)
+                student = self.request.profiles.get_student()
                 return Student.objects.filter(id=student.id)
             except Student.DoesNotExist:
                 return Student.objects.none()
@@ -137,7 +142,7 @@ class StudentViewSet(viewsets.ModelViewSet):
         if status:
             enrollments = enrollments.filter(status=status)
         
-        serializer = EnrollmentSerializer(enrollments, many=True)
+        serializer = EnrollmentSerializer(optimize_queryset(enrollments, EnrollmentSerializer), many=True)
         return Response(serializer.data)
     
     @action(detail=True, methods=['get'])
@@ -163,7 +168,7 @@ class StudentViewSet(viewsets.ModelViewSet):
         if end_date:
             attendance = attendance.filter(date__lte=end_date)
         
-        serializer = AttendanceSerializer(attendance, many=True)
+        serializer = AttendanceSerializer(optimize_queryset(attendance, AttendanceSerializer), many=True)
         return Response(serializer.data)
     
     @action(detail=True, methods=['get'])
@@ -189,7 +194,7 @@ class StudentViewSet(viewsets.ModelViewSet):
         if end_date:
             submissions = submissions.filter(submission_date__lte=end_date)
         
-        serializer = AssignmentSubmissionSerializer(submissions, many=True)
+        serializer = AssignmentSubmissionSerializer(optimize_queryset(submissions, AssignmentSubmissionSerializer), many=True)
         return Response(serializer.data)
     
     @action(detail=True, methods=['get'])
@@ -204,7 +209,7 @@ class StudentViewSet(viewsets.ModelViewSet):
         if not request.user.is_staff:
             notes = notes.filter(is_private=False)
         
-        serializer = StudentNoteSerializer(notes, many=True)
+        serializer = StudentNoteSerializer(optimize_queryset(notes, StudentNoteSerializer), many=True)
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
@@ -213,7 +218,7 @@ class StudentViewSet(viewsets.ModelViewSet):
         Get the logged-in student's profile
         """
         try:
-            student = Student.objects.get(user=request.user)
+            student = request.profiles.get_student()
             serializer = self.get_serializer(student)
             return Response(serializer.data)
         except Student.DoesNotExist:
@@ -223,13 +228,14 @@ class StudentViewSet(viewsets.ModelViewSet):
             )
 
 
-class EnrollmentViewSet(viewsets.ModelViewSet):
+class EnrollmentViewSet(QueryBudgetMixin, QuerySetOptimizerMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Enrollment instances
     """
     queryset = Enrollment.objects.all()
     serializer_class = EnrollmentSerializer
     permission_classes = [IsAdminOrTeacherOrSelf]
+    query_budget = {'list': 5, 'retrieve': 5, 'my_enrollments': 5}
     
     def get_queryset(self):
         """
@@ -265,7 +271,7 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
         # If the user is a student, only show their enrollments
         if self.request.user.user_type == 'student':
             try:
-                student = Student.objects.get(user=self.request.user)
+                student = self.request.profiles.get_student()
                 return queryset.filter(student=student)
             except Student.DoesNotExist:
                 return Enrollment.objects.none()
@@ -296,7 +302,7 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
         if end_date:
             attendance = attendance.filter(date__lte=end_date)
         
-        serializer = AttendanceSerializer(attendance, many=True)
+        serializer = AttendanceSerializer(optimize_queryset(attendance, AttendanceSerializer), many=True)
         return Response(serializer.data)
     
     @action(detail=True, methods=['get'])
@@ -306,7 +312,7 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
         """
         enrollment = self.get_object()
         submissions = AssignmentSubmission.objects.filter(enrollment=enrollment)
-        serializer = AssignmentSubmissionSerializer(submissions, many=True)
+        serializer = AssignmentSubmissionSerializer(optimize_queryset(submissions, AssignmentSubmissionSerializer), many=True)
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
@@ -315,7 +321,7 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
         Get the current student's enrollments
         """
         try:
-            student = Student.objects.get(user=request.user)
+            student = request.profiles.get_student()
             enrollments = Enrollment.objects.filter(student=student)
             
             # Filter by term or status if provided
@@ -328,7 +334,7 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
             if status:
                 enrollments = enrollments.filter(status=status)
             
-            serializer = self.get_serializer(enrollments, many=True)
+            serializer = self.get_serializer(self.optimize_queryset(enrollments), many=True)
             return Response(serializer.data)
         except Student.DoesNotExist:
             return Response(
@@ -337,13 +343,15 @@ class EnrollmentViewSet(viewsets.ModelViewSet):
             )
 
 
-class AttendanceViewSet(viewsets.ModelViewSet):
+class AttendanceViewSet(QueryBudgetMixin, CompiledListMixin, QuerySetOptimizerMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing Attendance instances
     """
     queryset = Attendance.objects.all()
     serializer_class = AttendanceSerializer
     permission_classes = [IsAdminOrTeacherOrSelf]
+    query_budget = {'list': 5, 'retrieve': 5, 'my_attendance': 5}
+    page_size = 50
     
     def get_queryset(self):
         """
@@ -374,8 +382,8 @@ class AttendanceViewSet(viewsets.ModelViewSet):
         # If the user is a student, only show their attendance
         if self.request.user.user_type == 'student':
             try:
-                student = Student.objects.get(user=self.request.user)
-                enrollment_ids = Enrollment.objects.filter(student=student).values_list('id', flat=True)
+                self.request.profiles.get_student()
+                enrollment_ids = self.request.profiles.enrollment_ids
                 return queryset.filter(enrollment_id__in=enrollment_ids)
             except Student.DoesNotExist:
                 return Attendance.objects.none()
@@ -411,8 +419,8 @@ class AttendanceViewSet(viewsets.ModelViewSet):
         Get the current student's attendance records
         """
         try:
-            student = Student.objects.get(user=request.user)
-            enrollment_ids = Enrollment.objects.filter(student=student).values_list('id', flat=True)
+            request.profiles.get_student()
+            enrollment_ids = request.profiles.enrollment_ids
             attendance = Attendance.objects.filter(enrollment_id__in=enrollment_ids)
             
             # Filter by date range if provided
@@ -425,7 +433,7 @@ class AttendanceViewSet(viewsets.ModelViewSet):
             if end_date:
                 attendance = attendance.filter(date__lte=end_date)
             
-            serializer = self.get_serializer(attendance, many=True)
+            serializer = self.get_serializer(self.optimize_queryset(attendance), many=True)
             return Response(serializer.data)
         except Student.DoesNotExist:
             return Response(
@@ -434,13 +442,14 @@ class AttendanceViewSet(viewsets.ModelViewSet):
             )
 
 
-class AssignmentSubmissionViewSet(viewsets.ModelViewSet):
+class AssignmentSubmissionViewSet(QueryBudgetMixin, QuerySetOptimizerMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing AssignmentSubmission instances
     """
     queryset = AssignmentSubmission.objects.all()
     serializer_class = AssignmentSubmissionSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = {'list': 5, 'retrieve': 5, 'my_submissions': 5, 'pending_grading': 5}
     
     def get_queryset(self):
         """
@@ -454,7 +463,7 @@ class AssignmentSubmissionViewSet(viewsets.ModelViewSet):
         if not self.request.user.is_staff:
             # Get the student profile for the current user
             try:
-                student = Student.objects.get(user=self.request.user)
+                student = self.request.profiles.get_student()
                 enrollments = Enrollment.objects.filter(student=student)
                 queryset = queryset.filter(enrollment__in=enrollments)
             except Student.DoesNotExist:
@@ -508,7 +517,7 @@ class AssignmentSubmissionViewSet(viewsets.ModelViewSet):
         if not self.request.user.is_staff:
             enrollment_id = serializer.validated_data.get('enrollment').id
             try:
-                student = Student.objects.get(user=self.request.user)
+                student = self.request.profiles.get_student()
                 enrollment = Enrollment.objects.get(id=enrollment_id, student=student)
             except (Student.DoesNotExist, Enrollment.DoesNotExist):
                 raise permissions.PermissionDenied("You can only submit for your own enrollments.")
@@ -544,7 +553,7 @@ class AssignmentSubmissionViewSet(viewsets.ModelViewSet):
         Get submissions for the current user
         """
         try:
-            student = Student.objects.get(user=request.user)
+            student = request.profiles.get_student()
             enrollments = Enrollment.objects.filter(student=student)
             submissions = AssignmentSubmission.objects.filter(enrollment__in=enrollments)
             
@@ -553,7 +562,7 @@ class AssignmentSubmissionViewSet(viewsets.ModelViewSet):
             if status_param:
                 submissions = submissions.filter(status=status_param)
             
-            serializer = self.get_serializer(submissions, many=True)
+            serializer = self.get_serializer(self.optimize_queryset(submissions), many=True)
             return Response(serializer.data)
         except Student.DoesNotExist:
             return Response([])
@@ -580,11 +589,11 @@ class AssignmentSubmissionViewSet(viewsets.ModelViewSet):
         if course_id:
             submissions = submissions.filter(assignment__course_id=course_id)
         
-        serializer = self.get_serializer(submissions, many=True)
+        serializer = self.get_serializer(self.optimize_queryset(submissions), many=True)
         return Response(serializer.data)
 
 
-class StudentNoteViewSet(viewsets.ModelViewSet):
+class StudentNoteViewSet(QuerySetOptimizerMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet for viewing and editing StudentNote instances
     """
@@ -627,7 +636,7 @@ class StudentNoteViewSet(viewsets.ModelViewSet):
         if not self.request.user.is_staff:
             if self.request.user.user_type == 'student':
                 try:
-                    student = Student.objects.get(user=self.request.user)
+                    student = self.request.profiles.get_student()
                     queryset = queryset.filter(student=student)
                 except Student.DoesNotExist:
                     return StudentNote.objects.none()
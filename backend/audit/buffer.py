@@ -0,0 +1,184 @@
+"""
+Buffered writer for audit records.
+
+Audit rows (ActivityLog, UserActivity, ...) are queued in-process and
+written by a background thread with one bulk_create per model, either when
+AUDIT_BUFFER_BATCH_SIZE records are waiting or every
+AUDIT_BUFFER_FLUSH_INTERVAL seconds. Requests therefore no longer pay an
+INSERT round trip for their audit trail. Pending records are flushed when
+the worker exits, and if the queue is full a record is written
+synchronously instead of being dropped.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class AuditBuffer:
+    """
+    Process-local queue of unsaved model instances flushed in batches
+    """
+
+    def __init__(self):
+        self._queue = None
+        self._wakeup = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._pid = None
+        self._thread = None
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+    @property
+    def enabled(self):
+        return getattr(settings, 'AUDIT_BUFFER_ENABLE', True)
+
+    @property
+    def batch_size(self):
+        return getattr(settings, 'AUDIT_BUFFER_BATCH_SIZE', 100)
+
+    @property
+    def flush_interval(self):
+        return getattr(settings, 'AUDIT_BUFFER_FLUSH_INTERVAL', 2.0)
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'AUDIT_BUFFER_MAX_SIZE', 10000)
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._stats = {
+                'enqueued': 0,
+                'written': 0,
+                'batches': 0,
+                'overflow_writes': 0,
+                'failed': 0,
+                'last_flush_at': None,
+                'last_flush_ms': None,
+            }
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def _ensure_started(self):
+        # Started lazily and per process, so forked workers get their own thread
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            if self._pid != os.getpid():
+                self._queue = queue.Queue(maxsize=self.max_size)
+                atexit.register(self.flush)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='audit-buffer', daemon=True)
+            self._thread.start()
+
+    def add(self, instance):
+        """
+        Queue an unsaved model instance for writing. Written immediately if
+        buffering is disabled or the queue is full
+        """
+        if not self.enabled:
+            instance.save()
+            return
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(instance)
+        except queue.Full:
+            self._count('overflow_writes')
+            self._save(instance)
+            return
+
+        self._count('enqueued')
+        if self._queue.qsize() >= self.batch_size:
+            self._wakeup.set()
+
+    def _save(self, instance):
+        try:
+            instance.save()
+        except Exception:
+            self._count('failed')
+            logger.exception("Could not write %s audit record", type(instance).__name__)
+            return False
+        return True
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Audit buffer flush failed")
+            finally:
+                close_old_connections()
+
+    def _drain(self):
+        records = []
+        if self._queue is None:
+            return records
+        while True:
+            try:
+                records.append(self._queue.get_nowait())
+            except queue.Empty:
+                return records
+
+    def flush(self):
+        """Write every queued record, one bulk_create per model"""
+        with self._flush_lock:
+            records = self._drain()
+            if not records:
+                return 0
+
+            start = time.perf_counter()
+            by_model = defaultdict(list)
+            for record in records:
+                by_model[type(record)].append(record)
+
+            written = 0
+            for model, batch in by_model.items():
+                try:
+                    model.objects.bulk_create(batch, batch_size=self.batch_size)
+                    written += len(batch)
+                    self._count('batches')
+                except Exception:
+                    # One bad row should not lose the whole batch
+                    logger.exception("Bulk audit write failed for %s, retrying rows", model.__name__)
+                    for record in batch:
+                        record.pk = None
+                        written += self._save(record)
+
+            self._count('written', written)
+            with self._stats_lock:
+                self._stats['last_flush_at'] = time.time()
+                self._stats['last_flush_ms'] = round((time.perf_counter() - start) * 1000, 2)
+            return written
+
+    def stats(self):
+        """Queue depth and counters for this worker"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats.update({
+            'enabled': self.enabled,
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'max_size': self.max_size,
+            'batch_size': self.batch_size,
+            'flush_interval': self.flush_interval,
+            'pid': os.getpid(),
+        })
+        return stats
+
+
+audit_buffer = AuditBuffer()
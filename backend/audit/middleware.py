@@ -1,5 +1,5 @@
+from .buffer import audit_buffer
 from .models import ActivityLog
-from django.db import connection
 import re
 
 class ActivityLogMiddleware:
@@ -58,14 +58,14 @@ class ActivityLogMiddleware:
             # Get client IP address
             ip_address = self._get_client_ip(request)
             
-            # Log the activity
-            ActivityLog.objects.create(
+            # Queue the activity; it is written in a batch after the response
+            audit_buffer.add(ActivityLog(
                 user=user,
                 action=action,
                 ip_address=ip_address,
                 user_agent=request.META.get('HTTP_USER_AGENT', ''),
                 details=self._get_request_details(request)
-            )
+            ))
         except Exception as e:
             # Just silently fail if logging fails
             pass
@@ -0,0 +1,53 @@
+import queue
+from django.test import TestCase, override_settings
+from audit.buffer import AuditBuffer
+from audit.models import ActivityLog
+
+
+class ManualAuditBuffer(AuditBuffer):
+    """
+    Audit buffer without the background thread, flushed by the test
+    """
+
+    def _ensure_started(self):
+        if self._queue is None:
+            self._queue = queue.Queue(maxsize=self.max_size)
+
+
+@override_settings(AUDIT_BUFFER_ENABLE=True, AUDIT_BUFFER_MAX_SIZE=3)
+class AuditBufferTest(TestCase):
+    """
+    Test case for the buffered audit writer
+    """
+
+    def setUp(self):
+        self.buffer = ManualAuditBuffer()
+
+    def record(self, action):
+        return ActivityLog(action=action, ip_address='127.0.0.1')
+
+    def test_records_are_written_in_one_batch(self):
+        for index in range(3):
+            self.buffer.add(self.record(f'ACTION_{index}'))
+        self.assertEqual(ActivityLog.objects.count(), 0)
+        self.assertEqual(self.buffer.stats()['queue_depth'], 3)
+
+        with self.assertNumQueries(1):
+            written = self.buffer.flush()
+
+        self.assertEqual(written, 3)
+        self.assertEqual(ActivityLog.objects.count(), 3)
+        self.assertEqual(self.buffer.stats()['queue_depth'], 0)
+
+    def test_overflow_is_written_synchronously(self):
+        for index in range(4):
+            self.buffer.add(self.record(f'ACTION_{index}'))
+
+        self.assertEqual(ActivityLog.objects.count(), 1)
+        self.assertEqual(self.buffer.stats()['overflow_writes'], 1)
+
+    @override_settings(AUDIT_BUFFER_ENABLE=False)
+    def test_disabled_buffer_writes_immediately(self):
+        self.buffer.add(self.record('ACTION'))
+
+        self.assertEqual(ActivityLog.objects.count(), 1)
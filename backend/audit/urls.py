@@ -0,0 +1,6 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('buffer-stats/', views.buffer_stats, name='audit-buffer-stats'),
+]
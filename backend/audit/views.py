@@ -0,0 +1,14 @@
+from rest_framework import permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from .buffer import audit_buffer
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def buffer_stats(request):
+    """
+    Queue depth and write counters of the audit buffer in this worker
+    """
+    return Response(audit_buffer.stats())
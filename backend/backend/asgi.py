@@ -13,4 +13,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings.production')
 
-application = get_asgi_application()
\ No newline at end of file
+application = get_asgi_application()
+
+# Load reference data before the first request reaches this worker
+from apps.core.reference import reference_cache  # noqa: E402
+
+reference_cache.warm()
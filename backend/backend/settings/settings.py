@@ -54,11 +54,13 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'apps.core.instrumentation.QueryInstrumentationMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.core.profiles.ProfileMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'security.middleware.RateLimitMiddleware',
@@ -142,13 +144,22 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': None,
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'apps.authentication.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        'apps.core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'apps.core.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'apps.core.pagination.StandardPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_SCHEMA_CLASS': 'rest_framework.schemas.coreapi.AutoSchema',
 }
@@ -168,5 +179,118 @@ SWAGGER_SETTINGS = {
     },
 }
 
+# Cache settings
+# Redis is shared by every worker; without it each process falls back to an
+# in-process cache with the same behaviour (fine for tests and single boxes)
+REDIS_HOST = os.environ.get('REDIS_HOST', '')
+REDIS_PORT = os.environ.get('REDIS_PORT', '6379')
+REDIS_URL = os.environ.get(
+    'REDIS_URL',
+    f"redis://{REDIS_HOST}:{REDIS_PORT}/0" if REDIS_HOST else ''
+)
+
+# Default TTL (seconds) and local size limit for each cache namespace. Every
+# key gets a TTL, so Redis should run with maxmemory-policy volatile-lru
+CACHE_NAMESPACES = {
+    'default': {'TIMEOUT': 300, 'MAX_ENTRIES': 5000},
+    'ratelimit': {'TIMEOUT': 3600, 'MAX_ENTRIES': 50000},
+    'security': {'TIMEOUT': 86400, 'MAX_ENTRIES': 20000},
+    'reference': {'TIMEOUT': 3600, 'MAX_ENTRIES': 5000},
+    'sessions': {'TIMEOUT': 1209600, 'MAX_ENTRIES': 20000},
+    'profiles': {'TIMEOUT': 60, 'MAX_ENTRIES': 20000},
+    'reports': {'TIMEOUT': 900, 'MAX_ENTRIES': 2000},
+}
+
+CACHES = {
+    alias: {
+        'BACKEND': (
+            'apps.core.cache_backends.RedisCache' if REDIS_URL
+            else 'apps.core.cache_backends.LocalCache'
+        ),
+        'LOCATION': REDIS_URL or f"school-system-{alias}",
+        'KEY_PREFIX': f"school:{alias}",
+        'TIMEOUT': policy['TIMEOUT'],
+        'OPTIONS': {} if REDIS_URL else {'MAX_ENTRIES': policy['MAX_ENTRIES']},
+    }
+    for alias, policy in CACHE_NAMESPACES.items()
+}
+
+# Sessions are read from the sessions cache and written through to the database
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'sessions'
+
 # Rate limiting settings
-RATE_LIMIT_ENABLE = True
\ No newline at end of file
+RATE_LIMIT_ENABLE = True
+
+# Security middleware settings
+SECURITY_SCAN_MAX_BODY_BYTES = 16384  # Request body bytes inspected per request
+BLOCKED_IP_REFRESH_INTERVAL = 5  # Seconds between block list version checks per worker
+
+# API token settings
+AUTH_TOKEN_TTL = 86400  # Lifetime of a login token (seconds)
+AUTH_TOKEN_REMEMBER_TTL = 30 * 86400  # Lifetime when "remember me" is checked
+AUTH_TOKEN_CACHE_TTL = 300  # Seconds a resolved token is served from the cache
+
+# Reference data cache settings
+REFERENCE_CACHE_ENABLE = True
+REFERENCE_CACHE_MODELS = [
+    'core.School',
+    'core.SchoolYear',
+    'core.Term',
+    'core.Department',
+    'curriculum.Course',
+]
+REFERENCE_VERSION_CHECK_INTERVAL = 5  # Seconds between reference version checks per worker
+REFERENCE_LOCAL_MAX_ENTRIES = 1000  # Entries each worker keeps in memory
+
+# JSON settings
+JSON_BACKEND = os.environ.get('JSON_BACKEND', 'auto')  # 'auto' (orjson if installed), 'orjson' or 'json'
+
+# AR aging report settings
+AR_AGING_CACHE_TTL = 900  # Seconds a report is cached per school and as-of date (0 disables)
+
+# Overdue sweep settings
+OVERDUE_NOTIFICATION_BATCH_SIZE = 1000  # Notifications written per bulk_create
+
+# Document numbering settings
+NUMBER_BLOCK_SIZE = 20  # Invoice/receipt numbers each worker reserves per round trip
+
+# Invoice generation settings
+INVOICE_GENERATION_CHUNK_SIZE = 500  # Students invoiced per transaction
+INVOICE_DUE_DAYS = 30  # Default due date offset when no fee item has a due date
+
+# Export settings
+EXPORT_CHUNK_SIZE = 2000  # Rows fetched per server-side cursor round trip and flushed per chunk
+
+# Compiled serializer settings
+COMPILED_SERIALIZERS_ENABLE = True  # Serve eligible list endpoints from values() rows
+
+# Conditional GET settings
+CONDITIONAL_GET_ENABLE = True  # Answer unchanged list/detail polls with 304 Not Modified
+
+# Settings registry settings
+SETTINGS_REGISTRY_REFRESH_INTERVAL = 5  # Seconds between SystemSetting/SecuritySetting version checks
+
+# Profile resolver settings
+PROFILE_CACHE_TTL = 60  # Seconds a user's Student/StaffMember lookups are cached
+
+# Brute-force login detection settings
+BRUTE_FORCE_WINDOW = 3600  # Sliding window for failed login counters (seconds)
+BRUTE_FORCE_ACCOUNT_THRESHOLD = 5  # Failures per account before it is locked
+BRUTE_FORCE_IP_THRESHOLD = 20  # Failures per IP before the address is blocked
+BRUTE_FORCE_LOCK_DURATION = 1800  # Seconds an account stays locked
+BRUTE_FORCE_BLOCK_DURATION = 86400  # Seconds an address stays blocked
+
+# Audit log buffer settings
+AUDIT_BUFFER_ENABLE = True
+AUDIT_BUFFER_BATCH_SIZE = 100  # Queued records that trigger a flush
+AUDIT_BUFFER_FLUSH_INTERVAL = 2.0  # Seconds between background flushes
+AUDIT_BUFFER_MAX_SIZE = 10000  # Records queued before writes become synchronous
+
+# Query instrumentation settings
+QUERY_INSTRUMENTATION_ENABLE = True
+QUERY_STATS_WINDOW = 500  # Samples kept per endpoint
+QUERY_N_PLUS_ONE_THRESHOLD = 5  # Repeats of one query shape that flag an N+1
+
+# Pagination settings
+MAX_PAGE_SIZE = 100  # Largest ?page_size= a client may request
@@ -33,13 +33,20 @@ class DisableMigrations:
 
 MIGRATION_MODULES = DisableMigrations()
 
-# Cache settings for tests
+# Cache settings for tests: the in-process stand-in for every namespace
 CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-    }
+    alias: dict(
+        config,
+        BACKEND='apps.core.cache_backends.LocalCache',
+        LOCATION=f"test-{alias}",
+        OPTIONS={'MAX_ENTRIES': CACHE_NAMESPACES[alias]['MAX_ENTRIES']},
+    )
+    for alias, config in CACHES.items()
 }
 
+# Write audit records synchronously so tests can assert on them
+AUDIT_BUFFER_ENABLE = False
+
 # Use console email backend for tests
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
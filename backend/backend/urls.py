@@ -42,6 +42,7 @@ urlpatterns = [
     path('api/marketing/', include('apps.marketing.urls')),
     path('api/quality/', include('apps.quality.urls')),
     path('api/security/', include('security.urls')),  # Add security URLs
+    path('api/audit/', include('audit.urls')),
 ]
 
 # Serve media files in development
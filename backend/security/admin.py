@@ -3,7 +3,7 @@ from .models import BlockedIP, SecuritySetting, UserSecurityProfile
 
 @admin.register(BlockedIP)
 class BlockedIPAdmin(admin.ModelAdmin):
-    list_display = ('ip_address', 'blocked_at', 'blocked_until', 'is_permanent', 'is_active')
+    list_display = ('ip_address', 'prefix_length', 'blocked_at', 'blocked_until', 'is_permanent', 'is_active')
     list_filter = ('is_permanent', 'blocked_at')
     search_fields = ('ip_address', 'reason')
     readonly_fields = ('blocked_at',)
@@ -13,10 +13,9 @@ class BlockedIPAdmin(admin.ModelAdmin):
         from django.utils import timezone
         queryset.update(is_permanent=False, blocked_until=timezone.now())
         
-        # Clear cache entries
-        from django.core.cache import cache
-        for ip in queryset:
-            cache.delete(f"blocked_ip_{ip.ip_address}")
+        # update() skips signals, so notify the workers directly
+        from .blocklist import record_changes
+        record_changes(queryset.values_list('id', flat=True))
             
     unblock_ips.short_description = "Unblock selected IPs"
     
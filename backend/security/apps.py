@@ -6,4 +6,7 @@ class SecurityConfig(AppConfig):
     name = 'security'
 
     def ready(self):
-        import security.signals
\ No newline at end of file
+        import security.signals
+        from .registry import security_settings
+
+        security_settings.connect()
\ No newline at end of file
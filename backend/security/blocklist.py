@@ -0,0 +1,195 @@
+"""
+In-process table of blocked addresses and subnets.
+
+Each worker keeps the active BlockedIP rows in memory, grouped by IP
+version and prefix length: ``{4: {24: {network_int: {id: expires_at}}}}``.
+Several rows may name the same subnet, so each slot holds every one of
+them. A lookup masks the address once per distinct prefix length in use
+and probes a dict, so checking a request costs no I/O and a handful of integer
+operations however many blocks exist.
+
+Writes to BlockedIP bump a version counter in the shared security cache
+and record which rows changed. Workers compare their version with the
+shared one at most every BLOCKED_IP_REFRESH_INTERVAL seconds and re-read
+only the changed rows, falling back to a full reload when the change log
+has expired.
+"""
+import ipaddress
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.core.cache import SECURITY, get_cache, incr
+
+VERSION_KEY = 'blocked_ips:version'
+CHANGE_KEY = 'blocked_ips:change:{}'
+
+# Change log entries live long enough for idle workers to catch up
+CHANGE_LOG_TIMEOUT = 86400
+
+logger = logging.getLogger(__name__)
+
+
+def parse_network(ip_address, prefix_length=None):
+    """Return the ip_network for an address and optional prefix length"""
+    if prefix_length is None:
+        return ipaddress.ip_network(ip_address)
+    return ipaddress.ip_network(f"{ip_address}/{prefix_length}", strict=False)
+
+
+def record_changes(ids):
+    """
+    Tell every worker that the BlockedIP rows in `ids` were created,
+    changed or deleted
+    """
+    ids = list(ids)
+    if not ids:
+        return
+    version = incr(SECURITY, VERSION_KEY, timeout=None)
+    get_cache(SECURITY).set(CHANGE_KEY.format(version), ids, CHANGE_LOG_TIMEOUT)
+
+
+class BlockList:
+    """
+    Longest-prefix lookup table of active IP blocks for one worker
+    """
+
+    def __init__(self):
+        self._tables = {4: {}, 6: {}}
+        self._locations = {}
+        self.version = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+
+    @property
+    def refresh_interval(self):
+        return getattr(settings, 'BLOCKED_IP_REFRESH_INTERVAL', 5)
+
+    @staticmethod
+    def _add(tables, locations, block):
+        try:
+            network = parse_network(block.ip_address, block.prefix_length)
+        except (TypeError, ValueError):
+            # One bad row must not take every lookup down with it
+            logger.warning("Skipping blocked IP %s: invalid network %s", block.id, block)
+            return
+        expires_at = None if block.is_permanent else block.blocked_until.timestamp()
+        key = int(network.network_address)
+        table = tables[network.version].setdefault(network.prefixlen, {})
+        # Slots are replaced rather than mutated, since the previous table may
+        # still be read by other threads
+        table[key] = {**table.get(key, {}), block.id: expires_at}
+        locations[block.id] = (network.version, network.prefixlen, key)
+
+    @staticmethod
+    def _remove(tables, locations, block_id):
+        location = locations.pop(block_id, None)
+        if location is None:
+            return
+        version, prefixlen, key = location
+        table = tables[version].get(prefixlen, {})
+        entries = {entry_id: expires_at for entry_id, expires_at in table.get(key, {}).items()
+                   if entry_id != block_id}
+        if entries:
+            table[key] = entries
+        else:
+            table.pop(key, None)
+        if not table:
+            tables[version].pop(prefixlen, None)
+
+    def _active_blocks(self):
+        from .models import BlockedIP
+
+        return BlockedIP.objects.filter(
+            Q(is_permanent=True) | Q(blocked_until__gt=timezone.now())
+        ).only('id', 'ip_address', 'prefix_length', 'is_permanent', 'blocked_until')
+
+    def _swap(self, tables, locations, version):
+        # Lookups read self._tables without locking, so tables are rebuilt
+        # aside and swapped in with one assignment
+        self._tables = tables
+        self._locations = locations
+        self.version = version
+        self._checked_at = time.monotonic()
+
+    def reload(self, version=None):
+        """Rebuild the table from every active block"""
+        tables, locations = {4: {}, 6: {}}, {}
+        for block in self._active_blocks():
+            self._add(tables, locations, block)
+        with self._lock:
+            self._swap(tables, locations, version)
+
+    def apply_changes(self, ids, version):
+        """Re-read only the rows in `ids`"""
+        active = {block.id: block for block in self._active_blocks().filter(id__in=ids)}
+        with self._lock:
+            tables = {
+                ip_version: {prefixlen: dict(table) for prefixlen, table in by_prefix.items()}
+                for ip_version, by_prefix in self._tables.items()
+            }
+            locations = dict(self._locations)
+            for block_id in ids:
+                self._remove(tables, locations, block_id)
+                if block_id in active:
+                    self._add(tables, locations, active[block_id])
+            self._swap(tables, locations, version)
+
+    def refresh(self, force=False):
+        """
+        Bring the table up to date with the shared version counter, at most
+        once per refresh interval unless `force` is set
+        """
+        if not force and self.version is not None:
+            if time.monotonic() - self._checked_at < self.refresh_interval:
+                return
+
+        cache = get_cache(SECURITY)
+        version = cache.get(VERSION_KEY, 0)
+        if self.version is None or version < self.version:
+            self.reload(version)
+            return
+        if version == self.version:
+            self._checked_at = time.monotonic()
+            return
+
+        keys = [CHANGE_KEY.format(v) for v in range(self.version + 1, version + 1)]
+        changes = cache.get_many(keys) if len(keys) <= 1000 else {}
+        if len(changes) != len(keys):
+            # Part of the change log expired; start over
+            self.reload(version)
+            return
+        ids = {block_id for key in keys for block_id in changes[key]}
+        self.apply_changes(ids, version)
+
+    def find(self, ip_address):
+        """Return the id of the block covering `ip_address`, or None"""
+        self.refresh()
+        try:
+            address = ipaddress.ip_address(ip_address)
+        except (TypeError, ValueError):
+            return None
+
+        value = int(address)
+        bits = address.max_prefixlen
+        now = time.time()
+        # Longest prefix first, so the most specific block wins
+        tables = self._tables[address.version]
+        for prefixlen, table in sorted(tables.items(), reverse=True):
+            shift = bits - prefixlen
+            entries = table.get((value >> shift) << shift)
+            if entries:
+                for block_id, expires_at in entries.items():
+                    if expires_at is None or expires_at > now:
+                        return block_id
+        return None
+
+    def is_blocked(self, ip_address):
+        return self.find(ip_address) is not None
+
+
+blocklist = BlockList()
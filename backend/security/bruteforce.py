@@ -0,0 +1,173 @@
+"""
+Brute-force login detection on the shared cache.
+
+Every failed login is counted against the client IP and against the
+account it targeted, using the sliding-window counters from
+security.ratelimit. A failure therefore costs two atomic cache increments
+and no database reads. The database is only touched when a counter first
+crosses a threshold, and again on the next failure over it once the
+resulting lock or block has run out:
+
+* BRUTE_FORCE_ACCOUNT_THRESHOLD failures for one account lock its
+  security profile and raise a SecurityAlert for the account owner.
+* BRUTE_FORCE_IP_THRESHOLD failures from one address block the address
+  (a BlockedIP, picked up by every worker's block list) and record a
+  SecurityLog entry.
+
+Both thresholds can be tuned at runtime with the
+``brute_force_account_threshold`` and ``brute_force_ip_threshold``
+SecuritySetting rows, read from the in-process security_settings registry.
+
+Alerts and logs go through the audit buffer, so they are written in the
+background with the rest of the audit trail.
+"""
+from collections import namedtuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from apps.core.cache import SECURITY, get_cache
+from audit.buffer import audit_buffer
+
+from .ratelimit import SlidingWindowRateLimiter
+from .registry import security_settings
+
+FailureResult = namedtuple('FailureResult', ['ip_failures', 'account_failures', 'account_locked', 'ip_blocked'])
+
+
+class BruteForceDetector:
+    """
+    Sliding failure counters per IP and per account, with threshold actions
+    """
+
+    def __init__(self, namespace=SECURITY):
+        self.namespace = namespace
+        self.counter = SlidingWindowRateLimiter(namespace)
+
+    @property
+    def window(self):
+        return getattr(settings, 'BRUTE_FORCE_WINDOW', 3600)
+
+    @property
+    def account_threshold(self):
+        default = getattr(settings, 'BRUTE_FORCE_ACCOUNT_THRESHOLD', getattr(settings, 'MAX_LOGIN_ATTEMPTS', 5))
+        return security_settings.get('brute_force_account_threshold', default, int)
+
+    @property
+    def ip_threshold(self):
+        return security_settings.get('brute_force_ip_threshold', getattr(settings, 'BRUTE_FORCE_IP_THRESHOLD', 20), int)
+
+    @property
+    def lock_duration(self):
+        return getattr(settings, 'BRUTE_FORCE_LOCK_DURATION', 1800)
+
+    @property
+    def block_duration(self):
+        return getattr(settings, 'BRUTE_FORCE_BLOCK_DURATION', 86400)
+
+    @staticmethod
+    def normalize(identifier):
+        return (identifier or '').strip().lower()
+
+    def _account_key(self, identifier):
+        return f"login_failures:account:{self.normalize(identifier)}"
+
+    def _ip_key(self, ip_address):
+        return f"login_failures:ip:{ip_address}"
+
+    def _first_crossing(self, key, count, threshold, duration):
+        # cache.add is atomic, so only one worker acts; the marker lasts as
+        # long as the lock or block, so the next failure after it re-applies it
+        if count < threshold:
+            return False
+        return get_cache(self.namespace).add(f"{key}:tripped", True, duration)
+
+    def record_failure(self, ip_address, identifier):
+        """
+        Count a failed login for `identifier` from `ip_address` and act on
+        any threshold crossed that is not already being enforced
+        """
+        account_failures = 0
+        account_locked = ip_blocked = False
+
+        if identifier:
+            key = self._account_key(identifier)
+            account_failures = int(self.counter.add(key, self.window))
+            if self._first_crossing(key, account_failures, self.account_threshold, self.lock_duration):
+                account_locked = self.lock_account(identifier, account_failures, ip_address)
+
+        ip_failures = 0
+        if ip_address:
+            key = self._ip_key(ip_address)
+            ip_failures = int(self.counter.add(key, self.window))
+            if self._first_crossing(key, ip_failures, self.ip_threshold, self.block_duration):
+                ip_blocked = self.block_ip(ip_address, ip_failures)
+
+        return FailureResult(ip_failures, account_failures, account_locked, ip_blocked)
+
+    def record_success(self, identifier):
+        """Clear the account's failure count after a successful login"""
+        key = self._account_key(identifier)
+        self.counter.reset(key, self.window)
+        get_cache(self.namespace).delete(f"{key}:tripped")
+
+    def account_failures(self, identifier):
+        """Return the failures counted for `identifier` in the current window"""
+        return int(self.counter.count(self._account_key(identifier), self.window))
+
+    def lock_account(self, identifier, attempts, ip_address=None):
+        """Lock the security profile of the account behind `identifier`"""
+        from audit.models import SecurityAlert
+        from .models import UserSecurityProfile
+
+        User = get_user_model()
+        user = User.objects.filter(email__iexact=self.normalize(identifier)).first()
+        if user is None:
+            return False
+
+        UserSecurityProfile.objects.filter(user=user).update(
+            failed_login_attempts=attempts,
+            account_locked=True,
+            lock_reason=f"Exceeded maximum failed login attempts ({self.account_threshold})",
+            locked_until=timezone.now() + timezone.timedelta(seconds=self.lock_duration),
+        )
+        audit_buffer.add(SecurityAlert(
+            user=user,
+            type='MULTIPLE_FAILED_LOGINS',
+            details=f"{attempts} failed login attempts in the last hour, latest from IP {ip_address}",
+            severity='MEDIUM',
+            ip_address=ip_address
+        ))
+        return True
+
+    def block_ip(self, ip_address, attempts):
+        """Block `ip_address` for the configured duration"""
+        from .models import BlockedIP, SecurityLog
+
+        blocked_until = timezone.now() + timezone.timedelta(seconds=self.block_duration)
+        block, created = BlockedIP.objects.get_or_create(
+            ip_address=ip_address,
+            defaults={
+                'reason': f"Automated block after {attempts} failed login attempts",
+                'blocked_until': blocked_until,
+                'is_permanent': False
+            }
+        )
+        if not created and not block.is_active:
+            # Renew an expired block; save() tells the other workers
+            block.reason = f"Automated block after {attempts} failed login attempts"
+            block.blocked_until = blocked_until
+            block.save(update_fields=['reason', 'blocked_until'])
+
+        audit_buffer.add(SecurityLog(
+            event_type='ip_blocked',
+            description=f"Blocked {ip_address} after {attempts} failed login attempts",
+            ip_address=ip_address,
+            severity='high',
+            additional_data={'failed_attempts': attempts, 'blocked_until': blocked_until.isoformat()}
+        ))
+        return True
+
+
+detector = BruteForceDetector()
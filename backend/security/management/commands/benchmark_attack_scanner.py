@@ -0,0 +1,89 @@
+import random
+import re
+import time
+
+from django.core.management.base import BaseCommand
+
+from security.scanner import ATTACK_SIGNATURES, AttackScanner
+
+# Request mix: mostly ordinary API traffic, with a few form posts and attacks
+CLEAN_REQUESTS = [
+    ('/api/students/students/', 'page=2&page_size=20', b''),
+    ('/api/students/attendance/', 'start_date=2024-09-01&end_date=2024-09-30', b''),
+    ('/api/finance/invoices/', 'status=overdue&pagination=cursor', b''),
+    ('/api/curriculum/courses/42/', '', b''),
+    ('/api/core/notifications/unread_count/', '', b''),
+    ('/api/auth/login/', '', b'username=jdoe&password=s3cretpassword&remember=on'),
+    ('/api/students/notes/', '', (b'title=Progress+report&content=' + b'Great+term+overall.+' * 200)),
+]
+
+ATTACK_REQUESTS = [
+    ('/api/students/students/', "id=1' OR '1'='1", b''),
+    ('/api/curriculum/courses/', 'search=<script>alert(1)</script>', b''),
+    ('/api/../../etc/passwd', '', b''),
+    ('/api/auth/login/', '', b'username=admin&password=x+union+select+password(+from+users'),
+]
+
+
+class LegacyScanner:
+    """
+    The previous implementation: uncompiled patterns searched one by one
+    """
+
+    def __init__(self):
+        self.url_patterns = [pattern for _, pattern, _, _ in ATTACK_SIGNATURES]
+        self.body_patterns = [pattern for _, pattern, in_body, _ in ATTACK_SIGNATURES if in_body]
+
+    def scan(self, path, query_string, body):
+        content = body.decode('utf-8', errors='ignore')
+        for pattern in self.url_patterns:
+            if re.search(pattern, path) or re.search(pattern, query_string):
+                return True
+        for pattern in self.body_patterns:
+            if re.search(pattern, content):
+                return True
+        return False
+
+
+class Command(BaseCommand):
+    help = 'Compares the legacy and single-pass attack scanners on a realistic request mix'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=20000, help='Number of requests to scan')
+        parser.add_argument('--attack-ratio', type=float, default=0.02, help='Share of malicious requests')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed for the request mix')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        mix = [
+            rng.choice(ATTACK_REQUESTS if rng.random() < options['attack_ratio'] else CLEAN_REQUESTS)
+            for _ in range(options['requests'])
+        ]
+
+        legacy = LegacyScanner()
+        scanner = AttackScanner()
+
+        # Both scanners must agree on which requests are attacks
+        for path, query, body in CLEAN_REQUESTS + ATTACK_REQUESTS:
+            if bool(legacy.scan(path, query, body)) != bool(scanner.scan(path, query, body)):
+                self.stdout.write(self.style.ERROR(f'Scanners disagree on {path}?{query}'))
+                return
+        scanner.reset()
+
+        results = {}
+        for name, scan in (('legacy', legacy.scan), ('single-pass', scanner.scan)):
+            start = time.perf_counter()
+            detected = sum(1 for path, query, body in mix if scan(path, query, body))
+            elapsed = time.perf_counter() - start
+            results[name] = elapsed
+            self.stdout.write(
+                f'{name:>12}: {elapsed * 1000:8.1f} ms total, '
+                f'{elapsed / len(mix) * 1e6:6.2f} us/request, {detected} attacks'
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Speed-up: {results['legacy'] / results['single-pass']:.1f}x"
+        ))
+        for rule, hits in scanner.hit_counts().items():
+            if hits:
+                self.stdout.write(f'  {rule}: {hits}')
@@ -1,20 +1,37 @@
 import re
-import time
 from django.http import HttpResponse, HttpResponseForbidden
 from django.conf import settings
 from django.utils import timezone
-from django.core.cache import cache
 from django.urls import is_valid_path
-from django.db import models
 
+from apps.core.cache import SECURITY, get_cache, incr
+
+from .blocklist import blocklist
 from .models import BlockedIP, SecurityLog
+from .ratelimit import SlidingWindowRateLimiter, route_for_path
+from .scanner import ScanMatch, scanner
 
 
 class RateLimitMiddleware:
     """Middleware to implement rate limiting for API endpoints"""
     
+    # Default rate limits for different endpoints: (requests, seconds)
+    rate_limits = (
+        (r'^/api/auth/login', (5, 60)),  # 5 requests per 60 seconds for login
+        (r'^/api/auth/register', (3, 60)),  # 3 requests per 60 seconds for registration
+        (r'^/api/auth/password', (3, 300)),  # 3 requests per 5 minutes for password reset
+        (r'^/api/', (60, 60)),  # 60 requests per minute for general API use
+    )
+    
     def __init__(self, get_response):
         self.get_response = get_response
+        self.limiter = SlidingWindowRateLimiter()
+        
+        # Compile the path patterns once instead of on every request
+        rate_limits = getattr(settings, 'RATE_LIMITS', None) or self.rate_limits
+        self.compiled_rate_limits = [
+            (re.compile(pattern), tuple(limit)) for pattern, limit in rate_limits
+        ]
     
     def __call__(self, request):
         if not getattr(settings, 'RATE_LIMIT_ENABLE', True):
@@ -29,11 +46,14 @@ class RateLimitMiddleware:
         
         if rate_limit:
             # Check if request should be rate limited
-            if self.should_be_rate_limited(request, rate_limit):
-                return HttpResponse(
+            result = self.should_be_rate_limited(request, rate_limit)
+            if not result.allowed:
+                response = HttpResponse(
                     "Rate limit exceeded. Please try again later.",
                     status=429
                 )
+                response['Retry-After'] = str(result.retry_after)
+                return response
         
         return self.get_response(request)
     
@@ -42,51 +62,38 @@ class RateLimitMiddleware:
         Determine rate limit based on the path pattern
         Returns (requests, seconds) tuple if applicable, None otherwise
         """
-        # Default rate limits for different endpoints
-        rate_limits = {
-            r'^/api/auth/login': (5, 60),  # 5 requests per 60 seconds for login
-            r'^/api/auth/register': (3, 60),  # 3 requests per 60 seconds for registration
-            r'^/api/auth/password': (3, 300),  # 3 requests per 5 minutes for password reset
-            r'^/api/': (60, 60),  # 60 requests per minute for general API use
-        }
-        
-        # Check each pattern against the request path
-        for pattern, limit in rate_limits.items():
-            if re.match(pattern, request.path):
+        for pattern, limit in self.compiled_rate_limits:
+            if pattern.match(request.path):
                 return limit
                 
         return None
     
-    def should_be_rate_limited(self, request, rate_limit):
+    def get_rate_limit_key(self, request, rate_limit):
         """
-        Check if the request should be rate limited based on client IP
+        Build the counter key from the route pattern and the client, so
+        that e.g. /api/students/students/1/ and /2/ share a bucket
         """
-        ip = self.get_client_ip(request)
+        route = route_for_path(request.path_info)
+        if route is None:
+            # Unknown URLs share one bucket per limit instead of one per path
+            route = 'unresolved:%s:%s' % rate_limit
         
         # For authenticated users, use user ID as part of the cache key
-        if request.user.is_authenticated:
-            key = f"rate_limit_{request.path}_{request.user.id}"
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            client = f"user:{user.id}"
         else:
-            key = f"rate_limit_{request.path}_{ip}"
-            
+            client = f"ip:{self.get_client_ip(request)}"
+        return f"rate_limit:{route}:{client}"
+    
+    def should_be_rate_limited(self, request, rate_limit):
+        """
+        Count the request against its sliding window and return the
+        limiter result
+        """
         max_requests, seconds = rate_limit
-        
-        # Get current timestamps for this key
-        timestamps = cache.get(key, [])
-        now = time.time()
-        
-        # Filter out timestamps older than the window
-        valid_timestamps = [t for t in timestamps if t > now - seconds]
-        
-        # Check if rate limit is exceeded
-        if len(valid_timestamps) >= max_requests:
-            return True
-            
-        # Add current timestamp and update cache
-        valid_timestamps.append(now)
-        cache.set(key, valid_timestamps, seconds * 2)  # Keep data for twice the window for safety
-        
-        return False
+        key = self.get_rate_limit_key(request, rate_limit)
+        return self.limiter.hit(key, max_requests, seconds)
     
     def get_client_ip(self, request):
         """Extract the client IP address from the request"""
@@ -103,24 +110,10 @@ class SecurityMiddleware:
     
     def __init__(self, get_response):
         self.get_response = get_response
+        self.limiter = SlidingWindowRateLimiter()
         
-        # Compile common attack patterns
-        self.sql_injection_patterns = [
-            r"(\%27)|(\')|(\-\-)|(\%23)|(#)",
-            r"((\%3D)|(=))[^\n]*((\%27)|(\')|(\-\-)|(\%3B)|(;))",
-            r"(union).*(select).*(\()",
-        ]
-        
-        self.xss_patterns = [
-            r"<[^\w<>]*(?:[^<>\"'\s]*:)?[^\w<>]*(?:\W*s\W*c\W*r\W*i\W*p\W*t|\W*i\W*m\W*g|\W*o\W*n\W*e\W*r\W*r\W*o\W*r|\W*s\W*t\W*y\W*l\W*e|\W*t\W*a\W*b\W*i\W*n\W*d\W*e\W*x|\W*a\W*l\W*e\W*r\W*t|\W*o\W*n\W*f\W*o\W*c\W*u\W*s)",
-            r"(javascript|vbscript):",
-            r"eval\((.*)\)"
-        ]
-        
-        self.path_traversal_patterns = [
-            r"\.{2}/",
-            r"\.{2}\\",
-        ]
+        # All attack signatures are compiled once, at import time
+        self.scanner = scanner
         
     def __call__(self, request):
         # Check if the IP is blocked
@@ -128,9 +121,10 @@ class SecurityMiddleware:
             return HttpResponseForbidden("Access denied: Your IP address has been blocked.")
         
         # Check for suspicious patterns in request
-        if self.check_for_attacks(request):
+        attack = self.check_for_attacks(request)
+        if attack:
             # Log the attack and potentially block the IP
-            self.handle_attack_attempt(request)
+            self.handle_attack_attempt(request, attack)
             return HttpResponseForbidden("Access denied: Security violation detected.")
         
         # Rate limiting for specific endpoints
@@ -144,65 +138,32 @@ class SecurityMiddleware:
         return response
     
     def is_ip_blocked(self, request):
-        """Check if the requesting IP is blocked"""
-        ip_address = self.get_client_ip(request)
-        
-        # Check cache first to avoid database lookup
-        cache_key = f"blocked_ip_{ip_address}"
-        blocked = cache.get(cache_key)
-        if blocked is not None:
-            return blocked
-        
-        # If not in cache, check database
-        is_blocked = BlockedIP.objects.filter(
-            ip_address=ip_address
-        ).filter(
-            models.Q(is_permanent=True) | 
-            models.Q(blocked_until__gt=timezone.now())
-        ).exists()
-        
-        # Cache the result
-        cache.set(cache_key, is_blocked, 300)  # Cache for 5 minutes
-        
-        return is_blocked
+        """Check if the requesting IP, or a subnet containing it, is blocked"""
+        # Answered from the in-process block list, without any I/O
+        return blocklist.is_blocked(self.get_client_ip(request))
     
     def check_for_attacks(self, request):
-        """Check request for signs of common attacks"""
+        """
+        Check request for signs of common attacks. Returns the ScanMatch
+        for the rule that matched, or None
+        """
         # Get the path, query string, and request body content
         path = request.path_info
         query_string = request.META.get('QUERY_STRING', '')
-        content = ""
+        content = b""
         
         # Try to get request body if it's a POST request with form data
         if request.method == 'POST' and request.content_type == 'application/x-www-form-urlencoded':
-            content = request.body.decode('utf-8', errors='ignore')
+            content = request.body
         
         # Check path for valid URL to prevent path traversal
         if not is_valid_path(path):
-            return True
-        
-        # Check for path traversal
-        for pattern in self.path_traversal_patterns:
-            if re.search(pattern, path) or re.search(pattern, query_string):
-                return True
-        
-        # Check for SQL injection
-        for pattern in self.sql_injection_patterns:
-            if (re.search(pattern, path) or 
-                re.search(pattern, query_string) or 
-                re.search(pattern, content)):
-                return True
-        
-        # Check for XSS
-        for pattern in self.xss_patterns:
-            if (re.search(pattern, path) or 
-                re.search(pattern, query_string) or 
-                re.search(pattern, content)):
-                return True
-        
-        return False
+            return ScanMatch('invalid_path', 'path')
+        
+        # Path traversal, SQL injection and XSS signatures in one pass per input
+        return self.scanner.scan(path, query_string, content)
     
-    def handle_attack_attempt(self, request):
+    def handle_attack_attempt(self, request, attack=None):
         """Log and handle a detected attack attempt"""
         ip_address = self.get_client_ip(request)
         
@@ -220,7 +181,11 @@ class SecurityMiddleware:
         SecurityAlert.objects.create(
             user=user if user else User.objects.filter(is_superuser=True).first(),
             type='ATTACK_ATTEMPT',
-            details=f"Potential security attack detected from IP {ip_address}. Path: {request.path}, Method: {request.method}",
+            details=(
+                f"Potential security attack detected from IP {ip_address}. Path: {request.path}, "
+                f"Method: {request.method}"
+                + (f", Rule: {attack.rule} ({attack.source})" if attack else "")
+            ),
             severity='HIGH',
             status='NEW',
             ip_address=ip_address
@@ -228,8 +193,7 @@ class SecurityMiddleware:
         
         # Potentially block repeated offenders
         attack_key = f"attack_attempts_{ip_address}"
-        attempts = cache.get(attack_key, 0) + 1
-        cache.set(attack_key, attempts, 3600)  # Store for 1 hour
+        attempts = incr(SECURITY, attack_key, timeout=3600)  # Store for 1 hour
         
         # If multiple attacks are detected, block the IP
         if attempts >= getattr(settings, 'ATTACK_ATTEMPT_THRESHOLD', 3):
@@ -242,7 +206,7 @@ class SecurityMiddleware:
                 }
             )
             # Clear the counter after blocking
-            cache.delete(attack_key)
+            get_cache(SECURITY).delete(attack_key)
     
     def should_rate_limit(self, request):
         """Check if the request should be rate-limited"""
@@ -255,20 +219,10 @@ class SecurityMiddleware:
         # Rate limit key is specific to the IP and path
         rate_key = f"rate_limit_{ip_address}_{request.path}"
         
-        # Get current count and increment
-        count = cache.get(rate_key, 0) + 1
-        
         # Different endpoints might have different rate limits
         limit = self.get_rate_limit_for_endpoint(request.path)
         
-        if count > limit:
-            return True
-        
-        # Set the new count with TTL
-        ttl = 60  # 1 minute window
-        cache.set(rate_key, count, ttl)
-        
-        return False
+        return not self.limiter.hit(rate_key, limit, 60).allowed  # 1 minute window
     
     def is_rate_limited_endpoint(self, path):
         """Check if the endpoint should have rate limiting applied"""
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("security", "0002_usersecurityprofile_last_login"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="blockedip",
+            name="prefix_length",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                help_text="Block the whole subnet, e.g. 24 blocks ip_address/24. Leave empty for a single address.",
+                null=True,
+                verbose_name="Prefix Length",
+            ),
+        ),
+    ]
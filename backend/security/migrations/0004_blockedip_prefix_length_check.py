@@ -0,0 +1,38 @@
+# Generated by Django 5.0.2 on 2026-10-16 23:49
+
+import django.core.validators
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Q
+
+
+def clear_invalid_prefix_lengths(apps, schema_editor):
+    """
+    Narrow blocks whose prefix length does not fit their address to the
+    single address, so the constraint can be added
+    """
+    BlockedIP = apps.get_model('security', 'BlockedIP')
+    BlockedIP.objects.filter(
+        Q(prefix_length__gt=128) | Q(prefix_length__gt=32) & ~Q(ip_address__contains=':')
+    ).update(prefix_length=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('security', '0003_blockedip_prefix_length'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='blockedip',
+            name='prefix_length',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Block the whole subnet, e.g. 24 blocks ip_address/24. Leave empty for a single address.', null=True, validators=[django.core.validators.MaxValueValidator(128)], verbose_name='Prefix Length'),
+        ),
+        migrations.RunPython(clear_invalid_prefix_lengths, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='blockedip',
+            constraint=models.CheckConstraint(check=models.Q(('prefix_length__isnull', True), ('prefix_length__lte', 32), models.Q(('ip_address__contains', ':'), ('prefix_length__lte', 128)), _connector='OR'), name='blockedip_prefix_length_fits_address'),
+        ),
+    ]
@@ -1,4 +1,7 @@
+from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
@@ -7,6 +10,13 @@ from django.utils import timezone
 class BlockedIP(models.Model):
     """Model to store blocked IP addresses"""
     ip_address = models.GenericIPAddressField(unique=True, verbose_name="IP Address")
+    prefix_length = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        validators=[MaxValueValidator(128)],
+        verbose_name="Prefix Length",
+        help_text="Block the whole subnet, e.g. 24 blocks ip_address/24. Leave empty for a single address."
+    )
     reason = models.TextField(blank=True, null=True)
     blocked_at = models.DateTimeField(auto_now_add=True)
     blocked_until = models.DateTimeField(null=True, blank=True)
@@ -24,10 +34,42 @@ class BlockedIP(models.Model):
         verbose_name = "Blocked IP"
         verbose_name_plural = "Blocked IPs"
         ordering = ['-blocked_at']
+        constraints = [
+            models.CheckConstraint(
+                check=(
+                    Q(prefix_length__isnull=True)
+                    | Q(prefix_length__lte=32)
+                    | Q(prefix_length__lte=128, ip_address__contains=':')
+                ),
+                name='blockedip_prefix_length_fits_address',
+            ),
+        ]
     
     def __str__(self):
+        if self.prefix_length is not None:
+            return f"{self.ip_address}/{self.prefix_length}"
         return self.ip_address
     
+    @staticmethod
+    def max_prefix_length(ip_address):
+        """The longest prefix length the address family allows"""
+        return 128 if ':' in ip_address else 32
+    
+    def clean(self):
+        super().clean()
+        if self.ip_address and self.prefix_length is not None:
+            max_length = self.max_prefix_length(self.ip_address)
+            if self.prefix_length > max_length:
+                raise ValidationError({
+                    'prefix_length': f"Must be at most {max_length} for this address."
+                })
+    
+    @property
+    def network(self):
+        """The address or subnet covered by this block"""
+        from .blocklist import parse_network
+        return parse_network(self.ip_address, self.prefix_length)
+    
     @property
     def is_active(self):
         """Check if the block is currently active"""
@@ -122,24 +164,28 @@ class UserSecurityProfile(models.Model):
     
     def reset_failed_attempts(self):
         """Reset failed login attempts counter"""
+        from .bruteforce import detector
+
+        detector.record_success(self.user.email)
         self.failed_login_attempts = 0
         self.save(update_fields=['failed_login_attempts'])
     
-    def increment_failed_attempts(self):
-        """Increment failed login attempts and lock account if necessary"""
-        self.failed_login_attempts += 1
-        
-        # Check if account should be locked (threshold configurable via settings)
-        from django.conf import settings
-        threshold = getattr(settings, 'MAX_LOGIN_ATTEMPTS', 5)
-        
-        if self.failed_login_attempts >= threshold:
-            self.account_locked = True
-            self.lock_reason = f"Exceeded maximum failed login attempts ({threshold})"
-            # Lock for 30 minutes by default
-            self.locked_until = timezone.now() + timezone.timedelta(minutes=30)
-        
-        self.save()
+    @classmethod
+    def record_login(cls, user_id, when=None):
+        """Reset failed attempts and stamp the login time in one UPDATE"""
+        return cls.objects.filter(user_id=user_id).update(
+            failed_login_attempts=0,
+            last_login=when or timezone.now()
+        )
+    
+    def increment_failed_attempts(self, ip_address=None):
+        """
+        Count a failed login for this account. Counting and locking happen
+        in the brute-force detector, which locks the account at the threshold
+        """
+        from .bruteforce import detector
+
+        return detector.record_failure(ip_address, self.user.email)
         
     def is_locked(self):
         """Check if the account is currently locked"""
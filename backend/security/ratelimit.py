@@ -0,0 +1,83 @@
+"""
+Sliding-window rate limiting on the shared cache.
+
+The limiter keeps two integer counters per key: one for the current fixed
+window and one for the previous window. The request rate over the last
+`period` seconds is estimated by weighting the previous window's count by
+how much of it still overlaps the sliding window. Each hit is a single
+atomic increment, so memory per key is constant and concurrent requests
+cannot overwrite each other's updates.
+"""
+import time
+from collections import namedtuple
+from functools import lru_cache
+
+from django.urls import Resolver404, resolve
+
+from apps.core.cache import RATELIMIT, get_cache, incr
+
+RateLimitResult = namedtuple('RateLimitResult', ['allowed', 'limit', 'remaining', 'retry_after'])
+
+
+@lru_cache(maxsize=2048)
+def route_for_path(path):
+    """
+    Return the URL pattern that `path` resolves to, e.g.
+    ``api/students/students/<pk>/``, so per-object URLs share one bucket
+    """
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return None
+    return match.route
+
+
+class SlidingWindowRateLimiter:
+    """
+    Approximate sliding-window counter backed by the rate limit cache
+    """
+
+    def __init__(self, namespace=RATELIMIT):
+        self.namespace = namespace
+
+    def add(self, key, period, now=None):
+        """
+        Record an event against `key` and return the estimated number of
+        events in the last `period` seconds
+        """
+        now = time.time() if now is None else now
+        window = int(now // period)
+        elapsed = (now - window * period) / period
+
+        # Counters live for two windows so the next window can still read this one
+        current = incr(self.namespace, f"{key}:{window}", timeout=period * 2)
+        previous = get_cache(self.namespace).get(f"{key}:{window - 1}", 0)
+        return previous * (1 - elapsed) + current
+
+    def count(self, key, period, now=None):
+        """Return the estimated number of events in the last `period` seconds"""
+        now = time.time() if now is None else now
+        window = int(now // period)
+        elapsed = (now - window * period) / period
+        counts = get_cache(self.namespace).get_many([f"{key}:{window}", f"{key}:{window - 1}"])
+        return counts.get(f"{key}:{window - 1}", 0) * (1 - elapsed) + counts.get(f"{key}:{window}", 0)
+
+    def reset(self, key, period, now=None):
+        """Forget every event recorded against `key`"""
+        now = time.time() if now is None else now
+        window = int(now // period)
+        get_cache(self.namespace).delete_many([f"{key}:{window}", f"{key}:{window - 1}"])
+
+    def hit(self, key, limit, period, now=None):
+        """
+        Record a request against `key` and report whether it is within
+        `limit` requests per `period` seconds
+        """
+        now = time.time() if now is None else now
+        elapsed = (now - int(now // period) * period) / period
+        estimate = self.add(key, period, now)
+        allowed = estimate <= limit
+        retry_after = 0
+        if not allowed:
+            retry_after = max(1, int(period * (1 - elapsed)) + 1)
+        return RateLimitResult(allowed, limit, max(0, int(limit - estimate)), retry_after)
@@ -0,0 +1,6 @@
+"""
+In-process registry of SecuritySetting rows (see apps.core.settings_registry)
+"""
+from apps.core.settings_registry import SettingsRegistry
+
+security_settings = SettingsRegistry('security.SecuritySetting')
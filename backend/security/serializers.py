@@ -9,10 +9,24 @@ class BlockedIPSerializer(serializers.ModelSerializer):
     class Meta:
         model = BlockedIP
         fields = [
-            'id', 'ip_address', 'reason', 'blocked_at', 
+            'id', 'ip_address', 'prefix_length', 'reason', 'blocked_at', 
             'blocked_until', 'is_permanent', 'is_active', 'created_by'
         ]
         read_only_fields = ['blocked_at', 'created_by']
+    
+    def validate(self, data):
+        """
+        Check that the prefix length fits the address family
+        """
+        ip_address = data.get('ip_address', getattr(self.instance, 'ip_address', None))
+        prefix_length = data.get('prefix_length', getattr(self.instance, 'prefix_length', None))
+        if ip_address and prefix_length is not None:
+            max_length = BlockedIP.max_prefix_length(ip_address)
+            if prefix_length > max_length:
+                raise serializers.ValidationError({
+                    'prefix_length': f"Must be at most {max_length} for this address."
+                })
+        return data
 
 
 class SecuritySettingSerializer(serializers.ModelSerializer):
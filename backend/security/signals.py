@@ -1,10 +1,14 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth import user_logged_in, user_logged_out, user_login_failed
-from django.utils import timezone
 from django.contrib.auth import get_user_model
-from django.core.cache import cache
 
+from apps.authentication.adapters import get_client_ip
+from apps.core.schema import schema
+
+from .blocklist import record_changes
+from .bruteforce import detector
 from .models import UserSecurityProfile, BlockedIP
 
 User = get_user_model()
@@ -18,39 +22,28 @@ def create_security_profile(sender, instance, created, **kwargs):
 @receiver(user_logged_in)
 def on_user_login(sender, request, user, **kwargs):
     """Handle successful login"""
-    if hasattr(user, 'security_profile'):
+    detector.record_success(user.email)
+
+    if schema.has_model(UserSecurityProfile):
         # Reset failed login attempts and update last login time
-        security_profile = user.security_profile
-        security_profile.failed_login_attempts = 0
-        security_profile.last_login = timezone.now()
-        security_profile.save(update_fields=['failed_login_attempts'])
+        UserSecurityProfile.record_login(user.pk)
 
 @receiver(user_login_failed)
 def on_user_login_failed(sender, credentials, request, **kwargs):
-    """Handle failed login attempt"""
-    username = credentials.get('username', '')
-    
-    try:
-        user = User.objects.get(username=username)
-        if hasattr(user, 'security_profile'):
-            # Increment failed login attempts and record the timestamp
-            security_profile = user.security_profile
-            security_profile.increment_failed_attempts()
-            security_profile.last_failed_login = timezone.now()
-            security_profile.save(update_fields=['failed_login_attempts', 'last_failed_login'])
-    except User.DoesNotExist:
-        # User doesn't exist, but we won't give that information away
-        pass
+    """Count the failure against the client IP and the targeted account"""
+    if not schema.has_model(UserSecurityProfile):
+        return
+
+    username = credentials.get('username', credentials.get('email', ''))
+    ip_address = get_client_ip(request) if request else None
+    detector.record_failure(ip_address, username)
 
 @receiver(post_save, sender=BlockedIP)
+@receiver(post_delete, sender=BlockedIP)
 def update_blocked_ip_cache(sender, instance, **kwargs):
     """
-    Update the cache when a BlockedIP instance is created or updated
+    Bump the blocked IP version when a BlockedIP instance is created,
+    updated or deleted, so every worker reloads it once committed
     """
-    cache_key = f"blocked_ip_{instance.ip_address}"
-    # Cache the blocked status for quick lookups
-    if instance.is_active:
-        cache.set(cache_key, True, timeout=86400)  # Cache for 24 hours
-    else:
-        # If no longer blocked, delete from cache
-        cache.delete(cache_key)
+    block_id = instance.id
+    transaction.on_commit(lambda: record_changes([block_id]))
@@ -0,0 +1,93 @@
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.utils import timezone
+from security.blocklist import BlockList
+from security.models import BlockedIP
+
+
+class BlockListTest(TestCase):
+    """
+    Test case for the in-process blocked IP table
+    """
+
+    def setUp(self):
+        self.blocklist = BlockList()
+
+    def block(self, ip_address, prefix_length=None, **kwargs):
+        kwargs.setdefault('is_permanent', True)
+        with self.captureOnCommitCallbacks(execute=True):
+            return BlockedIP.objects.create(ip_address=ip_address, prefix_length=prefix_length, **kwargs)
+
+    def test_single_address_and_subnet_blocks(self):
+        self.block('192.168.1.10')
+        self.block('10.20.0.0', prefix_length=16)
+        self.block('2001:db8::', prefix_length=32)
+
+        self.assertTrue(self.blocklist.is_blocked('192.168.1.10'))
+        self.assertFalse(self.blocklist.is_blocked('192.168.1.11'))
+        self.assertTrue(self.blocklist.is_blocked('10.20.255.1'))
+        self.assertFalse(self.blocklist.is_blocked('10.21.0.1'))
+        self.assertTrue(self.blocklist.is_blocked('2001:db8:1::5'))
+        self.assertFalse(self.blocklist.is_blocked('not-an-ip'))
+
+    def test_lookups_do_not_query_the_database(self):
+        self.block('192.168.1.10')
+        self.blocklist.refresh(force=True)
+
+        with self.assertNumQueries(0):
+            for _ in range(10):
+                self.blocklist.is_blocked('192.168.1.10')
+
+    def test_changes_are_applied_incrementally(self):
+        self.block('192.168.1.10')
+        self.blocklist.refresh(force=True)
+
+        block = self.block('172.16.0.0', prefix_length=12)
+        with self.assertNumQueries(1):
+            self.blocklist.refresh(force=True)
+        self.assertTrue(self.blocklist.is_blocked('172.20.1.1'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            block.delete()
+        self.blocklist.refresh(force=True)
+        self.assertFalse(self.blocklist.is_blocked('172.20.1.1'))
+        self.assertTrue(self.blocklist.is_blocked('192.168.1.10'))
+
+    def test_expired_blocks_are_ignored(self):
+        self.block(
+            '192.168.1.10',
+            is_permanent=False,
+            blocked_until=timezone.now() - timezone.timedelta(minutes=1)
+        )
+        self.block(
+            '192.168.1.11',
+            is_permanent=False,
+            blocked_until=timezone.now() + timezone.timedelta(minutes=1)
+        )
+
+        self.assertFalse(self.blocklist.is_blocked('192.168.1.10'))
+        self.assertTrue(self.blocklist.is_blocked('192.168.1.11'))
+
+    def test_blocks_of_the_same_subnet_are_kept_apart(self):
+        first = self.block('10.0.0.1', prefix_length=24)
+        self.block('10.0.0.2', prefix_length=24)
+        self.blocklist.refresh(force=True)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.blocklist.refresh(force=True)
+        self.assertTrue(self.blocklist.is_blocked('10.0.0.200'))
+
+    def test_prefix_length_must_fit_the_address(self):
+        with self.assertRaises(ValidationError):
+            BlockedIP(ip_address='10.0.0.1', prefix_length=40, is_permanent=True).full_clean()
+        BlockedIP(ip_address='2001:db8::', prefix_length=40, is_permanent=True).full_clean()
+
+    def test_unparsable_rows_are_skipped(self):
+        self.block('192.168.1.10')
+        tables, locations = {4: {}, 6: {}}, {}
+        bad = BlockedIP(id=0, ip_address='10.0.0.1', prefix_length=40, is_permanent=True)
+        with self.assertLogs('security.blocklist', 'WARNING'):
+            BlockList._add(tables, locations, bad)
+        self.assertEqual(locations, {})
+        self.assertTrue(self.blocklist.is_blocked('192.168.1.10'))
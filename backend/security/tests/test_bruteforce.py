@@ -0,0 +1,87 @@
+import time
+from unittest import mock
+from django.contrib.auth import authenticate, get_user_model
+from django.test import TestCase, RequestFactory, override_settings
+from apps.core.cache import SECURITY, get_cache
+from apps.core.schema import schema
+from audit.models import ActivityLog, SecurityAlert
+from security.bruteforce import BruteForceDetector
+from security.models import BlockedIP, SecuritySetting, UserSecurityProfile
+from security.registry import security_settings
+
+User = get_user_model()
+
+
+@override_settings(BRUTE_FORCE_ACCOUNT_THRESHOLD=3, BRUTE_FORCE_IP_THRESHOLD=5)
+class BruteForceDetectorTest(TestCase):
+    """
+    Test case for the cache-backed brute-force detector
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='target',
+            email='target@example.com',
+            password='correct-horse',
+            user_type='admin'
+        )
+        self.detector = BruteForceDetector()
+
+    def tearDown(self):
+        get_cache(SECURITY).clear()
+        security_settings.invalidate()
+
+    def test_account_is_locked_once_at_threshold(self):
+        results = [self.detector.record_failure('10.0.0.1', 'Target@example.com') for _ in range(4)]
+
+        self.assertEqual([result.account_locked for result in results], [False, False, True, False])
+        profile = UserSecurityProfile.objects.get(user=self.user)
+        self.assertTrue(profile.account_locked)
+        self.assertEqual(profile.failed_login_attempts, 3)
+        self.assertEqual(SecurityAlert.objects.filter(type='MULTIPLE_FAILED_LOGINS').count(), 1)
+
+    def test_account_is_locked_again_once_the_lock_expires(self):
+        # Stay inside one counter window so the failures keep counting
+        now = (time.time() // 3600 + 1) * 3600 + 1
+        with mock.patch('time.time', return_value=now):
+            results = [self.detector.record_failure('10.0.0.1', self.user.email) for _ in range(3)]
+        self.assertTrue(results[-1].account_locked)
+
+        with mock.patch('time.time', return_value=now + self.detector.lock_duration + 1):
+            result = self.detector.record_failure('10.0.0.1', self.user.email)
+
+        self.assertTrue(result.account_locked)
+        self.assertEqual(result.account_failures, 4)
+        self.assertEqual(SecurityAlert.objects.filter(type='MULTIPLE_FAILED_LOGINS').count(), 2)
+
+    def test_ip_is_blocked_at_threshold(self):
+        for index in range(5):
+            result = self.detector.record_failure('10.0.0.2', f'user{index}@example.com')
+
+        self.assertTrue(result.ip_blocked)
+        self.assertTrue(BlockedIP.objects.get(ip_address='10.0.0.2').is_active)
+
+    def test_security_setting_overrides_threshold(self):
+        SecuritySetting.objects.create(key='brute_force_account_threshold', value='2')
+
+        results = [self.detector.record_failure('10.0.0.5', self.user.email) for _ in range(2)]
+
+        self.assertEqual([result.account_locked for result in results], [False, True])
+
+    def test_success_clears_account_count(self):
+        self.detector.record_failure('10.0.0.3', self.user.email)
+        self.detector.record_success(self.user.email)
+
+        self.assertEqual(self.detector.account_failures(self.user.email), 0)
+
+    def test_failed_login_signal_counts_without_reading_activity_log(self):
+        request = RequestFactory().post('/api/auth/login/', REMOTE_ADDR='10.0.0.4')
+        schema.table_names()
+        security_settings.rows()
+
+        with self.assertNumQueries(2):
+            # The backend's user lookup and the audit row; nothing is counted in the database
+            authenticate(request=request, username=self.user.email, password='wrong')
+
+        self.assertEqual(self.detector.account_failures(self.user.email), 1)
+        self.assertEqual(ActivityLog.objects.filter(action='LOGIN_FAILED').count(), 1)
@@ -0,0 +1,72 @@
+from django.test import TestCase, RequestFactory
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from apps.core.cache import RATELIMIT, get_cache
+from security.middleware import RateLimitMiddleware
+from security.ratelimit import SlidingWindowRateLimiter
+
+
+class SlidingWindowRateLimiterTest(TestCase):
+    """
+    Test case for the sliding-window rate limiter
+    """
+
+    def setUp(self):
+        self.limiter = SlidingWindowRateLimiter()
+
+    def tearDown(self):
+        get_cache(RATELIMIT).clear()
+
+    def test_requests_over_limit_are_rejected(self):
+        results = [self.limiter.hit('client', 3, 60, now=600).allowed for _ in range(4)]
+
+        self.assertEqual(results, [True, True, True, False])
+
+    def test_previous_window_is_weighted_by_overlap(self):
+        for _ in range(4):
+            self.limiter.hit('client', 4, 60, now=610)
+
+        # Half way through the next window half of the old hits still count
+        self.assertTrue(self.limiter.hit('client', 4, 60, now=690).allowed)
+        self.assertTrue(self.limiter.hit('client', 4, 60, now=690).allowed)
+        self.assertFalse(self.limiter.hit('client', 4, 60, now=690).allowed)
+
+        # Two windows later the old hits no longer count
+        self.assertTrue(self.limiter.hit('client', 4, 60, now=790).allowed)
+
+
+class RateLimitMiddlewareTest(TestCase):
+    """
+    Test case for the rate limit middleware
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = RateLimitMiddleware(lambda request: HttpResponse('ok'))
+
+    def tearDown(self):
+        get_cache(RATELIMIT).clear()
+
+    def get(self, path):
+        request = self.factory.get(path, REMOTE_ADDR='10.0.0.1')
+        request.user = AnonymousUser()
+        return self.middleware(request)
+
+    def test_object_urls_share_the_route_bucket(self):
+        first = self.middleware.get_rate_limit_key(
+            self.factory.get('/api/students/students/1/'), (60, 60)
+        )
+        second = self.middleware.get_rate_limit_key(
+            self.factory.get('/api/students/students/2/'), (60, 60)
+        )
+
+        self.assertEqual(first, second)
+
+    def test_limit_exceeded_returns_429_with_retry_after(self):
+        for _ in range(5):
+            self.assertEqual(self.get('/api/auth/login/').status_code, 200)
+
+        response = self.get('/api/auth/login/')
+
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
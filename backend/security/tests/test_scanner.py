@@ -0,0 +1,50 @@
+import re
+from django.test import TestCase, override_settings
+from security.scanner import ATTACK_SIGNATURES, AttackScanner
+
+
+class AttackScannerTest(TestCase):
+    """
+    Test case for the single-pass attack scanner
+    """
+
+    def setUp(self):
+        self.scanner = AttackScanner()
+
+    def test_reports_matching_rule_and_source(self):
+        cases = [
+            (('/api/../etc/passwd', '', b''), ('path_traversal_slash', 'path')),
+            (('/api/courses/', 'q=<script>alert(1)</script>', b''), ('xss_tag', 'query')),
+            (('/api/auth/login/', '', b'password=x union select secret( from users'), ('sqli_union_select', 'body')),
+            (('/api/courses/', 'next=javascript:run', b''), ('xss_script_protocol', 'query')),
+        ]
+        for args, expected in cases:
+            with self.subTest(args=args):
+                self.assertEqual(tuple(self.scanner.scan(*args)), expected)
+
+    def test_clean_requests_pass(self):
+        self.assertIsNone(self.scanner.scan('/api/students/', 'page=2&page_size=20', b'title=Report'))
+
+    def test_agrees_with_individual_patterns(self):
+        samples = [
+            "id=1' OR '1'='1", 'a=1;', 'x--y', '%23tag', '<img src=x onerror=alert(1)>',
+            'eval(alert)', 'vbscript:msgbox', '..\\windows', 'union all select (1)',
+            'plain text', 'start=2024-09-01', 'file.name.txt',
+        ]
+        for sample in samples:
+            with self.subTest(sample=sample):
+                expected = any(re.search(pattern, sample) for _, pattern, _, _ in ATTACK_SIGNATURES)
+                self.assertEqual(self.scanner.scan('', sample) is not None, expected)
+
+    @override_settings(SECURITY_SCAN_MAX_BODY_BYTES=10)
+    def test_body_scan_is_capped(self):
+        self.assertIsNone(self.scanner.scan('/api/', '', b'a' * 20 + b"'"))
+
+    def test_hit_counts_per_rule(self):
+        self.scanner.scan('/api/../x', '', b'')
+        self.scanner.scan('/api/../y', '', b'')
+
+        counts = self.scanner.hit_counts()
+
+        self.assertEqual(counts['path_traversal_slash'], 2)
+        self.assertEqual(counts['xss_tag'], 0)
@@ -6,7 +6,10 @@ from rest_framework.response import Response
 from django.shortcuts import render
 from django.http import HttpResponseForbidden
 
+from apps.core.fieldsets import SparseFieldsetMixin
 from .models import BlockedIP, SecuritySetting, SecurityLog, UserSecurityProfile
+from .blocklist import blocklist
+from .scanner import scanner
 from .serializers import (
     BlockedIPSerializer, 
     SecuritySettingSerializer, 
@@ -23,7 +26,7 @@ class IsAdminUser(permissions.BasePermission):
         return request.user and request.user.is_staff
 
 
-class BlockedIPViewSet(viewsets.ModelViewSet):
+class BlockedIPViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing blocked IP addresses
     """
@@ -35,7 +38,7 @@ class BlockedIPViewSet(viewsets.ModelViewSet):
         serializer.save(created_by=self.request.user)
 
 
-class SecuritySettingViewSet(viewsets.ModelViewSet):
+class SecuritySettingViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing security settings
     """
@@ -44,13 +47,14 @@ class SecuritySettingViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAdminUser]
     
 
-class SecurityLogViewSet(viewsets.ReadOnlyModelViewSet):
+class SecurityLogViewSet(SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for viewing security logs
     """
     queryset = SecurityLog.objects.all()
     serializer_class = SecurityLogSerializer
     permission_classes = [IsAdminUser]
+    page_size = 50
     
     def get_queryset(self):
         queryset = SecurityLog.objects.all()
@@ -94,7 +98,12 @@ def check_ip_status(request, ip_address):
     Check if an IP address is blocked
     """
     try:
-        blocked_ip = BlockedIP.objects.get(ip_address=ip_address)
+        # Prefer the block that covers the address, which may be a subnet
+        block_id = blocklist.find(ip_address)
+        if block_id is not None:
+            blocked_ip = BlockedIP.objects.get(id=block_id)
+        else:
+            blocked_ip = BlockedIP.objects.get(ip_address=ip_address)
         return Response({
             'is_blocked': blocked_ip.is_active,
             'details': BlockedIPSerializer(blocked_ip).data
@@ -136,11 +145,13 @@ def security_summary(request):
         'total_blocked_ips': BlockedIP.objects.count(),
         'recent_events_by_type': logs_by_type,
         'recent_events_by_severity': logs_by_severity,
-        'total_security_logs': SecurityLog.objects.count()
+        'total_security_logs': SecurityLog.objects.count(),
+        # Attack signature matches seen by this worker since it started
+        'attack_rule_hits': scanner.hit_counts()
     })
 
 
-class UserSecurityProfileViewSet(viewsets.ModelViewSet):
+class UserSecurityProfileViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     API endpoint for user security profiles
     """